@@ -0,0 +1,19 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0042_update_streamblock'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='date',
+            field=models.DateField(db_index=True, default=datetime.date.today, help_text='The date the post was published', verbose_name='Post date'),
+        ),
+    ]
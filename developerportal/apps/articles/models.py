@@ -7,7 +7,6 @@ from django.db.models import (
     CharField,
     DateField,
     ForeignKey,
-    Q,
     TextField,
 )
 from django.template.loader import render_to_string
@@ -33,15 +32,25 @@ from wagtail.search import index
 
 from ..common.blocks import ExternalAuthorBlock, ExternalLinkBlock
 from ..common.constants import (
+    CARD_IMAGE_FILTER_SPEC,
     DESCRIPTION_MAX_LENGTH,
+    PAGINATION_AFTER_QUERYSTRING_KEY,
+    PAGINATION_BEFORE_QUERYSTRING_KEY,
     PAGINATION_QUERYSTRING_KEY,
     RICH_TEXT_FEATURES_SIMPLE,
     SEARCH_QUERYSTRING_KEY,
     TOPIC_QUERYSTRING_KEY,
 )
 from ..common.fields import CustomStreamField
+from ..common.identity_map import get_related_instance, memoize
 from ..common.models import BasePage
-from ..common.utils import get_combined_articles_and_videos, paginate_resources
+from ..common.utils import (
+    get_combined_articles_and_videos,
+    paginate_resources,
+    paginate_resources_by_cursor,
+    use_cursor_pagination,
+)
+from ..mozimages.utils import prefetch_card_renditions
 
 
 class ArticlesTag(TaggedItemBase):
@@ -121,19 +130,29 @@ class Articles(BasePage):
         context = super().get_context(request)
         context["filters"] = self.get_filters()
         context["resources"] = self.get_resources(request)
+        prefetch_card_renditions(context["resources"], [CARD_IMAGE_FILTER_SPEC])
         return context
 
     def get_resources(self, request):
         # This Page class will show both Articles/Posts and Videos in its listing
 
         topics = request.GET.getlist(TOPIC_QUERYSTRING_KEY)
-        topics_q = Q(topics__topic__slug__in=topics) if topics else Q()
-
         search_terms = request.GET.get(SEARCH_QUERYSTRING_KEY)
 
         resources = get_combined_articles_and_videos(
-            self, q_object=topics_q, search_terms=search_terms
+            self, topic_slugs=topics, search_terms=search_terms, in_database=True
         )
+
+        if use_cursor_pagination(request):
+            return paginate_resources_by_cursor(
+                resources,
+                per_page=self.RESOURCES_PER_PAGE,
+                order_by="date",
+                after=request.GET.get(PAGINATION_AFTER_QUERYSTRING_KEY),
+                before=request.GET.get(PAGINATION_BEFORE_QUERYSTRING_KEY),
+                reverse=True,
+            )
+
         resources = paginate_resources(
             resources,
             page_ref=request.GET.get(PAGINATION_QUERYSTRING_KEY),
@@ -168,6 +187,7 @@ class Article(BasePage):
     # IMPORTANT: EACH ARTICLE is NOW LABELLED "POST" IN THE FRONT END
 
     resource_type = "article"  # If you change this, CSS will need updating, too
+    cache_control_policy = "article"
     parent_page_types = ["Articles"]
     subpage_types = []
     template = "article.html"
@@ -230,6 +250,7 @@ class Article(BasePage):
         "Post date",
         default=datetime.date.today,
         help_text="The date the post was published",
+        db_index=True,
     )
     authors = StreamField(
         StreamBlock(
@@ -346,8 +367,14 @@ class Article(BasePage):
     @property
     def primary_topic(self):
         """Return the first (primary) topic specified for the Article."""
-        article_topic = self.topics.first()
-        return article_topic.topic if article_topic else None
+
+        def get_primary_topic():
+            article_topic = self.topics.first()
+            return (
+                get_related_instance(article_topic, "topic") if article_topic else None
+            )
+
+        return memoize(("primary_topic", self.pk), get_primary_topic)
 
     @property
     def read_time(self):
@@ -357,8 +384,14 @@ class Article(BasePage):
     def related_resources(self):
         """Returns resources that are related to the current resource, i.e.
         live, public Articles and Videos which have the same Topics."""
-        topic_pks = [topic.topic.pk for topic in self.topics.all()]
-        return get_combined_articles_and_videos(self, topics__topic__pk__in=topic_pks)
+
+        def get_related_resources():
+            topic_pks = [topic.topic_id for topic in self.topics.all()]
+            return get_combined_articles_and_videos(
+                self, topics__topic__pk__in=topic_pks
+            )
+
+        return memoize(("related_resources", self.pk), get_related_resources)
 
     @property
     def month_group(self):
@@ -1,6 +1,5 @@
 from unittest import mock
 
-from django.db.models import Q
 from django.test import RequestFactory, TestCase
 
 from developerportal.apps.common.test_helpers import PatchedWagtailPageTests
@@ -88,7 +87,7 @@ class ArticlesSearchTests(TestCase):
         request = RequestFactory().get("/posts/")
         self.page.get_resources(request)
         mock_get_combined_articles_and_videos.assert_called_once_with(
-            self.page, q_object=Q(), search_terms=None
+            self.page, topic_slugs=[], search_terms=None, in_database=True
         )
 
     @mock.patch("developerportal.apps.articles.models.get_combined_articles_and_videos")
@@ -98,7 +97,7 @@ class ArticlesSearchTests(TestCase):
         request = RequestFactory().get("/posts/?search=test%20test%20%3Ctest%3E")
         self.page.get_resources(request)
         mock_get_combined_articles_and_videos.assert_called_once_with(
-            self.page, q_object=Q(), search_terms="test test <test>"
+            self.page, topic_slugs=[], search_terms="test test <test>", in_database=True
         )
 
     @mock.patch("developerportal.apps.articles.models.get_combined_articles_and_videos")
@@ -111,8 +110,9 @@ class ArticlesSearchTests(TestCase):
         self.page.get_resources(request)
         mock_get_combined_articles_and_videos.assert_called_once_with(
             self.page,
-            q_object=Q(topics__topic__slug__in=["foo", "bar"]),
+            topic_slugs=["foo", "bar"],
             search_terms="testing test <testing>",
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.articles.models.get_combined_articles_and_videos")
@@ -122,7 +122,5 @@ class ArticlesSearchTests(TestCase):
         request = RequestFactory().get("/posts/?topic=foo&topic=bar")
         self.page.get_resources(request)
         mock_get_combined_articles_and_videos.assert_called_once_with(
-            self.page,
-            q_object=Q(topics__topic__slug__in=["foo", "bar"]),
-            search_terms=None,
+            self.page, topic_slugs=["foo", "bar"], search_terms=None, in_database=True
         )
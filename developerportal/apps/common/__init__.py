@@ -0,0 +1 @@
+default_app_config = "developerportal.apps.common.apps.CommonConfig"
@@ -0,0 +1,219 @@
+"""Cache tags (aka surrogate keys) naming the pages each response was built
+from, so that a cache in front of the site can drop exactly the responses
+which depend on a page when it changes.
+
+Pages are tagged as they're loaded during a request, via `post_init` (see
+wagtail_hooks.py), while the `request_cache_tags` middleware has a collector
+active. It sends the tags in `Surrogate-Key` and `Cache-Tag` headers, and tells
+the configured backend about them. `purge_cache_tags()` asks the backend to
+drop every response with any of the given tags.
+
+Pages shown on every page of the site aren't tagged: publishing one of them
+invalidates everything anyway (see taskqueue.utils.get_invalidation_targets).
+Nor are the pages of responses which load more than settings.CACHE_TAGS_MAX_PAGES,
+such as the listings and the sitemap, which are invalidated by path instead.
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from .constants import ABOUT_PAGE_SLUG
+
+# The pages linked to from the header and footer of every page, besides those
+# shown in menus
+SITE_WIDE_PAGE_MODELS = (
+    "home.HomePage",
+    "articles.Articles",
+    "events.Events",
+    "people.People",
+    "topics.Topics",
+)
+
+_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _get_site_wide_page_models():
+    return tuple(apps.get_model(model) for model in SITE_WIDE_PAGE_MODELS)
+
+
+def is_shown_site_wide(page):
+    """Return whether `page` is shown on every page of the site, whether or not
+    it's the specific page. Only the fields already loaded are looked at, so
+    that no queries are made for deferred ones."""
+    fields = page.__dict__
+    content_types = ContentType.objects.get_for_models(*_get_site_wide_page_models())
+    return bool(
+        fields.get("show_in_menus")
+        or fields.get("slug") == ABOUT_PAGE_SLUG
+        or fields.get("content_type_id") in {ct.pk for ct in content_types.values()}
+    )
+
+
+def get_page_cache_tag(page_id):
+    return f"page-{page_id}"
+
+
+def get_content_type_cache_tag(content_type):
+    return f"type-{content_type.app_label}.{content_type.model}"
+
+
+class CacheTagCollector:
+    """The pages and content types loaded while building one response"""
+
+    def __init__(self):
+        self.page_ids = set()
+        self.content_type_ids = set()
+
+    def add_page(self, page):
+        # Unsaved pages have nothing to purge them by
+        if page.pk is None or is_shown_site_wide(page):
+            return
+        self.page_ids.add(page.pk)
+        # Don't fetch a deferred content type just to tag it
+        content_type_id = page.__dict__.get("content_type_id")
+        if content_type_id:
+            self.content_type_ids.add(content_type_id)
+
+    @property
+    def page_tags(self):
+        """The tags the response can be purged by, if it loaded few enough pages"""
+        if len(self.page_ids) > settings.CACHE_TAGS_MAX_PAGES:
+            return []
+        return [get_page_cache_tag(page_id) for page_id in sorted(self.page_ids)]
+
+    @property
+    def tags(self):
+        content_types = (
+            ContentType.objects.get_for_id(content_type_id)
+            for content_type_id in self.content_type_ids
+        )
+        tags = sorted(get_content_type_cache_tag(ct) for ct in content_types)
+        return tags + self.page_tags
+
+
+def get_cache_tag_collector():
+    """Return the active CacheTagCollector, or None if there isn't one"""
+    return getattr(_local, "cache_tag_collector", None)
+
+
+@contextmanager
+def cache_tag_collector():
+    """Activate a fresh CacheTagCollector for the duration of the block"""
+    previous = get_cache_tag_collector()
+    _local.cache_tag_collector = CacheTagCollector()
+    try:
+        yield _local.cache_tag_collector
+    finally:
+        _local.cache_tag_collector = previous
+
+
+def tag_loaded_page(sender, instance, **kwargs):
+    """post_init receiver which tags the current response with each page loaded"""
+    collector = get_cache_tag_collector()
+    if collector is not None:
+        collector.add_page(instance)
+
+
+def get_cache_tags_for_page(page):
+    """Return the tags to purge when `page` changes"""
+    return [get_page_cache_tag(page.pk)]
+
+
+class BaseCacheTagBackend:
+    """Keeps track of which paths were served with which tags, and purges them"""
+
+    def record(self, path, tags):
+        """Note that the response for `path` was built with `tags`"""
+        pass
+
+    def purge(self, tags):
+        """Drop every cached response with any of `tags`"""
+        raise NotImplementedError
+
+
+class LocalCacheTagBackend(BaseCacheTagBackend):
+    """An in-memory stand-in for an edge cache, for tests and local development.
+    `purge` returns the paths that would have been dropped."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.paths_by_tag = defaultdict(set)
+        self.purged_tags = []
+
+    def record(self, path, tags):
+        for tag in tags:
+            self.paths_by_tag[tag].add(path)
+
+    def purge(self, tags):
+        self.purged_tags.extend(tags)
+        paths = set()
+        for tag in tags:
+            paths.update(self.paths_by_tag.pop(tag, ()))
+        return paths
+
+
+class CloudFrontCacheTagBackend(BaseCacheTagBackend):
+    """CloudFront can't purge by tag, so this keeps an index of the paths served
+    with each tag in Redis, and queues invalidations for the paths of the tags
+    purged. Index entries expire after settings.CACHE_TAGS_INDEX_TIMEOUT."""
+
+    KEY_TEMPLATE = "cache-tag:{}"
+
+    def _get_connection(self):
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    def _get_key(self, tag):
+        return cache.make_key(self.KEY_TEMPLATE.format(tag))
+
+    def record(self, path, tags):
+        pipeline = self._get_connection().pipeline()
+        for tag in tags:
+            key = self._get_key(tag)
+            pipeline.sadd(key, path)
+            pipeline.expire(key, settings.CACHE_TAGS_INDEX_TIMEOUT)
+        pipeline.execute()
+
+    def purge(self, tags):
+        from ..taskqueue.utils import queue_invalidation
+
+        keys = [self._get_key(tag) for tag in tags]
+        pipeline = self._get_connection().pipeline()
+        pipeline.sunion(keys)
+        pipeline.delete(*keys)
+        paths = {path.decode() for path in pipeline.execute()[0]}
+        if paths:
+            # Also catch the query strings each path was served with
+            queue_invalidation(
+                [target for path in sorted(paths) for target in (path, f"{path}?*")]
+            )
+        return paths
+
+
+_backends = {}
+
+
+def get_cache_tag_backend():
+    """Return the backend named in settings.CACHE_TAGS_BACKEND, which is shared
+    by the whole process"""
+    backend_path = settings.CACHE_TAGS_BACKEND
+    if backend_path not in _backends:
+        _backends[backend_path] = import_string(backend_path)()
+    return _backends[backend_path]
+
+
+def purge_cache_tags(tags):
+    """Drop every cached response with any of `tags`"""
+    return get_cache_tag_backend().purge(tags)
@@ -40,6 +40,9 @@ VIDEO_TYPE = (
 
 
 PAGINATION_QUERYSTRING_KEY = "page"
+# Used instead of PAGINATION_QUERYSTRING_KEY for cursor-based pagination
+PAGINATION_AFTER_QUERYSTRING_KEY = "after"
+PAGINATION_BEFORE_QUERYSTRING_KEY = "before"
 TOPIC_QUERYSTRING_KEY = "topic"
 ROLE_QUERYSTRING_KEY = "role"
 LOCATION_QUERYSTRING_KEY = (
@@ -84,6 +87,28 @@ PAGE_TYPE_LOOKUP_FOR_LABEL = {
     "Topic": TOPIC,
 }
 
+# Filter specs for card images, which must match those used in the card templates
+CARD_IMAGE_FILTER_SPEC = "width-480"
+PERSON_CARD_IMAGE_FILTER_SPEC = "fill-375x210"
+# Every filter spec used by our templates, so renditions can be made in advance
+TEMPLATE_RENDITION_FILTER_SPECS = (
+    "width-400",
+    CARD_IMAGE_FILTER_SPEC,
+    "width-600",
+    "width-800",
+    PERSON_CARD_IMAGE_FILTER_SPEC,
+)
+
+# Page models that get a denormalised row in common.ResourceCard when live
+RESOURCE_CARD_MODELS = (
+    "articles.Article",
+    "externalcontent.ExternalArticle",
+    "videos.Video",
+    "externalcontent.ExternalVideo",
+    "events.Event",
+    "externalcontent.ExternalEvent",
+)
+
 NON_SPACE_WHITESPACE = "\n\t\r"
 
 ABOUT_PAGE_SLUG = (
@@ -0,0 +1,77 @@
+"""A per-request identity map, so that lookups repeated many times while
+rendering a single page (eg `page.specific`, `primary_topic`, a Topic's
+instance) are only done once.
+
+The map is activated for each request by the `request_identity_map`
+middleware. Outside of an active map, every lookup is simply computed.
+"""
+
+import threading
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class IdentityMap:
+    """Memoised values for one request, plus counts of how useful it was"""
+
+    def __init__(self):
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        try:
+            value = self._values[key]
+        except KeyError:
+            self.misses += 1
+            value = self._values[key] = compute()
+        else:
+            self.hits += 1
+        return value
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def get_identity_map():
+    """Return the active IdentityMap, or None if there isn't one"""
+    return getattr(_local, "identity_map", None)
+
+
+@contextmanager
+def identity_map():
+    """Activate a fresh IdentityMap for the duration of the block"""
+    previous = get_identity_map()
+    _local.identity_map = IdentityMap()
+    try:
+        yield _local.identity_map
+    finally:
+        _local.identity_map = previous
+
+
+def memoize(key, compute):
+    """Return the value for `key` from the active identity map, calling
+    `compute()` to produce it if there is no map or the key is new.
+
+    Keys that include None (eg the pk of an unsaved page) are never memoised."""
+    current = get_identity_map()
+    if current is None or None in key:
+        return compute()
+    return current.get_or_compute(key, compute)
+
+
+def get_specific(page):
+    """Return `page.specific`, shared by every instance of the same page"""
+    return memoize(("specific", page.pk), lambda: page.specific)
+
+
+def get_related_instance(instance, field_name):
+    """Return the object a ForeignKey points to, shared by every instance that
+    points to the same object, eg the Topic of each ArticleTopic."""
+    field = instance._meta.get_field(field_name)
+    return memoize(
+        ("instance", field.related_model._meta.label, getattr(instance, field.attname)),
+        lambda: getattr(instance, field_name),
+    )
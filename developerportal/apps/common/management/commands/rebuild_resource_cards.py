@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...models import ResourceCard
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalised ResourceCard table from all live resource pages"
+
+    def handle(self, *args, **options):
+        count = ResourceCard.objects.rebuild()
+        self.stdout.write(f"Rebuilt {count} resource cards")
@@ -1,14 +1,31 @@
 """Custom middleware for Developer Portal"""
 
+import logging
+
 from django.conf import settings
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
 
 from ratelimit import ALL
 from ratelimit.core import is_ratelimited
 from ratelimit.exceptions import Ratelimited
 
+from .cache_tags import cache_tag_collector, get_cache_tag_backend
+from .identity_map import identity_map
+from .utils import cache_control_policy_override
+
 RATELIMIT_GROUP_PUBLIC_REQUESTS = "public_requests"
 RATELIMIT_GROUP_ADMIN_REQUESTS = "admin_requests"
 
+IDENTITY_MAP_STATS_HEADER = "X-Identity-Map"
+
+# Fastly and others read space-separated tags from Surrogate-Key, and
+# Cloudflare reads comma-separated ones from Cache-Tag
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+CACHE_TAG_HEADER = "Cache-Tag"
+
+logger = logging.getLogger(__name__)
+
 
 def _get_group(request):
     if request.user and request.user.is_authenticated and request.user.is_staff:
@@ -104,3 +121,119 @@ def set_remote_addr_from_forwarded_for(get_response):
         return response
 
     return middleware
+
+
+def request_identity_map(get_response):
+    """
+    Middleware that gives each request its own identity map (see
+    common/identity_map.py) so that repeated lookups while rendering a page are
+    only done once. Hit/miss counts are logged, and also sent in a response
+    header when DEBUG is on.
+
+    The Wagtail Admin is skipped, because previews render unsaved page content
+    that must not be mixed up with the saved version of the same page.
+    """
+
+    def middleware(request):
+        if request.path.startswith(reverse("wagtailadmin_home")):
+            return get_response(request)
+
+        with identity_map() as current_map:
+            response = get_response(request)
+
+        logger.debug(
+            "Identity map for %s: %s hits, %s misses",
+            request.path,
+            current_map.hits,
+            current_map.misses,
+        )
+        if settings.DEBUG:
+            stats = f"hits={current_map.hits}, misses={current_map.misses}"
+            response[IDENTITY_MAP_STATS_HEADER] = stats
+        return response
+
+    return middleware
+
+
+def request_cache_tags(get_response):
+    """
+    Middleware that collects the cache tags for the pages loaded while building
+    each response (see common/cache_tags.py), sends them in the Surrogate-Key
+    and Cache-Tag headers, and records them with the cache tag backend, so the
+    response can be purged when any of those pages change.
+
+    Only responses which the CDN will cache, as set by cache_control_policy, are
+    recorded, since there's nothing to purge for the rest.
+
+    Like request_identity_map, the Wagtail Admin is skipped.
+    """
+
+    def middleware(request):
+        if request.path.startswith(reverse("wagtailadmin_home")):
+            return get_response(request)
+
+        with cache_tag_collector() as collector:
+            response = get_response(request)
+
+        if collector.page_ids and not response.streaming:
+            tags = collector.tags
+            response[SURROGATE_KEY_HEADER] = " ".join(tags)
+            response[CACHE_TAG_HEADER] = ",".join(tags)
+            page_tags = collector.page_tags
+            if (
+                page_tags
+                and request.method == "GET"
+                and response.status_code == 200
+                and _is_cached_publicly(response)
+            ):
+                get_cache_tag_backend().record(request.path, page_tags)
+        return response
+
+    return middleware
+
+
+def _is_cached_publicly(response):
+    directives = {
+        directive.split("=")[0].strip().lower()
+        for directive in response.get("Cache-Control", "").split(",")
+    }
+    return "public" in directives and not directives & {
+        "private",
+        "no-cache",
+        "no-store",
+    }
+
+
+def cache_control_policy(get_response):
+    """
+    Middleware that sets Cache-Control on anonymous GET and HEAD responses, from
+    the policy in settings.CACHE_CONTROL_POLICIES named by the page served (see
+    BasePage.cache_control_policy) or the view (see `with_cache_control_policy`).
+
+    Responses which set cookies, or set their own Cache-Control, are left alone.
+    Ones which would have a policy can be given another while they're built, by
+    `override_cache_control_policy()`.
+    """
+
+    def middleware(request):
+        with cache_control_policy_override() as override:
+            response = get_response(request)
+
+        policy_name = getattr(request, "cache_control_policy", None)
+        if policy_name:
+            policy_name = override.get("policy_name", policy_name)
+        user = getattr(request, "user", None)
+        if (
+            policy_name
+            and request.method in ("GET", "HEAD")
+            and response.status_code == 200
+            and not (user and user.is_authenticated)
+            and not response.cookies
+            and not response.has_header("Cache-Control")
+        ):
+            patch_cache_control(
+                response, public=True, **settings.CACHE_CONTROL_POLICIES[policy_name]
+            )
+        return response
+
+    return middleware
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('mozimages', '0001_initial'),
+        ('wagtailcore', '0041_group_collection_permissions_verbose_name_plural'),
+        ('common', '0002_drop_staticbuild_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceCard',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resource_card', serialize=False, to='wagtailcore.Page')),
+                ('resource_type', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('card_title', models.CharField(blank=True, default='', max_length=140)),
+                ('card_description', models.TextField(blank=True, default='')),
+                ('description', models.TextField(blank=True, default='')),
+                ('date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('country', models.CharField(blank=True, default='', max_length=2)),
+                ('topic_slugs', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, size=None)),
+                ('card_image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='mozimages.MozImage')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='resourcecard',
+            index=models.Index(fields=['resource_type', 'date'], name='common_reso_resourc_f90397_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resourcecard',
+            index=models.Index(fields=['country'], name='common_reso_country_a89759_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resourcecard',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['topic_slugs'], name='common_reso_topic_s_8b2464_gin'),
+        ),
+    ]
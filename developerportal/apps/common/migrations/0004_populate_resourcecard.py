@@ -0,0 +1,31 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+"""Fill the ResourceCard table from the resource pages already live, as the
+`rebuild_resource_cards` management command does"""
+
+from django.db import migrations
+
+from developerportal.apps.common.models import build_resource_cards
+
+
+def forwards(apps, schema_editor):
+    ResourceCard = apps.get_model("common", "ResourceCard")
+    ResourceCard.objects.bulk_create(build_resource_cards(apps), batch_size=500)
+
+
+def backwards(apps, schema_editor):
+    apps.get_model("common", "ResourceCard").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0043_index_article_date"),
+        ("events", "0032_index_event_start_date"),
+        ("externalcontent", "0033_externalcontentfolder"),
+        ("topics", "0056_allow_content_page_as_featured"),
+        ("videos", "0014_index_video_date"),
+        ("common", "0003_resourcecard"),
+    ]
+
+    operations = [migrations.RunPython(forwards, backwards)]
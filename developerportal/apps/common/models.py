@@ -1,9 +1,26 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.cache import cache
 from django.db import transaction
-from django.db.models import SET_NULL, ForeignKey
+from django.db.models import (
+    CASCADE,
+    SET_NULL,
+    CharField,
+    DateField,
+    ForeignKey,
+    Index,
+    Manager,
+    Model,
+    OneToOneField,
+    QuerySet,
+    TextField,
+)
 
 from wagtail.core.models import Page, PageManager
 
+from .constants import RESOURCE_CARD_MODELS
 from .forms import BasePageForm
 
 
@@ -32,6 +49,9 @@ class BasePage(Page):
     # when the object is saved
     _bulk_invalidation_cache_keys = []
 
+    # Which of settings.CACHE_CONTROL_POLICIES to send with the page
+    cache_control_policy = "default"
+
     class Meta:
         abstract = True
 
@@ -39,3 +59,149 @@ class BasePage(Page):
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         cache.delete_many(self._bulk_invalidation_cache_keys)
+
+
+class ResourceCardQuerySet(QuerySet):
+    def for_models(self, *models):
+        """Restrict to cards for the given models ('app.Model' strings or Models)"""
+        return self.filter(
+            content_type__in=[
+                ContentType.objects.get_for_model(_resolve_model(model))
+                for model in models
+            ]
+        )
+
+    def with_any_topic(self, topic_slugs):
+        """Restrict to cards tagged with at least one of the given topic slugs"""
+        return self.filter(topic_slugs__overlap=list(topic_slugs))
+
+
+class ResourceCardManager(Manager.from_queryset(ResourceCardQuerySet)):
+    def update_for_page(self, page):
+        """Create, refresh or remove the card for a page, depending on whether
+        it is a live page of one of the RESOURCE_CARD_MODELS.
+
+        Returns the card, or None if the page should not have one."""
+
+        page = page.specific
+        if not _is_resource_card_page(page):
+            return None
+
+        if not page.live:
+            self.filter(page_id=page.pk).delete()
+            return None
+
+        card, _ = self.update_or_create(
+            page_id=page.pk,
+            defaults=_get_resource_card_fields(page, page.resource_type),
+        )
+        return card
+
+    @transaction.atomic
+    def rebuild(self):
+        """Replace every card with a fresh one built from the live pages.
+
+        Returns the number of cards created."""
+
+        self.all().delete()
+        cards = build_resource_cards(apps)
+        self.bulk_create(cards, batch_size=500)
+        return len(cards)
+
+
+class ResourceCard(Model):
+    """A denormalised copy of the card-level data for a live resource page
+    (see RESOURCE_CARD_MODELS), so listings and filters can query a single
+    indexed table rather than joining across each concrete page model and
+    its topics.
+
+    Cards are kept up to date by the page_published/page_unpublished signal
+    handlers in common/wagtail_hooks.py and can be regenerated with the
+    `rebuild_resource_cards` management command."""
+
+    page = OneToOneField(
+        "wagtailcore.Page",
+        on_delete=CASCADE,
+        primary_key=True,
+        related_name="resource_card",
+    )
+    content_type = ForeignKey(
+        "contenttypes.ContentType", on_delete=CASCADE, related_name="+"
+    )
+    resource_type = CharField(max_length=20)
+    title = CharField(max_length=255)
+    card_title = CharField(max_length=140, blank=True, default="")
+    card_description = TextField(blank=True, default="")
+    description = TextField(blank=True, default="")
+    # `date` for posts and videos, `start_date` for events
+    date = DateField()
+    end_date = DateField(blank=True, null=True)
+    country = CharField(max_length=2, blank=True, default="")
+    topic_slugs = ArrayField(CharField(max_length=255), blank=True, default=list)
+    card_image = ForeignKey(
+        "mozimages.MozImage",
+        null=True,
+        blank=True,
+        on_delete=SET_NULL,
+        related_name="+",
+    )
+
+    objects = ResourceCardManager()
+
+    class Meta:
+        indexes = [
+            Index(fields=["resource_type", "date"]),
+            Index(fields=["country"]),
+            GinIndex(fields=["topic_slugs"]),
+        ]
+
+    def __str__(self):
+        return self.card_title or self.title
+
+
+def _resolve_model(model):
+    return apps.get_model(model) if isinstance(model, str) else model
+
+
+def _is_resource_card_page(page):
+    return page._meta.label in RESOURCE_CARD_MODELS
+
+
+def build_resource_cards(apps):
+    """Return unsaved ResourceCards for every live resource page, using the
+    models in `apps`, which may be a migration's historical models: hence
+    filter(live=True) rather than the live() of Wagtail's PageManager."""
+    card_model = apps.get_model("common", "ResourceCard")
+    cards = []
+    for model in RESOURCE_CARD_MODELS:
+        # Historical models don't have the class attributes of the real ones
+        resource_type = _resolve_model(model).resource_type
+        pages = (
+            apps.get_model(model)
+            .objects.filter(live=True)
+            .prefetch_related("topics__topic")
+        )
+        cards.extend(
+            card_model(
+                page_id=page.pk, **_get_resource_card_fields(page, resource_type)
+            )
+            for page in pages
+        )
+    return cards
+
+
+def _get_resource_card_fields(page, resource_type):
+    country = getattr(page, "country", None)
+    return {
+        "content_type_id": page.content_type_id,
+        "resource_type": resource_type,
+        "title": page.title,
+        "card_title": getattr(page, "card_title", ""),
+        "card_description": getattr(page, "card_description", ""),
+        "description": page.description,
+        "date": page.start_date if hasattr(page, "start_date") else page.date,
+        "end_date": getattr(page, "end_date", None),
+        "country": country.code if country else "",
+        "topic_slugs": [page_topic.topic.slug for page_topic in page.topics.all()],
+        "card_image_id": page.card_image_id,
+    }
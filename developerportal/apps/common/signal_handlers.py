@@ -0,0 +1,16 @@
+from wagtail.core.signals import page_published, page_unpublished
+
+from .models import ResourceCard
+
+
+def update_resource_card(sender, instance, **kwargs):
+    """Keep the denormalised ResourceCard for a page in step with its live state"""
+    ResourceCard.objects.update_for_page(instance)
+
+
+def register_signal_handlers():
+    """Connect the handlers above. This is done by CommonConfig.ready(), so that
+    they're also connected in the Celery worker, which publishes and expires
+    scheduled pages but never loads the wagtail_hooks modules."""
+    page_published.connect(update_resource_card)
+    page_unpublished.connect(update_resource_card)
@@ -0,0 +1,95 @@
+from django.test import TestCase, override_settings
+
+from wagtail.core.models import Page
+
+from ...articles.models import Article
+from ..cache_tags import (
+    LocalCacheTagBackend,
+    cache_tag_collector,
+    get_cache_tag_backend,
+    get_cache_tag_collector,
+    get_cache_tags_for_page,
+    is_shown_site_wide,
+    purge_cache_tags,
+)
+
+
+class CacheTagCollectorTests(TestCase):
+
+    fixtures = ["common.json"]
+
+    def test_pages_are_only_tagged_while_collecting(self):
+        Page.objects.get(pk=4)
+        self.assertIsNone(get_cache_tag_collector())
+
+        with cache_tag_collector() as collector:
+            self.assertIs(get_cache_tag_collector(), collector)
+            Article.objects.get(pk=8)
+            Page.objects.get(pk=11).specific
+            # Unsaved pages have nothing to purge them by
+            Article(title="Unsaved")
+            # Nor are pages shown on every page tagged
+            Page.objects.get(pk=3).specific
+            Page.objects.get(pk=6)
+
+        self.assertIsNone(get_cache_tag_collector())
+        self.assertEqual(
+            collector.tags,
+            ["type-articles.article", "type-people.person", "page-8", "page-11"],
+        )
+        self.assertEqual(collector.page_tags, ["page-8", "page-11"])
+
+    def test_deferred_content_types_are_not_fetched(self):
+        with cache_tag_collector() as collector:
+            page = Page.objects.only("id").get(pk=8)
+        with self.assertNumQueries(0):
+            self.assertEqual(collector.tags, ["page-8"])
+        self.assertIsNotNone(page)
+
+    @override_settings(CACHE_TAGS_MAX_PAGES=5)
+    def test_many_pages(self):
+        with cache_tag_collector() as collector:
+            list(Article.objects.all())
+        # They're left to be invalidated by path
+        self.assertEqual(collector.tags, ["type-articles.article"])
+        self.assertEqual(collector.page_tags, [])
+
+    def test_is_shown_site_wide(self):
+        for pk in (3, 4, 5, 6, 9, 33):
+            with self.subTest(pk=pk):
+                self.assertTrue(is_shown_site_wide(Page.objects.get(pk=pk)))
+                self.assertTrue(is_shown_site_wide(Page.objects.get(pk=pk).specific))
+        for pk in (8, 11, 36):
+            with self.subTest(pk=pk):
+                self.assertFalse(is_shown_site_wide(Page.objects.get(pk=pk)))
+        with self.assertNumQueries(0):
+            self.assertFalse(is_shown_site_wide(Page(pk=3)))
+
+    def test_get_cache_tags_for_page(self):
+        self.assertEqual(get_cache_tags_for_page(Page.objects.get(pk=8)), ["page-8"])
+
+
+class LocalCacheTagBackendTests(TestCase):
+    def test_record_and_purge(self):
+        backend = LocalCacheTagBackend()
+        backend.record("/posts/", ["type-articles.articles", "page-4", "page-8"])
+        backend.record("/posts/foo/", ["type-articles.article", "page-8"])
+        backend.record("/topics/css/", ["type-topics.topic", "page-6"])
+
+        self.assertEqual(backend.purge(["page-8"]), {"/posts/", "/posts/foo/"})
+        self.assertEqual(backend.purge(["page-8"]), set())
+        self.assertEqual(
+            backend.purge(["page-4", "type-topics.topic"]), {"/posts/", "/topics/css/"}
+        )
+        self.assertEqual(
+            backend.purged_tags, ["page-8", "page-8", "page-4", "type-topics.topic"]
+        )
+
+    def test_backend_is_shared(self):
+        backend = get_cache_tag_backend()
+        self.assertIsInstance(backend, LocalCacheTagBackend)
+        self.assertIs(get_cache_tag_backend(), backend)
+
+        backend.clear()
+        backend.record("/posts/", ["page-4"])
+        self.assertEqual(purge_cache_tags(["page-4"]), {"/posts/"})
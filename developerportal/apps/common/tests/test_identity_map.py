@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from ..identity_map import (
+    get_identity_map,
+    get_related_instance,
+    get_specific,
+    identity_map,
+    memoize,
+)
+
+
+class IdentityMapTests(TestCase):
+    def test_memoize__no_active_map(self):
+        compute = mock.Mock(return_value="value")
+        self.assertIsNone(get_identity_map())
+
+        self.assertEqual(memoize(("key", 1), compute), "value")
+        self.assertEqual(memoize(("key", 1), compute), "value")
+        self.assertEqual(compute.call_count, 2)
+
+    def test_memoize(self):
+        compute = mock.Mock(return_value="value")
+        other_compute = mock.Mock(return_value="other value")
+
+        with identity_map() as current_map:
+            self.assertIs(get_identity_map(), current_map)
+            self.assertEqual(memoize(("key", 1), compute), "value")
+            self.assertEqual(memoize(("key", 1), compute), "value")
+            self.assertEqual(memoize(("key", 2), other_compute), "other value")
+
+        self.assertEqual(compute.call_count, 1)
+        self.assertEqual(other_compute.call_count, 1)
+        self.assertEqual(current_map.stats, {"hits": 1, "misses": 2})
+        self.assertIsNone(get_identity_map())
+
+    def test_memoize__key_with_none_is_not_memoized(self):
+        compute = mock.Mock(return_value="value")
+        with identity_map() as current_map:
+            memoize(("key", None), compute)
+            memoize(("key", None), compute)
+
+        self.assertEqual(compute.call_count, 2)
+        self.assertEqual(current_map.stats, {"hits": 0, "misses": 0})
+
+    def test_identity_map__nested(self):
+        with identity_map() as outer_map:
+            with identity_map() as inner_map:
+                self.assertIsNot(inner_map, outer_map)
+            self.assertIs(get_identity_map(), outer_map)
+
+    def test_get_specific(self):
+        specific_page = mock.Mock(name="specific")
+        pages = [mock.Mock(pk=3, specific=specific_page) for _ in range(3)]
+
+        with identity_map() as current_map:
+            for page in pages:
+                self.assertIs(get_specific(page), specific_page)
+
+        self.assertEqual(current_map.stats, {"hits": 2, "misses": 1})
+
+    def test_get_related_instance(self):
+        from ...articles.models import ArticleTopic
+        from ...topics.models import Topic
+
+        topic = Topic(pk=5, title="Topic")
+        first = ArticleTopic(topic=topic)
+        second = ArticleTopic(topic_id=5)
+
+        with identity_map():
+            self.assertIs(get_related_instance(first, "topic"), topic)
+            with self.assertNumQueries(0):
+                self.assertIs(get_related_instance(second, "topic"), topic)
@@ -4,19 +4,31 @@ from unittest import mock
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser, User
 from django.core.cache import cache
+from django.http import HttpResponse
 from django.test import RequestFactory, TestCase, override_settings
 
+from wagtail.core.models import Page
+
 from ratelimit.exceptions import Ratelimited
 
+from ..cache_tags import get_cache_tag_backend, get_cache_tag_collector
+from ..identity_map import get_identity_map, memoize
 from ..middleware import (
     ALL,
+    CACHE_TAG_HEADER,
+    IDENTITY_MAP_STATS_HEADER,
     RATELIMIT_GROUP_ADMIN_REQUESTS,
     RATELIMIT_GROUP_PUBLIC_REQUESTS,
+    SURROGATE_KEY_HEADER,
     _get_appropriate_rate,
     _get_group,
+    cache_control_policy,
     rate_limiter,
+    request_cache_tags,
+    request_identity_map,
     set_remote_addr_from_forwarded_for,
 )
+from ..utils import override_cache_control_policy
 
 
 @override_settings(RATELIMIT_ENABLE=True, DEVPORTAL_RATELIMIT_DEFAULT_LIMIT="2/m")
@@ -240,3 +252,260 @@ class RemoteAddressMiddlewareTests(TestCase):
                 self.assertEqual(
                     updated_request.META["REMOTE_ADDR"], case["expected_ip"]
                 )
+
+
+class RequestIdentityMapMiddlewareTests(TestCase):
+    def test_request_identity_map_middleware_is_enabled(self):
+        assert (
+            "developerportal.apps.common.middleware.request_identity_map"
+            in settings.MIDDLEWARE
+        )
+
+    def _get_response(self, request):
+        compute = mock.Mock(name="compute", return_value="value")
+        self.assertEqual(memoize(("key", 1), compute), "value")
+        self.assertEqual(memoize(("key", 1), compute), "value")
+        self.computed_count = compute.call_count
+        return HttpResponse()
+
+    @override_settings(DEBUG=True)
+    def test_request_identity_map(self):
+        middleware_func = request_identity_map(self._get_response)
+        response = middleware_func(RequestFactory().get("/"))
+
+        self.assertEqual(self.computed_count, 1)
+        self.assertEqual(response[IDENTITY_MAP_STATS_HEADER], "hits=1, misses=1")
+        self.assertIsNone(get_identity_map())
+
+    @override_settings(DEBUG=False)
+    def test_request_identity_map__no_header_unless_debug(self):
+        middleware_func = request_identity_map(self._get_response)
+        response = middleware_func(RequestFactory().get("/"))
+
+        self.assertEqual(self.computed_count, 1)
+        self.assertFalse(response.has_header(IDENTITY_MAP_STATS_HEADER))
+
+    def test_request_identity_map__skipped_for_wagtail_admin(self):
+        middleware_func = request_identity_map(self._get_response)
+        middleware_func(RequestFactory().get("/admin/pages/3/edit/preview/"))
+
+        self.assertEqual(self.computed_count, 2)
+
+
+class RequestCacheTagsMiddlewareTests(TestCase):
+
+    fixtures = ["common.json"]
+
+    def setUp(self):
+        get_cache_tag_backend().clear()
+
+    def test_request_cache_tags_middleware_is_enabled(self):
+        assert (
+            "developerportal.apps.common.middleware.request_cache_tags"
+            in settings.MIDDLEWARE
+        )
+
+    def _get_response(self, request, cache_control="public, s-maxage=600"):
+        self.collector = get_cache_tag_collector()
+        Page.objects.get(pk=8).specific
+        response = HttpResponse()
+        if cache_control:
+            response["Cache-Control"] = cache_control
+        return response
+
+    def test_request_cache_tags(self):
+        middleware_func = request_cache_tags(self._get_response)
+        response = middleware_func(RequestFactory().get("/posts/foo/"))
+
+        self.assertEqual(response[SURROGATE_KEY_HEADER], "type-articles.article page-8")
+        self.assertEqual(response[CACHE_TAG_HEADER], "type-articles.article,page-8")
+        self.assertIsNone(get_cache_tag_collector())
+        self.assertEqual(get_cache_tag_backend().purge(["page-8"]), {"/posts/foo/"})
+
+    def test_request_cache_tags__no_pages(self):
+        middleware_func = request_cache_tags(lambda request: HttpResponse())
+        response = middleware_func(RequestFactory().get("/robots.txt"))
+
+        self.assertFalse(response.has_header(SURROGATE_KEY_HEADER))
+        self.assertFalse(response.has_header(CACHE_TAG_HEADER))
+
+    def test_request_cache_tags__not_recorded_unless_ok(self):
+        def get_response(request):
+            response = self._get_response(request)
+            response.status_code = 404
+            return response
+
+        middleware_func = request_cache_tags(get_response)
+        response = middleware_func(RequestFactory().get("/posts/foo/"))
+
+        self.assertEqual(response[SURROGATE_KEY_HEADER], "type-articles.article page-8")
+        self.assertEqual(get_cache_tag_backend().purge(["page-8"]), set())
+
+    def test_request_cache_tags__not_recorded_unless_cached_publicly(self):
+        for cache_control in (None, "private, max-age=60", "public, no-cache"):
+            with self.subTest(cache_control=cache_control):
+                middleware_func = request_cache_tags(
+                    lambda request: self._get_response(request, cache_control)
+                )
+                response = middleware_func(RequestFactory().get("/posts/foo/"))
+
+                self.assertEqual(
+                    response[SURROGATE_KEY_HEADER], "type-articles.article page-8"
+                )
+                self.assertEqual(get_cache_tag_backend().purge(["page-8"]), set())
+
+    def test_request_cache_tags__skipped_for_wagtail_admin(self):
+        middleware_func = request_cache_tags(self._get_response)
+        response = middleware_func(RequestFactory().get("/admin/pages/3/edit/preview/"))
+
+        self.assertIsNone(self.collector)
+        self.assertFalse(response.has_header(SURROGATE_KEY_HEADER))
+
+    def test_served_responses_have_cache_tags(self):
+        cases = [
+            ("/posts/faster-smarter-javascript-debugging-in-firefox/", "page-8"),
+            ("/communities/people/josh-marinacci/", "page-11"),
+            ("/posts-feed/", "page-8"),
+            ("/sitemap.xml", "page-8"),
+        ]
+        for path, expected_tag in cases:
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                tags = response[SURROGATE_KEY_HEADER].split()
+                self.assertIn(expected_tag, tags)
+                self.assertIn(expected_tag, response[CACHE_TAG_HEADER].split(","))
+                # The home and directory pages in the header aren't tagged
+                self.assertNotIn("page-3", tags)
+                self.assertNotIn("page-4", tags)
+
+        self.assertIn(
+            "/posts/faster-smarter-javascript-debugging-in-firefox/",
+            get_cache_tag_backend().purge(["page-8"]),
+        )
+
+
+@override_settings(
+    CACHE_CONTROL_POLICIES={
+        "default": {"max_age": 60, "s_maxage": 600, "stale_while_revalidate": 30},
+        "search": {"max_age": 0, "s_maxage": 300, "stale_if_error": 3600},
+        "deferred_rendition": {"max_age": 0, "s_maxage": 60},
+    }
+)
+class CacheControlPolicyMiddlewareTests(TestCase):
+    def test_cache_control_policy_middleware_is_enabled(self):
+        assert (
+            "developerportal.apps.common.middleware.cache_control_policy"
+            in settings.MIDDLEWARE
+        )
+
+    def _get_response(self, request):
+        request.cache_control_policy = "search"
+        return HttpResponse()
+
+    def test_cache_control_policy(self):
+        middleware_func = cache_control_policy(self._get_response)
+        for method in ("get", "head"):
+            with self.subTest(method=method):
+                request = getattr(RequestFactory(), method)("/search/")
+                request.user = AnonymousUser()
+                response = middleware_func(request)
+                self.assertEqual(
+                    response["Cache-Control"],
+                    "public, max-age=0, s-maxage=300, stale-if-error=3600",
+                )
+
+    def test_cache_control_policy__not_applied(self):
+        def set_cookie(request):
+            response = self._get_response(request)
+            response.set_cookie("foo", "bar")
+            return response
+
+        def set_own_cache_control(request):
+            response = self._get_response(request)
+            response["Cache-Control"] = "no-cache"
+            return response
+
+        def not_found(request):
+            self._get_response(request)
+            return HttpResponse(status=404)
+
+        cases = [
+            ("no policy", lambda request: HttpResponse(), "get", AnonymousUser()),
+            ("post", self._get_response, "post", AnonymousUser()),
+            ("logged in", self._get_response, "get", User(username="test")),
+            ("cookie", set_cookie, "get", AnonymousUser()),
+            ("not found", not_found, "get", AnonymousUser()),
+        ]
+        for name, get_response, method, user in cases:
+            with self.subTest(name=name):
+                request = getattr(RequestFactory(), method)("/search/")
+                request.user = user
+                response = cache_control_policy(get_response)(request)
+                self.assertFalse(response.has_header("Cache-Control"))
+
+        request = RequestFactory().get("/search/")
+        request.user = AnonymousUser()
+        response = cache_control_policy(set_own_cache_control)(request)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_cache_control_policy__overridden(self):
+        def get_response(request):
+            override_cache_control_policy("deferred_rendition")
+            return self._get_response(request)
+
+        request = RequestFactory().get("/search/")
+        request.user = AnonymousUser()
+        response = cache_control_policy(get_response)(request)
+        self.assertEqual(response["Cache-Control"], "public, max-age=0, s-maxage=60")
+
+        # Responses without a policy aren't given one
+        def get_response_without_policy(request):
+            override_cache_control_policy("deferred_rendition")
+            return HttpResponse()
+
+        response = cache_control_policy(get_response_without_policy)(request)
+        self.assertFalse(response.has_header("Cache-Control"))
+
+        # Nor is anything overridden outside of the middleware
+        override_cache_control_policy("deferred_rendition")
+        response = cache_control_policy(self._get_response)(request)
+        self.assertEqual(
+            response["Cache-Control"],
+            "public, max-age=0, s-maxage=300, stale-if-error=3600",
+        )
+
+
+class CacheControlPolicyTests(TestCase):
+
+    fixtures = ["common.json"]
+
+    def test_served_responses_have_their_policy(self):
+        cases = [
+            ("/posts/faster-smarter-javascript-debugging-in-firefox/", "article"),
+            ("/events/", "events"),
+            ("/topics/css/", "default"),
+            ("/search/?q=css", "search"),
+            ("/posts-feed/", "feed"),
+        ]
+        for path, policy_name in cases:
+            with self.subTest(path=path):
+                policy = settings.CACHE_CONTROL_POLICIES[policy_name]
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response["Cache-Control"],
+                    ", ".join(
+                        ["public"]
+                        + [
+                            f"{directive.replace('_', '-')}={value}"
+                            for directive, value in policy.items()
+                        ]
+                    ),
+                )
+
+    def test_logged_in_responses_have_no_policy(self):
+        user = User.objects.create_user(username="test", password="test")
+        self.client.force_login(user)
+        response = self.client.get("/events/")
+        self.assertFalse(response.has_header("Cache-Control"))
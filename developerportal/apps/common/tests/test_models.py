@@ -1,8 +1,21 @@
+from datetime import timedelta
+from io import StringIO
 from unittest import mock
 
+from django.apps import apps
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
 
+from wagtail.core.models import Page
+from wagtail.core.signals import page_published, page_unpublished
+
+from ...articles.models import Article
 from ...content.models import ContentPage
+from ...events.models import Event
+from ..constants import RESOURCE_CARD_MODELS
+from ..models import ResourceCard
+from ..signal_handlers import update_resource_card
 
 
 class PageBaseModelTestsUsingConcreteClass(TestCase):
@@ -21,3 +34,102 @@ class PageBaseModelTestsUsingConcreteClass(TestCase):
             page._bulk_invalidation_cache_keys = ["foo", "bar", "baz"]
             page.save()
             mock_delete_many.assert_called_once_with(["foo", "bar", "baz"])
+
+
+class ResourceCardTests(TestCase):
+
+    fixtures = ["common_plus_extras_for_search_tests.json"]
+
+    def _get_live_pages(self):
+        return [
+            page
+            for model in RESOURCE_CARD_MODELS
+            for page in apps.get_model(model).objects.live()
+        ]
+
+    def test_rebuild(self):
+        live_pages = self._get_live_pages()
+        self.assertGreater(len(live_pages), 0)
+
+        count = ResourceCard.objects.rebuild()
+
+        self.assertEqual(count, len(live_pages))
+        self.assertEqual(
+            set(ResourceCard.objects.values_list("page_id", flat=True)),
+            {page.pk for page in live_pages},
+        )
+
+    def test_rebuild_resource_cards_command(self):
+        out = StringIO()
+        call_command("rebuild_resource_cards", stdout=out)
+        self.assertEqual(
+            out.getvalue(), f"Rebuilt {ResourceCard.objects.count()} resource cards\n"
+        )
+
+    def test_update_for_page(self):
+        event = Event.objects.live().first()
+        card = ResourceCard.objects.update_for_page(event)
+
+        self.assertEqual(card.page_id, event.pk)
+        self.assertEqual(card.resource_type, "event")
+        self.assertEqual(card.title, event.title)
+        self.assertEqual(card.date, event.start_date)
+        self.assertEqual(card.end_date, event.end_date)
+        self.assertEqual(card.country, event.country.code if event.country else "")
+        self.assertEqual(
+            card.topic_slugs,
+            [event_topic.topic.slug for event_topic in event.topics.all()],
+        )
+        self.assertEqual(card.card_image_id, event.card_image_id)
+
+    def test_update_for_page__unpublished_page(self):
+        article = Article.objects.live().first()
+        ResourceCard.objects.update_for_page(article)
+        self.assertTrue(ResourceCard.objects.filter(page=article).exists())
+
+        article.live = False
+        article.save()
+        self.assertIsNone(ResourceCard.objects.update_for_page(article))
+        self.assertFalse(ResourceCard.objects.filter(page=article).exists())
+
+    def test_update_for_page__not_a_resource(self):
+        page = Page.objects.first()
+        self.assertIsNone(ResourceCard.objects.update_for_page(page))
+        self.assertFalse(ResourceCard.objects.exists())
+
+    def test_update_resource_card_signal_handler(self):
+        article = Article.objects.live().first()
+        update_resource_card(sender=Article, instance=article)
+        self.assertTrue(ResourceCard.objects.filter(page=article).exists())
+
+    def test_scheduled_publishing_updates_resource_cards(self):
+        # The Celery worker runs publish_scheduled_pages, and never loads the
+        # wagtail_hooks modules, so the handler has to be connected when ready
+        self.assertIn(update_resource_card, page_published._live_receivers(Article))
+        self.assertIn(update_resource_card, page_unpublished._live_receivers(Article))
+
+        article = Article.objects.live().first()
+        article.unpublish()
+        article.save_revision(approved_go_live_at=timezone.now() - timedelta(minutes=1))
+        call_command("publish_scheduled_pages", stdout=StringIO())
+        self.assertTrue(ResourceCard.objects.filter(page=article).exists())
+
+        article.refresh_from_db()
+        article.expire_at = timezone.now() - timedelta(minutes=1)
+        article.save()
+        call_command("publish_scheduled_pages", stdout=StringIO())
+        self.assertFalse(ResourceCard.objects.filter(page=article).exists())
+
+    def test_queryset_filters(self):
+        ResourceCard.objects.rebuild()
+        article_cards = ResourceCard.objects.for_models("articles.Article")
+        self.assertEqual(article_cards.count(), Article.objects.live().count())
+
+        article = Article.objects.live().filter(topics__isnull=False).first()
+        slug = article.topics.first().topic.slug
+        self.assertIn(
+            article.pk,
+            ResourceCard.objects.with_any_topic([slug]).values_list(
+                "page_id", flat=True
+            ),
+        )
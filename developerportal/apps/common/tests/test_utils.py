@@ -1,4 +1,5 @@
 import datetime
+import json
 from unittest import mock
 
 from django.db.models import Q
@@ -10,13 +11,20 @@ from wagtail.admin.edit_handlers import get_form_for_model
 from wagtail.core.models import Page, Site
 
 from ..forms import BasePageForm
+from ..models import ResourceCard
 from ..utils import (
+    CombinedResourceSet,
+    add_children,
+    decode_cursor,
+    encode_cursor,
     get_combined_articles,
     get_combined_articles_and_videos,
     get_combined_events,
     get_combined_videos,
     get_past_event_cutoff,
     paginate_resources,
+    paginate_resources_by_cursor,
+    prefetch_page_chooser_blocks,
     prep_search_terms,
 )
 
@@ -32,6 +40,51 @@ class EventCutoffTestCase(TestCase):
         self.assertEqual(get_past_event_cutoff(), datetime.date(2002, 3, 4))
 
 
+class AddChildrenTests(TestCase):
+    def setUp(self):
+        self.parent = Page.objects.get(depth=1).add_child(
+            instance=Page(title="Parent", slug="parent")
+        )
+        self.existing_child = self.parent.add_child(
+            instance=Page(title="Existing", slug="existing")
+        )
+
+    def test_add_children(self):
+        pages = [
+            Page(title="One", slug="one"),
+            Page(title="Duplicate", slug="existing"),
+            Page(title="Two", slug="two"),
+        ]
+
+        errors = add_children(self.parent, pages)
+
+        self.assertIsNone(errors[0])
+        self.assertIn("slug", errors[1].message_dict)
+        self.assertIsNone(errors[2])
+        self.assertEqual(
+            [page.slug for page in self.parent.get_children()],
+            ["existing", "one", "two"],
+        )
+        self.assertEqual(pages[2].url_path, "/parent/two/")
+        self.parent.refresh_from_db()
+        self.assertEqual(self.parent.numchild, 3)
+
+        # The tree is left as add_child would have left it
+        self.assertEqual(
+            self.parent.add_child(instance=Page(title="Three", slug="three")).path,
+            pages[2]._inc_path(),
+        )
+
+    def test_add_children__first_children(self):
+        parent = self.existing_child
+        pages = [Page(title="One", slug="one"), Page(title="Two", slug="two")]
+
+        self.assertEqual(add_children(parent, pages), [None, None])
+        self.assertEqual(list(parent.get_children()), pages)
+        parent.refresh_from_db()
+        self.assertEqual(parent.numchild, 2)
+
+
 class HelperFunctionTests(TestCase):
     def test_paginate_resources__multiple_pages(self):
         resources = [x for x in range(1, 26)]  # [1... 25]
@@ -63,6 +116,85 @@ class HelperFunctionTests(TestCase):
         self.assertEqual(repr(resources), "<Page 1 of 3>")
         self.assertEqual([x for x in resources], [x for x in range(1, 11)])
 
+    def test_encode_and_decode_cursor(self):
+        item = mock.Mock(pk=123, date=datetime.date(2020, 2, 29), title="Zoë")
+
+        for order_by, expected in (
+            ("date", (datetime.date(2020, 2, 29), 123)),
+            ("title", ("Zoë", 123)),
+        ):
+            with self.subTest(order_by=order_by):
+                cursor = encode_cursor(item, order_by)
+                self.assertNotIn("=", cursor)
+                self.assertEqual(decode_cursor(cursor), expected)
+
+    def test_decode_cursor__bad_input(self):
+        for cursor in (None, "", "test", "W10", "!!!!", encode_cursor.__name__):
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor))
+
+    def test_paginate_resources_by_cursor__list(self):
+        resources = [
+            mock.Mock(pk=x, date=datetime.date(2020, 1, (x + 1) // 2))
+            for x in range(1, 26)
+        ]  # Pairs of items share a date, so pk has to break the tie
+
+        page_one = paginate_resources_by_cursor(
+            resources, per_page=10, order_by="date", reverse=True
+        )
+        self.assertEqual([x.pk for x in page_one], list(range(25, 15, -1)))
+        self.assertTrue(page_one.has_next())
+        self.assertFalse(page_one.has_previous())
+
+        page_two = paginate_resources_by_cursor(
+            resources,
+            per_page=10,
+            order_by="date",
+            after=page_one.next_cursor,
+            reverse=True,
+        )
+        self.assertEqual([x.pk for x in page_two], list(range(15, 5, -1)))
+        self.assertTrue(page_two.has_next())
+        self.assertTrue(page_two.has_previous())
+
+        page_three = paginate_resources_by_cursor(
+            resources,
+            per_page=10,
+            order_by="date",
+            after=page_two.next_cursor,
+            reverse=True,
+        )
+        self.assertEqual([x.pk for x in page_three], list(range(5, 0, -1)))
+        self.assertFalse(page_three.has_next())
+        self.assertIsNone(page_three.next_cursor)
+
+        back_to_page_two = paginate_resources_by_cursor(
+            resources,
+            per_page=10,
+            order_by="date",
+            before=page_three.previous_cursor,
+            reverse=True,
+        )
+        self.assertEqual(list(back_to_page_two), list(page_two))
+
+        back_to_page_one = paginate_resources_by_cursor(
+            resources,
+            per_page=10,
+            order_by="date",
+            before=back_to_page_two.previous_cursor,
+            reverse=True,
+        )
+        self.assertEqual(list(back_to_page_one), list(page_one))
+        self.assertFalse(back_to_page_one.has_previous())
+
+    def test_paginate_resources_by_cursor__bad_cursor(self):
+        resources = [mock.Mock(pk=x, title=f"Person {x:02}") for x in range(1, 26)]
+        page = paginate_resources_by_cursor(
+            resources, per_page=10, order_by="title", after="test"
+        )
+        self.assertEqual([x.pk for x in page], list(range(1, 11)))
+        self.assertFalse(page.has_previous())
+
     def test_prep_search_terms(self):
         cases = (
             {"desc": "Empty input", "input": "", "expected": ""},
@@ -117,6 +249,39 @@ class HelperFunctionTestsWithFixtures(TestCase):
     def setUpTestData(cls):
         # Note: relies on migrations to have populated the test DB
         cls.page = Page.objects.first()
+        # Fixtures don't send the signals which keep the cards up to date
+        ResourceCard.objects.rebuild()
+
+    def test_prefetch_page_chooser_blocks(self):
+        from ...articles.models import Article
+        from ...home.models import HomePage
+
+        articles = list(Article.objects.live()[:2])
+        home_page = HomePage.objects.get()
+        home_page.featured = json.dumps(
+            [{"type": "post", "value": article.pk} for article in articles]
+            + [{"type": "post", "value": 99999}]
+        )
+        home_page.save()
+        home_page = HomePage.objects.get()
+
+        prefetch_page_chooser_blocks(home_page)
+
+        with self.assertNumQueries(0):
+            values = [block.value for block in home_page.featured]
+            self.assertEqual(values, articles + [None])
+            for article in values[:2]:
+                self.assertIs(article.specific, article)
+                article.primary_topic
+                article.card_image
+
+    def test_prefetch_page_chooser_blocks__nothing_to_resolve(self):
+        from ...home.models import HomePage
+
+        home_page = HomePage.objects.get()
+        home_page.featured_people = json.dumps([])
+        with self.assertNumQueries(0):
+            prefetch_page_chooser_blocks(home_page, ["featured_people"])
 
     def test_get_combined_articles(self):
         """Getting combined articles should return items."""
@@ -138,6 +303,69 @@ class HelperFunctionTestsWithFixtures(TestCase):
         items = get_combined_videos(self.page)
         self.assertEqual(len(items), 2 + 1)
 
+    def test_get_combined_FOOs__in_database_matches_in_python(self):
+        for _callable in [get_combined_articles_and_videos, get_combined_events]:
+            with self.subTest(callable=_callable.__name__):
+                expected = _callable(self.page)
+                combined = _callable(self.page, in_database=True)
+
+                self.assertIsInstance(combined, CombinedResourceSet)
+                self.assertEqual(combined.count(), len(expected))
+                self.assertEqual(
+                    sorted(x.pk for x in combined), sorted(x.pk for x in expected)
+                )
+                # We get specific instances back, not plain Pages
+                self.assertEqual(
+                    [x.__class__ for x in combined[:2]],
+                    [x.__class__ for x in expected[:2]],
+                )
+
+    def test_get_combined_articles_and_videos__in_database_by_topic(self):
+        topic_slugs = ResourceCard.objects.exclude(topic_slugs=[]).values_list(
+            "topic_slugs", flat=True
+        )[0][:1]
+        expected = get_combined_articles_and_videos(self.page, topic_slugs=topic_slugs)
+        combined = get_combined_articles_and_videos(
+            self.page, topic_slugs=topic_slugs, in_database=True
+        )
+
+        self.assertGreater(len(expected), 0)
+        self.assertEqual({x.pk for x in combined}, {x.pk for x in expected})
+        self.assertEqual([x.date for x in combined], [x.date for x in expected])
+
+    def test_get_combined_FOOs__in_database__paginated(self):
+        combined = get_combined_articles_and_videos(self.page, in_database=True)
+        expected = [x.pk for x in combined]
+
+        paginated_pks = []
+        for page_number in range(1, combined.count() + 1):
+            resources = paginate_resources(combined, per_page=1, page_ref=page_number)
+            paginated_pks.extend(x.pk for x in resources)
+
+        self.assertEqual(paginated_pks, expected)
+
+    def test_get_combined_FOOs__in_database__paginated_by_cursor(self):
+        combined = get_combined_articles_and_videos(self.page, in_database=True)
+        expected = [x.pk for x in combined]
+
+        paginated_pks = []
+        cursor = None
+        for _ in range(combined.count()):
+            resources = paginate_resources_by_cursor(
+                combined, per_page=1, order_by="date", after=cursor, reverse=True
+            )
+            paginated_pks.extend(x.pk for x in resources)
+            cursor = resources.next_cursor
+
+        self.assertIsNone(cursor)
+        self.assertEqual(paginated_pks, expected)
+
+    def test_get_combined_FOOs__in_database__search_terms_ignore_it(self):
+        items = get_combined_articles_and_videos(
+            self.page, search_terms="test", in_database=True
+        )
+        self.assertIsInstance(items, list)
+
     def test_get_combined_FOOs__unpublished_pages_ignored(self):
 
         Page.objects.all().unpublish()
@@ -1,19 +1,39 @@
+import binascii
 import datetime
+import json
+import threading
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import Counter
+from collections.abc import Sequence
+from contextlib import contextmanager
+from functools import wraps
 from itertools import chain
 from operator import attrgetter
 from urllib.parse import unquote
 
 from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import transaction
+from django.db.models import F, Q
 from django.utils.timezone import now as tz_now
 
+from wagtail.core.blocks import PageChooserBlock, StreamValue
+from wagtail.core.fields import StreamField
+from wagtail.core.models import Page
+
 import bleach
 
 from ..common.constants import (
     EVENTS_PAGE_SEARCH_FIELDS,
     NON_SPACE_WHITESPACE,
+    PAGINATION_AFTER_QUERYSTRING_KEY,
+    PAGINATION_BEFORE_QUERYSTRING_KEY,
     POSTS_PAGE_SEARCH_FIELDS,
 )
+from ..common.models import ResourceCard
 
 
 def _combined_query(models, fn):
@@ -40,6 +60,77 @@ def prep_search_terms(terms: str) -> str:
     return terms
 
 
+class CombinedResourceSet:
+    """A lazy, sliceable alternative to the sorted list returned by
+    `get_resources()`, where the combining, ordering and slicing is all done
+    by the database via a single UNION ALL query.
+
+    Only `count()` and slicing touch the database, which is all that
+    `paginate_resources()` needs, so only the page of results actually being
+    shown is ever turned into (specific) Page instances.
+
+    Params:
+        querysets - already filtered querysets, eg one per model, or one of
+            ResourceCards. Each must be able to provide `pk` (a Page ID) and
+            the `order_by` field.
+        order_by - field to order the combined set by, must be common to all.
+        reverse - whether to reverse the ordering, default false.
+    """
+
+    def __init__(self, querysets, order_by, reverse=False):
+        self.querysets = list(querysets)
+        self.order_by = order_by
+        self.reverse = reverse
+        self._count = None
+
+    def _get_union(self):
+        # DISTINCT matters because filtering on related fields (eg topics) can
+        # return the same page more than once. Page IDs are unique across all
+        # of the concrete models, so there's no need to de-dupe the union itself
+        id_querysets = [
+            qs.order_by().values_list("pk", self.order_by).distinct()
+            for qs in self.querysets
+        ]
+        prefix = "-" if self.reverse else ""
+        union = id_querysets[0].union(*id_querysets[1:], all=True)
+        # pk is a tie-breaker, so that page boundaries are deterministic
+        return union.order_by(f"{prefix}{self.order_by}", f"{prefix}pk")
+
+    def filter(self, *args, **kwargs):
+        """Return a new CombinedResourceSet with the filter applied to each model"""
+        return CombinedResourceSet(
+            [qs.filter(*args, **kwargs) for qs in self.querysets],
+            order_by=self.order_by,
+            reverse=self.reverse,
+        )
+
+    def count(self):
+        if self._count is None:
+            self._count = self._get_union().count() if self.querysets else 0
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            stop = key + 1
+            results = self[key:stop]
+            if not results:
+                raise IndexError("CombinedResourceSet index out of range")
+            return results[0]
+
+        if not self.querysets:
+            return []
+
+        ids = [pk for pk, _ in self._get_union()[key]]
+        pages = {page.pk: page for page in Page.objects.filter(pk__in=ids).specific()}
+        return [pages[pk] for pk in ids if pk in pages]
+
+
 def get_resources(
     page,
     models,
@@ -49,6 +140,7 @@ def get_resources(
     order_by=None,
     reverse=False,
     search_fields=None,
+    in_database=False,
 ):
     """Get resources for provided models matching filters.
 
@@ -61,14 +153,28 @@ def get_resources(
         order_by - key to order the combined set by, must be common to all models.
         reverse - whether to reverse the combined set, default false.
         search_fields - which fields to restrict the search to; optional
+        in_database - if True, and there are no search_terms, return a lazy
+            CombinedResourceSet instead of a list. Best used when the results
+            are going to be paginated.
     """
 
-    def callback(model):
+    def get_queryset(model):
         qs = model.published_objects
         if q_object:
             qs = qs.filter(q_object)
+        return qs.filter(**(filters or {})).not_page(page)
 
-        qs = qs.filter(**filters).not_page(page).specific()
+    if in_database and not search_terms:
+        # Postgres search results can't be UNIONed, so searches always
+        # take the slower path, below
+        return CombinedResourceSet(
+            [get_queryset(_resolve_model(model)) for model in models],
+            order_by=order_by,
+            reverse=reverse,
+        )
+
+    def callback(model):
+        qs = get_queryset(model).specific()
 
         if search_terms:
             # This has to come after .filter() because PostgresSearchResults
@@ -91,30 +197,51 @@ def get_combined_articles(page, **filters):
     )
 
 
-def get_combined_articles_and_videos(page, q_object=None, search_terms=None, **filters):
-    """Get internal and external articles and videos matching filters
-    and/or search terms"""
+def get_combined_articles_and_videos(
+    page,
+    q_object=None,
+    search_terms=None,
+    in_database=False,
+    topic_slugs=None,
+    **filters,
+):
+    """Get internal and external articles and videos matching filters, topics
+    and/or search terms. See get_resources() for `in_database`"""
+    models = [
+        "articles.Article",
+        "videos.Video",
+        "externalcontent.ExternalArticle",
+        "externalcontent.ExternalVideo",
+    ]
+
+    if in_database and not (q_object or search_terms or filters):
+        # Listings only filtered by topic can come straight from the
+        # denormalised ResourceCards, rather than a UNION across every model
+        cards = ResourceCard.objects.for_models(*models).exclude(page_id=page.pk)
+        if topic_slugs:
+            cards = cards.with_any_topic(topic_slugs)
+        return CombinedResourceSet([cards], order_by="date", reverse=True)
+
+    if topic_slugs:
+        q_object = (q_object or Q()) & Q(topics__topic__slug__in=topic_slugs)
     return get_resources(
         page,
-        [
-            "articles.Article",
-            "videos.Video",
-            "externalcontent.ExternalArticle",
-            "externalcontent.ExternalVideo",
-        ],
+        models,
         filters=filters,
         q_object=q_object,
         search_terms=search_terms,
         order_by="date",
         reverse=True,
         search_fields=POSTS_PAGE_SEARCH_FIELDS,
+        in_database=in_database,
     )
 
 
 def get_combined_events(
-    page, reverse=False, q_object=None, search_terms=None, **filters
+    page, reverse=False, q_object=None, search_terms=None, in_database=False, **filters
 ):
-    """Get internal and external events matching filters and/or search terms"""
+    """Get internal and external events matching filters and/or search terms.
+    See get_resources() for `in_database`"""
 
     return get_resources(
         page,
@@ -125,6 +252,7 @@ def get_combined_events(
         order_by="start_date",
         reverse=reverse,
         search_fields=EVENTS_PAGE_SEARCH_FIELDS,
+        in_database=in_database,
     )
 
 
@@ -139,6 +267,136 @@ def get_combined_videos(page, **filters):
     )
 
 
+def prefetch_page_chooser_blocks(page, field_names=None):
+    """Resolve the PageChooserBlocks in a page's StreamFields in bulk.
+
+    Left to Wagtail, chooser values are fetched per block type as plain Pages,
+    then templates call `.specific`, `card_image` and `primary_topic` for each
+    one. Instead, this gathers the chosen ids from every StreamField (or just
+    those in `field_names`) and fetches them with one query to find their
+    types, plus one query per concrete type that also fetches their card images,
+    renditions and topics. The specific pages are then bound to the blocks.
+
+    Only top-level blocks in StreamFields that haven't been accessed yet are
+    resolved; anything else is left for Wagtail to resolve as usual.
+    """
+
+    if field_names is None:
+        field_names = [
+            field.name
+            for field in page._meta.get_fields()
+            if isinstance(field, StreamField)
+        ]
+
+    unresolved = []  # (StreamValue, index, block, page id)
+    for field_name in field_names:
+        stream_value = getattr(page, field_name)
+        if not stream_value or not stream_value.is_lazy:
+            continue
+        for index, raw_value in enumerate(stream_value.stream_data):
+            block = stream_value.stream_block.child_blocks.get(raw_value["type"])
+            if (
+                isinstance(block, PageChooserBlock)
+                and raw_value.get("value")
+                and index not in stream_value._bound_blocks
+            ):
+                unresolved.append((stream_value, index, block, raw_value["value"]))
+
+    if not unresolved:
+        return
+
+    ids_by_content_type = {}
+    for pk, content_type_id in Page.objects.filter(
+        pk__in={pk for _, _, _, pk in unresolved}
+    ).values_list("pk", "content_type_id"):
+        ids_by_content_type.setdefault(content_type_id, []).append(pk)
+
+    pages = {}
+    for content_type_id, ids in ids_by_content_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        model_fields = {field.name for field in model._meta.get_fields()}
+        image_fields = [
+            field for field in ("card_image", "card_image_3_2") if field in model_fields
+        ]
+        prefetches = [f"{field}__renditions" for field in image_fields]
+        if "topics" in model_fields:
+            prefetches.append("topics__topic")
+        pages.update(
+            model.objects.filter(pk__in=ids)
+            .select_related(*image_fields)
+            .prefetch_related(*prefetches)
+            .in_bulk()
+        )
+
+    for stream_value, index, block, pk in unresolved:
+        # Pages that no longer exist resolve to None, as Wagtail would do
+        stream_value._bound_blocks[index] = StreamValue.StreamChild(
+            block, pages.get(pk), id=stream_value.stream_data[index].get("id")
+        )
+
+
+def _lock_for_new_children(parent):
+    """Lock the parent page, so that no one else can add children to it
+    meanwhile, and return it along with the tree path for its next child"""
+    parent = Page.objects.select_for_update().get(pk=parent.pk)
+    last_child = parent.get_last_child()
+    if last_child is None:
+        return parent, Page._get_path(parent.path, parent.depth + 1, 1)
+    return parent, last_child._inc_path()
+
+
+@transaction.atomic
+def add_children(parent, pages):
+    """Add the given unsaved pages as the last children of parent, as
+    `parent.add_child(instance=page)` would for each one, but reading the
+    parent and its last child only once and updating its numchild only once.
+
+    Pages that fail validation are not added. Returns a list of the
+    ValidationError for each page, or None for each page that was added."""
+
+    parent, next_path = _lock_for_new_children(parent)
+    errors = []
+    for page in pages:
+        page.depth = parent.depth + 1
+        page.path = next_path
+        page._cached_parent_obj = parent
+        try:
+            page.save()
+        except ValidationError as error:
+            errors.append(error)
+        else:
+            errors.append(None)
+            next_path = page._inc_path()
+
+    Page.objects.filter(pk=parent.pk).update(
+        numchild=F("numchild") + errors.count(None)
+    )
+    return errors
+
+
+@transaction.atomic
+def move_children(parent, pages):
+    """Move the given pages, which must not have children of their own, to be
+    the last children of parent, as `page.move(parent, "last-child")` would for
+    each one, but with one update for all of the pages."""
+
+    parent, next_path = _lock_for_new_children(parent)
+    moved_from = Counter()
+    for page in pages:
+        moved_from[Page._get_parent_path_from_path(page.path)] += 1
+        page.path = next_path
+        page.depth = parent.depth + 1
+        page.set_url_path(parent)
+        next_path = page._inc_path()
+
+    Page.objects.bulk_update(pages, ["path", "depth", "url_path"])
+    for old_parent_path, count in moved_from.items():
+        Page.objects.filter(path=old_parent_path).update(numchild=F("numchild") - count)
+    Page.objects.filter(pk=parent.pk).update(numchild=F("numchild") + len(pages))
+
+
 def get_past_event_cutoff():
     # A safe datetime that defines when 'past' has happened
     # so we don't stop showing events too soon
@@ -157,3 +415,215 @@ def paginate_resources(resources, per_page, page_ref):
         resources = paginator.page(1)
 
     return resources
+
+
+class CursorPage(Sequence):
+    """One page of results from paginate_resources_by_cursor().
+
+    Offers the same has_next()/has_previous() API as Django's paginator Page,
+    but rather than page numbers it offers `next_cursor` and `previous_cursor`
+    tokens, derived from the last and first items on this page.
+    """
+
+    uses_cursor = True  # So templates can tell this apart from a paginator Page
+
+    def __init__(self, object_list, order_by, has_next, has_previous):
+        self.object_list = object_list
+        self.order_by = order_by
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self)} items>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_cursor(self.object_list[-1], self.order_by)
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return encode_cursor(self.object_list[0], self.order_by)
+
+
+def encode_cursor(instance, order_by):
+    """Return an opaque, URL-safe token for the position of `instance` in a
+    listing ordered by `order_by` then pk. The same item always produces the
+    same token, so pages linked to via cursors are stable enough to cache."""
+    value = attrgetter(order_by)(instance)
+    if isinstance(value, datetime.date):
+        payload = ["date", value.isoformat(), instance.pk]
+    else:
+        payload = ["str", str(value), instance.pk]
+    encoded = urlsafe_b64encode(json.dumps(payload).encode("utf-8"))
+    return encoded.decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the (value, pk) tuple from a token made by encode_cursor(), or
+    None if the token is not valid"""
+    if not cursor:
+        return None
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        kind, value, pk = json.loads(urlsafe_b64decode(cursor + padding))
+        if kind == "date":
+            value = datetime.date.fromisoformat(value)
+        elif kind != "str":
+            return None
+        return (value, int(pk))
+    except (binascii.Error, TypeError, ValueError):
+        # ValueError covers bad JSON, bad dates, bad unpacking and bad ints
+        return None
+
+
+def use_cursor_pagination(request):
+    """Whether a listing should be paginated by cursor rather than by page
+    number. Requests that already carry a cursor are always honoured, so that
+    links remain valid even if USE_CURSOR_PAGINATION is later turned off."""
+    return settings.USE_CURSOR_PAGINATION or any(
+        key in request.GET
+        for key in (PAGINATION_AFTER_QUERYSTRING_KEY, PAGINATION_BEFORE_QUERYSTRING_KEY)
+    )
+
+
+def _order_for_cursor(resources, order_by, descending):
+    if isinstance(resources, CombinedResourceSet):
+        return CombinedResourceSet(
+            resources.querysets, order_by=order_by, reverse=descending
+        )
+    prefix = "-" if descending else ""
+    return resources.order_by(f"{prefix}{order_by}", f"{prefix}pk")
+
+
+def _filter_for_cursor(resources, order_by, cursor_key, greater):
+    value, pk = cursor_key
+    lookup = "gt" if greater else "lt"
+
+    if isinstance(resources, list):
+        # Search results can't be filtered in the database, so do it here
+        if greater:
+            return [
+                x for x in resources if (attrgetter(order_by)(x), x.pk) > (value, pk)
+            ]
+        return [x for x in resources if (attrgetter(order_by)(x), x.pk) < (value, pk)]
+
+    return resources.filter(
+        Q(**{f"{order_by}__{lookup}": value})
+        | Q(**{order_by: value, f"pk__{lookup}": pk})
+    )
+
+
+def paginate_resources_by_cursor(
+    resources, per_page, order_by, after=None, before=None, reverse=False
+):
+    """Keyset ("cursor") alternative to paginate_resources().
+
+    Rather than counting and OFFSETting into `resources`, this seeks straight to
+    the items either side of a cursor (see encode_cursor()), ordered by
+    `order_by` then pk. So the cost of any page is the same as that of the
+    first, and a page's contents don't shift when new items are published.
+
+    Params:
+        resources - a QuerySet, CombinedResourceSet or list of resources
+        per_page - max number of items per page
+        order_by - field to order by, eg "date" or "title"
+        after - optional cursor: return the items after this one
+        before - optional cursor: return the items before this one
+        reverse - whether to order by `order_by` descending, default false
+
+    Returns a CursorPage. An invalid cursor is treated as no cursor at all,
+    i.e. the first page is returned.
+    """
+
+    after_key = decode_cursor(after)
+    before_key = decode_cursor(before) if not after_key else None
+
+    if isinstance(resources, (list, tuple)):
+        resources = sorted(
+            resources, key=lambda x: (attrgetter(order_by)(x), x.pk), reverse=reverse
+        )
+    else:
+        resources = _order_for_cursor(resources, order_by, descending=reverse)
+
+    if before_key:
+        # Walk backwards from the cursor, then flip the results round
+        if isinstance(resources, list):
+            resources = list(reversed(resources))
+        else:
+            resources = _order_for_cursor(resources, order_by, descending=not reverse)
+        resources = _filter_for_cursor(resources, order_by, before_key, greater=reverse)
+        items = list(resources[: per_page + 1])
+        return CursorPage(
+            list(reversed(items[:per_page])),
+            order_by=order_by,
+            has_next=True,
+            has_previous=len(items) > per_page,
+        )
+
+    if after_key:
+        resources = _filter_for_cursor(
+            resources, order_by, after_key, greater=not reverse
+        )
+    items = list(resources[: per_page + 1])
+    return CursorPage(
+        items[:per_page],
+        order_by=order_by,
+        has_next=len(items) > per_page,
+        has_previous=after_key is not None,
+    )
+
+
+def with_cache_control_policy(policy_name):
+    """Decorate a view so that the cache_control_policy middleware sends the named
+    policy from settings.CACHE_CONTROL_POLICIES with its anonymous GETs"""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped_view(request, *args, **kwargs):
+            request.cache_control_policy = policy_name
+            return view_func(request, *args, **kwargs)
+
+        return wrapped_view
+
+    return decorator
+
+
+_local = threading.local()
+
+
+@contextmanager
+def cache_control_policy_override():
+    """Let `override_cache_control_policy()` be called for the duration of the
+    block, which yields a dict holding the overriding policy's name, if any"""
+    previous = getattr(_local, "cache_control_policy_override", None)
+    _local.cache_control_policy_override = {}
+    try:
+        yield _local.cache_control_policy_override
+    finally:
+        _local.cache_control_policy_override = previous
+
+
+def override_cache_control_policy(policy_name):
+    """Have the cache_control_policy middleware send the named policy in place of
+    the usual one for the response being built. For code with no access to the
+    request, eg a template tag showing a placeholder."""
+    override = getattr(_local, "cache_control_policy_override", None)
+    if override is not None:
+        override["policy_name"] = policy_name
@@ -1,12 +1,16 @@
 # pylint: disable=no-member
 from django.contrib.staticfiles.templatetags.staticfiles import static
+from django.db.models.signals import post_init
 from django.utils.html import escape, format_html
 
 import wagtail.admin.rich_text.editors.draftail.features as draftail_features
 from wagtail.admin.rich_text.converters.html_to_contentstate import BlockElementHandler
 from wagtail.core import hooks
+from wagtail.core.models import get_page_models
 from wagtail.core.rich_text import LinkHandler
 
+from .cache_tags import tag_loaded_page
+
 
 class NewWindowExternalLinkHandler(LinkHandler):
     # This specifies to do this override for external links only.
@@ -79,3 +83,15 @@ def global_admin_css():
     return format_html(
         '<link rel="stylesheet" href="{}">', static("css/admin_extras.css")
     )
+
+
+@hooks.register("before_serve_page")
+def set_cache_control_policy(page, request, serve_args, serve_kwargs):
+    """Have the cache_control_policy middleware use the served page's policy"""
+    request.cache_control_policy = getattr(page, "cache_control_policy", "default")
+
+
+# Tag each response with the pages loaded while building it. Every page model
+# sends post_init as itself, so they're each connected.
+for page_model in get_page_models():
+    post_init.connect(tag_loaded_page, sender=page_model)
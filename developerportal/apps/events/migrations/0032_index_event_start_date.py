@@ -0,0 +1,19 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0031_event_sidebar'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='start_date',
+            field=models.DateField(db_index=True, default=datetime.date.today),
+        ),
+    ]
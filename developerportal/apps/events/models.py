@@ -37,12 +37,15 @@ from wagtail.search import index
 
 from ..common.blocks import AgendaItemBlock, ExternalSpeakerBlock, FeaturedExternalBlock
 from ..common.constants import (
+    CARD_IMAGE_FILTER_SPEC,
     DATE_PARAMS_QUERYSTRING_KEY,
     DEFAULT_EVENTS_LOOKAHEAD_WINDOW_MONTHS,
     DESCRIPTION_MAX_LENGTH,
     FUTURE_EVENTS_QUERYSTRING_VALUE,
     LOCATION_QUERYSTRING_KEY,
     MOZILLA_SUPPORT_STRING,
+    PAGINATION_AFTER_QUERYSTRING_KEY,
+    PAGINATION_BEFORE_QUERYSTRING_KEY,
     PAGINATION_QUERYSTRING_KEY,
     PAST_EVENTS_QUERYSTRING_VALUE,
     RICH_TEXT_FEATURES_SIMPLE,
@@ -50,17 +53,31 @@ from ..common.constants import (
     TOPIC_QUERYSTRING_KEY,
 )
 from ..common.fields import CustomStreamField
+from ..common.identity_map import get_related_instance, memoize
 from ..common.models import BasePage
 from ..common.utils import (
     get_combined_events,
     get_past_event_cutoff,
     paginate_resources,
+    paginate_resources_by_cursor,
+    prefetch_page_chooser_blocks,
+    use_cursor_pagination,
 )
+from ..mozimages.utils import prefetch_card_renditions
 from ..topics.models import Topic
 
 logger = logging.getLogger(__name__)
 
 
+def get_default_events_window_end(window_start):
+    """Return the last start date of the events shown by default on the Events
+    page, for a window beginning at `window_start`"""
+    return window_start + relativedelta.relativedelta(
+        months=DEFAULT_EVENTS_LOOKAHEAD_WINDOW_MONTHS,
+        days=1,  # Because get_past_event_cutoff() goes back to yesterday
+    )
+
+
 class EventsTag(TaggedItemBase):
     content_object = ParentalKey(
         "Events", on_delete=CASCADE, related_name="tagged_items"
@@ -89,6 +106,8 @@ class Events(BasePage):
 
     EVENTS_PER_PAGE = 8
 
+    # Which events are upcoming changes daily
+    cache_control_policy = "events"
     parent_page_types = ["home.HomePage"]
     subpage_types = ["events.Event"]
     template = "events.html"
@@ -191,8 +210,10 @@ class Events(BasePage):
 
     def get_context(self, request):
         context = super().get_context(request)
+        prefetch_page_chooser_blocks(self, ["featured"])
         context["filters"] = self.get_filters(request)
         context["events"] = self.get_events(request)
+        prefetch_card_renditions(context["events"], [CARD_IMAGE_FILTER_SPEC])
         return context
 
     def _build_date_q(self, date_params):
@@ -225,10 +246,7 @@ class Events(BasePage):
             date_q = Q()  # Because we don't need to restrict
         else:
             window_start = get_past_event_cutoff()
-            window_end = window_start + relativedelta.relativedelta(
-                months=DEFAULT_EVENTS_LOOKAHEAD_WINDOW_MONTHS,
-                days=1,  # Because get_past_event_cutoff() goes back to yesterday
-            )
+            window_end = get_default_events_window_end(window_start)
             date_q = Q(start_date__gte=window_start, start_date__lte=window_end)
         return date_q
 
@@ -255,9 +273,22 @@ class Events(BasePage):
             combined_q.add(topics_q, Q.AND)
 
         events = get_combined_events(
-            self, reverse=False, q_object=combined_q, search_terms=search_terms
+            self,
+            reverse=False,
+            q_object=combined_q,
+            search_terms=search_terms,
+            in_database=True,
         )
 
+        if use_cursor_pagination(request):
+            return paginate_resources_by_cursor(
+                events,
+                per_page=self.EVENTS_PER_PAGE,
+                order_by="start_date",
+                after=request.GET.get(PAGINATION_AFTER_QUERYSTRING_KEY),
+                before=request.GET.get(PAGINATION_BEFORE_QUERYSTRING_KEY),
+            )
+
         events = paginate_resources(
             events,
             page_ref=request.GET.get(PAGINATION_QUERYSTRING_KEY),
@@ -312,6 +343,7 @@ class Events(BasePage):
 
 class Event(BasePage):
     resource_type = "event"
+    cache_control_policy = "event"
     parent_page_types = ["events.Events"]
     subpage_types = []
     template = "event.html"
@@ -327,7 +359,7 @@ class Event(BasePage):
         ),
         max_length=DESCRIPTION_MAX_LENGTH,
     )
-    start_date = DateField(default=datetime.date.today)
+    start_date = DateField(default=datetime.date.today, db_index=True)
     end_date = DateField(blank=True, null=True)
     latitude = FloatField(blank=True, null=True)  # DEPRECATED
     longitude = FloatField(blank=True, null=True)  # DEPRECATED
@@ -599,6 +631,7 @@ class Event(BasePage):
 
     def get_context(self, request):
         context = super().get_context(request)
+        prefetch_page_chooser_blocks(self, ["speakers", "extra_content_panel"])
         return context
 
     @property
@@ -617,8 +650,12 @@ class Event(BasePage):
     @property
     def primary_topic(self):
         """Return the first (primary) topic specified for the event."""
-        article_topic = self.topics.first()
-        return article_topic.topic if article_topic else None
+
+        def get_primary_topic():
+            event_topic = self.topics.first()
+            return get_related_instance(event_topic, "topic") if event_topic else None
+
+        return memoize(("primary_topic", self.pk), get_primary_topic)
 
     @property
     def month_group(self):
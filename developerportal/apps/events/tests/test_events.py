@@ -180,7 +180,11 @@ class EventsTests(PatchedWagtailPageTests):
 
         events_page.get_events(fake_request)
         mock_get_combined_events.assert_called_once_with(
-            events_page, q_object=expected_q, search_terms=None, reverse=False
+            events_page,
+            q_object=expected_q,
+            search_terms=None,
+            reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -212,7 +216,11 @@ class EventsTests(PatchedWagtailPageTests):
 
         events_page.get_events(fake_request)
         mock_get_combined_events.assert_called_once_with(
-            events_page, q_object=expected_q, search_terms="test event", reverse=False
+            events_page,
+            q_object=expected_q,
+            search_terms="test event",
+            reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -244,7 +252,11 @@ class EventsTests(PatchedWagtailPageTests):
 
         events_page.get_events(fake_request)
         mock_get_combined_events.assert_called_once_with(
-            events_page, q_object=expected_q, search_terms=None, reverse=False
+            events_page,
+            q_object=expected_q,
+            search_terms=None,
+            reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -280,6 +292,7 @@ class EventsTests(PatchedWagtailPageTests):
             q_object=expected_q,
             search_terms="another test event",
             reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -310,7 +323,11 @@ class EventsTests(PatchedWagtailPageTests):
 
         events_page.get_events(fake_request)
         mock_get_combined_events.assert_called_once_with(
-            events_page, q_object=expected_q, search_terms=None, reverse=False
+            events_page,
+            q_object=expected_q,
+            search_terms=None,
+            reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -342,7 +359,11 @@ class EventsTests(PatchedWagtailPageTests):
 
         events_page.get_events(fake_request)
         mock_get_combined_events.assert_called_once_with(
-            events_page, q_object=expected_q, search_terms="test here", reverse=False
+            events_page,
+            q_object=expected_q,
+            search_terms="test here",
+            reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -373,7 +394,11 @@ class EventsTests(PatchedWagtailPageTests):
 
         events_page.get_events(fake_request)
         mock_get_combined_events.assert_called_once_with(
-            events_page, q_object=expected_q, search_terms=None, reverse=False
+            events_page,
+            q_object=expected_q,
+            search_terms=None,
+            reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -411,6 +436,7 @@ class EventsTests(PatchedWagtailPageTests):
             q_object=expected_q,
             search_terms="another test query",
             reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -443,7 +469,11 @@ class EventsTests(PatchedWagtailPageTests):
 
         events_page.get_events(fake_request)
         mock_get_combined_events.assert_called_once_with(
-            events_page, q_object=expected_q, search_terms=None, reverse=False
+            events_page,
+            q_object=expected_q,
+            search_terms=None,
+            reverse=False,
+            in_database=True,
         )
 
     @mock.patch("developerportal.apps.events.models.get_past_event_cutoff")
@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wagtail.core.models import Page
+
+from ....common.utils import move_children
+from ...models import ExternalArticle, ExternalContentFolder
+
+
+class Command(BaseCommand):
+    help = (
+        "Move ExternalArticles from the root page into the ExternalContentFolder "
+        "for their month, in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of ExternalArticles to move in each transaction",
+        )
+
+    def handle(self, *args, **options):
+        root_page = Page.objects.filter(slug="root").first()
+        unmoved = ExternalArticle.objects.child_of(root_page).order_by("path")
+        moved = 0
+        while True:
+            articles = list(unmoved[: options["batch_size"]])
+            if not articles:
+                break
+
+            articles_by_month = defaultdict(list)
+            for article in articles:
+                month = (article.date.year, article.date.month)
+                articles_by_month[month].append(article)
+            with transaction.atomic():
+                for month_articles in articles_by_month.values():
+                    folder = ExternalContentFolder.for_date(month_articles[0].date)
+                    move_children(folder, month_articles)
+
+            moved += len(articles)
+            self.stdout.write(f"Moved {moved} ExternalArticles")
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('externalcontent', '0031_update_streamblock'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='externalarticle',
+            name='date',
+            field=models.DateField(db_index=True, default=datetime.date.today, help_text='The date the external post was published', verbose_name='External Post date'),
+        ),
+        migrations.AlterField(
+            model_name='externalevent',
+            name='start_date',
+            field=models.DateField(db_index=True, default=datetime.date.today, help_text='The date the event is scheduled to start'),
+        ),
+        migrations.AlterField(
+            model_name='externalvideo',
+            name='date',
+            field=models.DateField(db_index=True, default=datetime.date.today, help_text='The date the video was published', verbose_name='Video date'),
+        ),
+    ]
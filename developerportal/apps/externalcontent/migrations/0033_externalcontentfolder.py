@@ -0,0 +1,25 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0041_group_collection_permissions_verbose_name_plural'),
+        ('externalcontent', '0032_index_dates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExternalContentFolder',
+            fields=[
+                ('page_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='wagtailcore.Page')),
+            ],
+            options={
+                'verbose_name': 'External Content folder',
+            },
+            bases=('wagtailcore.page',),
+        ),
+    ]
@@ -2,6 +2,7 @@
 import datetime
 import logging
 
+from django.db import transaction
 from django.db.models import (
     CASCADE,
     SET_NULL,
@@ -10,7 +11,7 @@ from django.db.models import (
     ForeignKey,
     URLField,
 )
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 
 from django_countries.fields import CountryField
 from modelcluster.fields import ParentalKey
@@ -25,7 +26,7 @@ from wagtail.admin.edit_handlers import (
 )
 from wagtail.core.blocks import PageChooserBlock
 from wagtail.core.fields import RichTextField, StreamBlock, StreamField
-from wagtail.core.models import Orderable
+from wagtail.core.models import Orderable, Page
 from wagtail.images.edit_handlers import ImageChooserPanel
 from wagtail.search import index
 
@@ -154,6 +155,7 @@ class ExternalArticle(ExternalContent):
         "External Post date",
         default=datetime.date.today,
         help_text="The date the external post was published",
+        db_index=True,
     )
     authors = StreamField(
         StreamBlock(
@@ -249,6 +251,7 @@ class ExternalEvent(ExternalContent):
     start_date = DateField(
         default=datetime.date.today,
         help_text="The date the event is scheduled to start",
+        db_index=True,
     )
     end_date = DateField(
         blank=True, null=True, help_text="The date the event is scheduled to end"
@@ -364,6 +367,7 @@ class ExternalVideo(ExternalContent):
         "Video date",
         default=datetime.date.today,
         help_text="The date the video was published",
+        db_index=True,
     )
     speakers = StreamField(
         StreamBlock(
@@ -418,3 +422,49 @@ class ExternalVideo(ExternalContent):
             if str(speaker.value) == str(person.title):
                 return True
         return False
+
+
+class ExternalContentFolder(Page):
+    """A page that only exists to contain ingested ExternalArticles, one per
+    year and, within that, one per month, so that no one page ends up with
+    thousands of children."""
+
+    is_creatable = False
+    parent_page_types = ["wagtailcore.Page", "ExternalContentFolder"]
+    subpage_types = ["ExternalArticle", "ExternalContentFolder"]
+
+    class Meta:
+        verbose_name = "External Content folder"
+
+    @classmethod
+    def for_date(cls, date):
+        """Return the folder for the month of the given date, creating it (and
+        the folder for its year) if need be"""
+        root_page = Page.objects.filter(slug="root").first()
+        year_folder = cls._get_or_add_child(
+            root_page, title=f"External Posts {date:%Y}", slug=f"external-{date:%Y}"
+        )
+        return cls._get_or_add_child(
+            year_folder, title=f"External Posts {date:%B %Y}", slug=f"{date:%Y-%m}"
+        )
+
+    @classmethod
+    def _get_or_add_child(cls, parent, title, slug):
+        folder = cls.objects.child_of(parent).filter(slug=slug).first()
+        if folder is not None:
+            return folder
+
+        with transaction.atomic():
+            # Lock the parent, so that an overlapping ingestion run adding the
+            # same folder waits for this one, then finds the folder it added.
+            # The fresh copy also has the parent's current numchild, which
+            # add_child() uses to place the new page in the tree.
+            parent = Page.objects.select_for_update().get(pk=parent.pk)
+            folder = cls.objects.child_of(parent).filter(slug=slug).first()
+            if folder is None:
+                folder = parent.add_child(instance=cls(title=title, slug=slug))
+        return folder
+
+    def serve(self, request, *args, **kwargs):
+        # Folders have nothing to show
+        raise Http404
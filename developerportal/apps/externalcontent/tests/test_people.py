@@ -1,15 +1,28 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
 from wagtail.core.models import Page
 
 from developerportal.apps.common.test_helpers import PatchedWagtailPageTests
 
-from ..models import ExternalArticle, ExternalEvent, ExternalVideo
+from ..models import (
+    ExternalArticle,
+    ExternalContentFolder,
+    ExternalEvent,
+    ExternalVideo,
+)
 
 
 class ExternalArticleTests(PatchedWagtailPageTests):
     """Tests for the ExternalArticle model."""
 
     def test_external_article_parent_pages(self):
-        self.assertAllowedParentPageTypes(ExternalArticle, {Page})
+        self.assertAllowedParentPageTypes(
+            ExternalArticle, {Page, ExternalContentFolder}
+        )
 
     def test_external_article_subpages(self):
         self.assertAllowedSubpageTypes(ExternalArticle, {})
@@ -33,3 +46,81 @@ class ExternalVideoTests(PatchedWagtailPageTests):
 
     def test_external_video_subpages(self):
         self.assertAllowedSubpageTypes(ExternalVideo, {})
+
+
+class ExternalContentFolderTests(TestCase):
+    def setUp(self):
+        self.root_page = Page.objects.get(slug="root")
+
+    def test_for_date(self):
+        folder = ExternalContentFolder.for_date(datetime.date(2020, 1, 10))
+
+        self.assertEqual(folder.slug, "2020-01")
+        self.assertEqual(folder.title, "External Posts January 2020")
+        year_folder = folder.get_parent().specific
+        self.assertIsInstance(year_folder, ExternalContentFolder)
+        self.assertEqual(year_folder.slug, "external-2020")
+        self.assertEqual(year_folder.get_parent(), self.root_page)
+
+        # Existing folders are reused
+        self.assertEqual(
+            ExternalContentFolder.for_date(datetime.date(2020, 1, 31)), folder
+        )
+        february = ExternalContentFolder.for_date(datetime.date(2020, 2, 1))
+        self.assertEqual(february.get_parent().pk, year_folder.pk)
+
+    def test_for_date__stale_parent(self):
+        # As an overlapping run would have, from before the other run added to it
+        year_folder = ExternalContentFolder._get_or_add_child(
+            self.root_page, title="External Posts 2020", slug="external-2020"
+        )
+        january = ExternalContentFolder.for_date(datetime.date(2020, 1, 10))
+        self.assertEqual(year_folder.numchild, 0)
+
+        self.assertEqual(
+            ExternalContentFolder._get_or_add_child(
+                year_folder, title="External Posts January 2020", slug="2020-01"
+            ),
+            january,
+        )
+        february = ExternalContentFolder._get_or_add_child(
+            year_folder, title="External Posts February 2020", slug="2020-02"
+        )
+        self.assertEqual(february.get_parent().pk, year_folder.pk)
+        year_folder.refresh_from_db()
+        self.assertEqual(year_folder.numchild, 2)
+
+    def test_move_external_posts_to_folders(self):
+        dates = [
+            datetime.date(2019, 12, 10),
+            datetime.date(2020, 1, 10),
+            datetime.date(2020, 1, 11),
+        ]
+        articles = [
+            self.root_page.add_child(
+                instance=ExternalArticle(
+                    title=f"Post {index}",
+                    slug=f"post-{index}",
+                    date=date,
+                    external_url="https://example.com/",
+                )
+            )
+            for index, date in enumerate(dates)
+        ]
+        out = StringIO()
+
+        call_command("move_external_posts_to_folders", batch_size=2, stdout=out)
+
+        self.assertEqual(
+            out.getvalue(), "Moved 2 ExternalArticles\nMoved 3 ExternalArticles\n"
+        )
+        for article in articles:
+            article.refresh_from_db()
+            self.assertEqual(
+                article.get_parent(update=True).pk,
+                ExternalContentFolder.for_date(article.date).pk,
+            )
+        january = ExternalContentFolder.for_date(datetime.date(2020, 1, 1))
+        self.assertEqual(january.numchild, 2)
+        self.assertEqual(articles[2].url_path, f"{january.url_path}{articles[2].slug}/")
+        self.assertFalse(ExternalArticle.objects.child_of(self.root_page).exists())
@@ -24,6 +24,7 @@ from wagtail.images.edit_handlers import ImageChooserPanel
 from ..common.blocks import FeaturedExternalBlock
 from ..common.constants import DESCRIPTION_MAX_LENGTH
 from ..common.models import BasePage
+from ..common.utils import prefetch_page_chooser_blocks
 
 
 class HomePageTag(TaggedItemBase):
@@ -213,6 +214,11 @@ class HomePage(BasePage):
         # Allow only one instance of this page type
         return super().can_create_at(parent) and not cls.objects.exists()
 
+    def get_context(self, request):
+        context = super().get_context(request)
+        prefetch_page_chooser_blocks(self, ["featured", "featured_people"])
+        return context
+
     @property
     def primary_topics(self):
         """The site’s top-level topics, i.e. topics without a parent topic."""
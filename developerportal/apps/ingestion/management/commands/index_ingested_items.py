@@ -0,0 +1,20 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from ...models import IngestedItem, build_ingested_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Add the URLs of existing ExternalArticles and Videos to the index of "
+        "ingested items, so that they won't be ingested again. The index is "
+        "filled when migrating, so this is only needed to rebuild it."
+    )
+
+    def handle(self, *args, **options):
+        items = build_ingested_items(apps)
+        # Some may already be indexed, and are skipped by ignore_conflicts
+        existing_count = IngestedItem.objects.count()
+        IngestedItem.objects.bulk_create(items, batch_size=500, ignore_conflicts=True)
+        indexed_count = IngestedItem.objects.count() - existing_count
+        self.stdout.write(f"Found {len(items)} URLs, indexed {indexed_count} new ones")
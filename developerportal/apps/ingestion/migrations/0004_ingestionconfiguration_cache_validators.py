@@ -0,0 +1,28 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingestion', '0003_bootstrap_ingestion_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionconfiguration',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='ingestionconfiguration',
+            name='etag',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='ingestionconfiguration',
+            name='last_modified',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0041_group_collection_permissions_verbose_name_plural'),
+        ('ingestion', '0004_ingestionconfiguration_cache_validators'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestedItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('integration_type', models.CharField(choices=[('ExternalArticle', 'External Article/Blog post'), ('Video', 'Video post, to be embededed in portal')], max_length=24)),
+                ('url_hash', models.CharField(max_length=40)),
+                ('url', models.URLField(max_length=2048)),
+                ('page', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailcore.Page')),
+            ],
+            options={
+                'unique_together': {('integration_type', 'url_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingestion', '0005_ingesteditem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingestionconfiguration',
+            name='next_sync',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingestionconfiguration',
+            name='sync_interval',
+            field=models.DurationField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingestion', '0006_ingestionconfiguration_sync_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(db_index=True)),
+                ('completed', models.BooleanField(default=True, help_text="False if the feed wasn't fetched in time")),
+                ('fetch_duration', models.FloatField(blank=True, help_text='Seconds', null=True)),
+                ('bytes_fetched', models.PositiveIntegerField(default=0)),
+                ('entries_parsed', models.PositiveIntegerField(default=0)),
+                ('items_created', models.PositiveIntegerField(default=0)),
+                ('items_skipped', models.PositiveIntegerField(default=0, help_text='New items that were already ingested, or failed')),
+                ('image_download_duration', models.FloatField(blank=True, help_text='Seconds', null=True)),
+                ('transaction_duration', models.FloatField(blank=True, help_text='Seconds', null=True)),
+                ('config', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='ingestion.IngestionConfiguration')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingestion', '0007_ingestionrun'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingestionrun',
+            name='completed',
+            field=models.BooleanField(default=True, help_text="False if the feed failed, or wasn't fetched in time"),
+        ),
+    ]
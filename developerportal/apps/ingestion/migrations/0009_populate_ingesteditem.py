@@ -0,0 +1,31 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+"""Fill the IngestedItem index from the ExternalArticles and Videos that already
+exist, as the `index_ingested_items` management command does, so that their
+feed entries aren't ingested again"""
+
+from django.db import migrations
+
+from developerportal.apps.ingestion.models import build_ingested_items
+
+
+def forwards(apps, schema_editor):
+    IngestedItem = apps.get_model("ingestion", "IngestedItem")
+    IngestedItem.objects.bulk_create(
+        build_ingested_items(apps), batch_size=500, ignore_conflicts=True
+    )
+
+
+def backwards(apps, schema_editor):
+    apps.get_model("ingestion", "IngestedItem").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("externalcontent", "0033_externalcontentfolder"),
+        ("videos", "0014_index_video_date"),
+        ("ingestion", "0008_ingestionrun_completed_help_text"),
+    ]
+
+    operations = [migrations.RunPython(forwards, backwards)]
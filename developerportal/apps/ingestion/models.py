@@ -30,6 +30,20 @@ class IngestionConfiguration(models.Model):
         )
     )
 
+    # Cached from the last fetch of the feed, so that we can avoid downloading
+    # or parsing it again if it hasn't changed since
+    etag = models.CharField(max_length=255, blank=True, editable=False)
+    last_modified = models.CharField(max_length=64, blank=True, editable=False)
+    content_hash = models.CharField(max_length=40, blank=True, editable=False)
+
+    # How long to wait between syncs, learned from how often the feed has new
+    # items (see utils.schedule_next_sync), and when the next one is due. A
+    # source with no next_sync is due now.
+    sync_interval = models.DurationField(null=True, blank=True, editable=False)
+    next_sync = models.DateTimeField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+
     def __repr__(self):
         return "<IngestionConfiguration: {} (Synced to: {})>".format(
             self.source_name, self.last_sync.isoformat()
@@ -37,3 +51,89 @@ class IngestionConfiguration(models.Model):
 
     def __str__(self):
         return "IngestionConfiguration for {}".format(self.source_name)
+
+
+class IngestedItem(models.Model):
+    """Records the URL of each item ingested, as a hash of its normalised form
+    (see utils.normalise_url), so that items can be checked against it in bulk
+    and not ingested twice"""
+
+    integration_type = models.CharField(
+        choices=IngestionConfiguration.TARGET_CONTENT_TYPE_CHOICES, max_length=24
+    )
+    url_hash = models.CharField(max_length=40)
+    url = models.URLField(max_length=2048)
+    # Kept if the page is deleted, so that the item isn't ingested again
+    page = models.ForeignKey(
+        "wagtailcore.Page",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    class Meta:
+        unique_together = (("integration_type", "url_hash"),)
+
+    def __str__(self):
+        return self.url
+
+
+def build_ingested_items(apps):
+    """Return unsaved IngestedItems for the URLs of the existing ExternalArticles
+    and Videos, using the models in `apps`, which may be a migration's historical
+    models. Some may already be indexed."""
+    from .utils import get_url_hash
+
+    item_model = apps.get_model("ingestion", "IngestedItem")
+    urls = [
+        (IngestionConfiguration.CONTENT_TYPE_ARTICLE, article.external_url, article)
+        for article in apps.get_model("externalcontent", "ExternalArticle")
+        .objects.exclude(external_url="")
+        .only("external_url")
+    ] + [
+        (IngestionConfiguration.CONTENT_TYPE_VIDEO, block.value.url, video)
+        for video in apps.get_model("videos", "Video").objects.only("video_url")
+        for block in video.video_url
+        if block.value
+    ]
+    return [
+        item_model(
+            integration_type=integration_type,
+            url_hash=get_url_hash(url),
+            url=url,
+            page_id=page.pk,
+        )
+        for integration_type, url, page in urls
+    ]
+
+
+class IngestionRun(models.Model):
+    """Timings and counts from one sync of a source, so that slow or busy feeds
+    can be spotted: see the Ingestion runs in the Wagtail admin, and the
+    ingestion metrics view"""
+
+    config = models.ForeignKey(
+        IngestionConfiguration, on_delete=models.CASCADE, related_name="runs"
+    )
+    started_at = models.DateTimeField(db_index=True)
+    completed = models.BooleanField(
+        default=True, help_text="False if the feed failed, or wasn't fetched in time"
+    )
+    fetch_duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    bytes_fetched = models.PositiveIntegerField(default=0)
+    entries_parsed = models.PositiveIntegerField(default=0)
+    items_created = models.PositiveIntegerField(default=0)
+    items_skipped = models.PositiveIntegerField(
+        default=0, help_text="New items that were already ingested, or failed"
+    )
+    image_download_duration = models.FloatField(
+        null=True, blank=True, help_text="Seconds"
+    )
+    transaction_duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return "{} at {}".format(self.config.source_name, self.started_at.isoformat())
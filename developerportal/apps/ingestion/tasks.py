@@ -5,7 +5,7 @@ from django.conf import settings
 
 from .celery import app
 from .models import IngestionConfiguration
-from .utils import ingest_content
+from .utils import ingest_content, send_drafts_digest
 
 logging.basicConfig(level=os.environ.get("LOGLEVEL", logging.INFO))
 logger = logging.getLogger(__name__)
@@ -31,3 +31,12 @@ def ingest_articles():
             "Skipping automatic article ingestion "
             "because settings.AUTOMATICALLY_INGEST_CONTENT is False"
         )
+
+
+# The lowest priority there is with Redis, where 0 is the highest
+@app.task(priority=9)
+def send_ingestion_digest(revision_ids, excluded_user_id):
+    """Email moderators a digest of the drafts created by an ingestion run.
+
+    Queued by ingest_content, so that ingestion doesn't wait for the emails."""
+    send_drafts_digest(revision_ids, excluded_user_id)
@@ -3,7 +3,7 @@ from unittest import mock
 from django.test import TestCase, override_settings
 
 from ..models import IngestionConfiguration
-from ..tasks import ingest_articles, ingest_videos
+from ..tasks import ingest_articles, ingest_videos, send_ingestion_digest
 
 
 @override_settings(AUTOMATICALLY_INGEST_CONTENT=True)
@@ -33,3 +33,8 @@ class TaskTests(TestCase):
     def test_ingest_videos__disabled_via_settings(self, mock_ingest_content):
         ingest_videos()
         assert not mock_ingest_content.called
+
+    @mock.patch("developerportal.apps.ingestion.tasks.send_drafts_digest")
+    def test_send_ingestion_digest(self, mock_send_drafts_digest):
+        send_ingestion_digest([1, 2, 3], 4)
+        mock_send_drafts_digest.assert_called_once_with([1, 2, 3], 4)
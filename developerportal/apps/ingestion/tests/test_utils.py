@@ -1,39 +1,64 @@
 import datetime
+import hashlib
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import wait
+from io import BytesIO, StringIO
 from unittest import mock
+from urllib.error import HTTPError
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase, override_settings
 
+import feedparser
 import pytz
+import requests
 from dateutil.tz import tzlocal
+from wagtail.core.models import Page, PageRevision
+from wagtail.embeds.blocks import EmbedValue
+from wagtail.users.models import UserProfile
 
 from developerportal.apps.ingestion.utils import (
     _get_item_authors,
     _get_item_description,
     _get_item_title,
     _get_slug,
+    fetch_all_external_data,
     fetch_external_data,
     ingest_content,
 )
 
 from ...articles.models import Article
+from ...common.utils import add_children
 from ...externalcontent.models import (
     ExternalArticle,
     ExternalContent,
+    ExternalContentFolder,
     ExternalEvent,
     ExternalVideo,
 )
 from ...mozimages.models import MozImage
 from ...videos.models import Video
 from ..constants import INGESTION_USER_USERNAME
-from ..models import IngestionConfiguration
+from ..models import IngestedItem, IngestionConfiguration, IngestionRun
 from ..utils import (
+    _exclude_ingested_items,
     _get_factory_func,
     _make_external_article_page,
     _make_video_page,
+    _read_new_entries,
     _store_external_image,
+    _store_external_images,
     generate_draft_from_external_data,
+    generate_drafts_from_external_data,
+    get_url_hash,
+    normalise_url,
+    schedule_next_sync,
+    send_drafts_digest,
 )
 from .data.test_images_as_bytearrays import image_one as image_one_bytearray
 
@@ -143,17 +168,300 @@ class UtilsTestCaseWithoutFixtures(TestCase):
 
         self.assertEqual(bad_data, [])
 
+    @override_settings(INGESTION_FETCH_TIMEOUT=5)
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_fetch_external_data__timeout(self, mock_urlopen):
+        mock_urlopen.side_effect = TimeoutError("timed out")
+
+        with self.assertLogs("developerportal.apps.ingestion.utils") as cm:
+            data = fetch_external_data(
+                feed_url="https://example.com/slow.xml",
+                last_synced=datetime.datetime(2019, 1, 1, tzinfo=pytz.UTC),
+            )
+
+        self.assertEqual(data, [])
+        self.assertEqual(
+            mock_urlopen.call_args[0][0].full_url, "https://example.com/slow.xml"
+        )
+        self.assertEqual(mock_urlopen.call_args[1], {"timeout": 5})
+        self.assertEqual(
+            cm.output,
+            [
+                "WARNING:developerportal.apps.ingestion.utils:Problem fetching "
+                "feed from https://example.com/slow.xml: timed out"
+            ],
+        )
+
+    def _mock_feed_response(self, mock_urlopen, content, headers=None):
+        response = mock_urlopen.return_value.__enter__.return_value
+        stream = BytesIO(content)
+        response.read.side_effect = stream.read
+        response.headers = headers or {}
+        return stream
+
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_fetch_external_data__conditional_get(self, mock_urlopen):
+        with open(self.BLOG_RSS_FEED_URL.replace("file://", ""), "rb") as feed:
+            self._mock_feed_response(
+                mock_urlopen,
+                feed.read(),
+                {"ETag": '"abc123"', "Last-Modified": "Wed, 11 Dec 2019 10:00:00 GMT"},
+            )
+        config = IngestionConfiguration(
+            etag='"old"', last_modified="Tue, 10 Dec 2019 10:00:00 GMT"
+        )
+
+        data = fetch_external_data(
+            feed_url="https://example.com/feed.xml",
+            last_synced=datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC),
+            config=config,
+        )
+
+        self.assertEqual(len(data), 6)
+        request = mock_urlopen.call_args[0][0]
+        self.assertEqual(request.get_header("User-agent"), feedparser.USER_AGENT)
+        self.assertEqual(request.get_header("If-none-match"), '"old"')
+        self.assertEqual(
+            request.get_header("If-modified-since"), "Tue, 10 Dec 2019 10:00:00 GMT"
+        )
+        self.assertEqual(config.etag, '"abc123"')
+        self.assertEqual(config.last_modified, "Wed, 11 Dec 2019 10:00:00 GMT")
+        self.assertEqual(len(config.content_hash), 40)
+
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_fetch_external_data__over_long_validators(self, mock_urlopen):
+        with open(self.BLOG_RSS_FEED_URL.replace("file://", ""), "rb") as feed:
+            self._mock_feed_response(
+                mock_urlopen,
+                feed.read(),
+                {"ETag": '"{}"'.format("a" * 300), "Last-Modified": "x" * 100},
+            )
+        config = IngestionConfiguration.objects.create(
+            source_name="One",
+            source_url="https://example.com/feed.xml",
+            integration_type=IngestionConfiguration.CONTENT_TYPE_ARTICLE,
+            last_sync=datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC),
+            etag='"old"',
+        )
+
+        data = fetch_external_data(
+            feed_url=config.source_url, last_synced=config.last_sync, config=config
+        )
+
+        # They're dropped rather than failing to save
+        self.assertEqual(len(data), 6)
+        self.assertEqual(config.etag, "")
+        self.assertEqual(config.last_modified, "")
+        config.save()
+
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_fetch_external_data__stops_reading_at_first_old_entry(self, mock_urlopen):
+        for feed_url in (self.BLOG_RSS_FEED_URL, self.YOUTUBE_FEED_URL):
+            with self.subTest(feed_url=feed_url):
+                with open(feed_url.replace("file://", ""), "rb") as feed:
+                    content = feed.read()
+                stream = self._mock_feed_response(mock_urlopen, content)
+
+                data = fetch_external_data(
+                    feed_url="https://example.com/feed.xml",
+                    last_synced=datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC),
+                )
+
+                self.assertEqual(len(data), 6)
+                self.assertLess(stream.tell(), len(content))
+
+    @override_settings(INGESTION_INCREMENTAL_FEED_PARSING=False)
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_fetch_external_data__incremental_parsing_off(self, mock_urlopen):
+        with open(self.BLOG_RSS_FEED_URL.replace("file://", ""), "rb") as feed:
+            content = feed.read()
+        stream = self._mock_feed_response(mock_urlopen, content)
+
+        data = fetch_external_data(
+            feed_url="https://example.com/feed.xml",
+            last_synced=datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC),
+        )
+
+        self.assertEqual(len(data), 6)
+        self.assertEqual(stream.tell(), len(content))
+
+    def test__read_new_entries__malformed_feed(self):
+        content = (
+            b"<rss><channel><item><pubDate>Wed, 11 Dec 2019 10:00:00 GMT</pubDate>"
+            b"</item><item>&nbsp;</item></channel></rss>"
+        )
+        self.assertEqual(
+            _read_new_entries(
+                BytesIO(content), datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC)
+            ),
+            (content, None),
+        )
+
+    def test__read_new_entries__no_old_entries(self):
+        content = (
+            b"<rss><channel><item><pubDate>Wed, 11 Dec 2019 10:00:00 GMT</pubDate>"
+            b"</item><item><pubDate>not a date</pubDate></item></channel></rss>"
+        )
+        self.assertEqual(
+            _read_new_entries(
+                BytesIO(content), datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC)
+            ),
+            (content, None),
+        )
+
+    @mock.patch("developerportal.apps.ingestion.utils.feedparser.parse")
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_fetch_external_data__not_modified(self, mock_urlopen, mock_parse):
+        mock_urlopen.side_effect = HTTPError(
+            "https://example.com/feed.xml", 304, "Not Modified", {}, None
+        )
+        config = IngestionConfiguration(etag='"abc123"')
+
+        data = fetch_external_data(
+            feed_url="https://example.com/feed.xml",
+            last_synced=datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC),
+            config=config,
+        )
+
+        self.assertEqual(data, [])
+        assert not mock_parse.called
+        self.assertEqual(config.etag, '"abc123"')
+
+    @mock.patch("developerportal.apps.ingestion.utils.feedparser.parse")
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_fetch_external_data__identical_content(self, mock_urlopen, mock_parse):
+        self._mock_feed_response(mock_urlopen, b"<rss></rss>")
+        config = IngestionConfiguration(
+            content_hash=hashlib.sha1(b"<rss></rss>").hexdigest()
+        )
+
+        data = fetch_external_data(
+            feed_url="https://example.com/feed.xml",
+            last_synced=datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC),
+            config=config,
+        )
+
+        self.assertEqual(data, [])
+        assert not mock_parse.called
+
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_external_data")
+    def test_fetch_all_external_data(self, mock_fetch_external_data):
+        mock_fetch_external_data.side_effect = lambda feed_url, **kwargs: [feed_url]
+        last_sync = datetime.datetime(2019, 1, 1, tzinfo=pytz.UTC)
+        configs = [
+            IngestionConfiguration(
+                pk=1, source_url="https://example.com/one.xml", last_sync=last_sync
+            ),
+            IngestionConfiguration(
+                pk=2, source_url="https://example.com/two.xml", last_sync=last_sync
+            ),
+        ]
+
+        self.assertEqual(
+            fetch_all_external_data(configs),
+            {1: ["https://example.com/one.xml"], 2: ["https://example.com/two.xml"]},
+        )
+
+    @override_settings(INGESTION_FETCH_DEADLINE=0.1)
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_external_data")
+    def test_fetch_all_external_data__deadline(self, mock_fetch_external_data):
+        slow_feed_released = threading.Event()
+
+        def fake_fetch_external_data(feed_url, **kwargs):
+            if feed_url == "https://example.com/slow.xml":
+                slow_feed_released.wait(5)
+            return [feed_url]
+
+        mock_fetch_external_data.side_effect = fake_fetch_external_data
+        last_sync = datetime.datetime(2019, 1, 1, tzinfo=pytz.UTC)
+        configs = [
+            IngestionConfiguration(
+                pk=1, source_url="https://example.com/slow.xml", last_sync=last_sync
+            ),
+            IngestionConfiguration(
+                pk=2, source_url="https://example.com/fast.xml", last_sync=last_sync
+            ),
+        ]
+
+        try:
+            with self.assertLogs("developerportal.apps.ingestion.utils") as cm:
+                data = fetch_all_external_data(configs)
+        finally:
+            slow_feed_released.set()
+
+        self.assertEqual(data, {2: ["https://example.com/fast.xml"]})
+        self.assertEqual(
+            cm.output,
+            [
+                "WARNING:developerportal.apps.ingestion.utils:Gave up waiting "
+                "for feed from https://example.com/slow.xml"
+            ],
+        )
+
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_external_data")
+    def test_fetch_all_external_data__unexpected_error(self, mock_fetch_external_data):
+        def fake_fetch_external_data(feed_url, **kwargs):
+            if feed_url == "https://example.com/broken.xml":
+                raise ValueError("Unparseable")
+            return [feed_url]
+
+        mock_fetch_external_data.side_effect = fake_fetch_external_data
+        last_sync = datetime.datetime(2019, 1, 1, tzinfo=pytz.UTC)
+        configs = [
+            IngestionConfiguration(
+                pk=1, source_url="https://example.com/broken.xml", last_sync=last_sync
+            ),
+            IngestionConfiguration(
+                pk=2, source_url="https://example.com/fine.xml", last_sync=last_sync
+            ),
+        ]
+
+        with self.assertLogs("developerportal.apps.ingestion.utils") as cm:
+            data = fetch_all_external_data(configs)
+
+        self.assertEqual(data, {2: ["https://example.com/fine.xml"]})
+        self.assertEqual(len(cm.output), 1)
+        self.assertIn(
+            "ERROR:developerportal.apps.ingestion.utils:Problem fetching feed "
+            "from https://example.com/broken.xml",
+            cm.output[0],
+        )
+
+    @mock.patch("developerportal.apps.ingestion.utils.as_completed")
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_external_data")
+    def test_fetch_all_external_data__finished_after_deadline(
+        self, mock_fetch_external_data, mock_as_completed
+    ):
+        mock_fetch_external_data.side_effect = lambda feed_url, **kwargs: [feed_url]
+
+        def fake_as_completed(futures, timeout):
+            # The feed is fetched just as the deadline passes
+            wait(futures)
+            raise FuturesTimeoutError()
+            yield
+
+        mock_as_completed.side_effect = fake_as_completed
+        config = IngestionConfiguration(
+            pk=1,
+            source_url="https://example.com/one.xml",
+            last_sync=datetime.datetime(2019, 1, 1, tzinfo=pytz.UTC),
+        )
+
+        self.assertEqual(
+            fetch_all_external_data([config]), {1: ["https://example.com/one.xml"]}
+        )
+
 
 @override_settings(AUTOMATICALLY_INGEST_CONTENT=True)
 class UtilsTestCaseWithFixtures(TestCase):
 
     fixtures = ["common.json"]
 
-    @mock.patch("developerportal.apps.ingestion.utils.send_notification")
+    @mock.patch("developerportal.apps.ingestion.tasks.send_ingestion_digest")
     @mock.patch("developerportal.apps.ingestion.utils.fetch_external_data")
     @mock.patch("developerportal.apps.ingestion.utils.tz_now")
     def test_ingest_content(
-        self, mock_tz_now, mock_fetch_external_data, mock_send_notification
+        self, mock_tz_now, mock_fetch_external_data, mock_send_ingestion_digest
     ):
 
         _now = datetime.datetime(12, 12, 13, 12, 34, 56, tzinfo=pytz.UTC)
@@ -241,7 +549,15 @@ class UtilsTestCaseWithFixtures(TestCase):
         # Show the owner has been set
         assert Video.objects.filter(owner=ingestion_dummy_user).count() == 3
 
-        assert mock_send_notification.call_count == 3
+        # Moderators are sent one digest of the new drafts, separately
+        mock_send_ingestion_digest.delay.assert_called_once_with(
+            list(
+                PageRevision.objects.filter(page__in=Video.objects.all())
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+            ingestion_dummy_user.id,
+        )
 
         article_return_value = video_return_value + [
             dict(
@@ -257,7 +573,7 @@ class UtilsTestCaseWithFixtures(TestCase):
         for x in article_return_value:
             x["title"] += " for Post"
 
-        mock_send_notification.reset_mock()
+        mock_send_ingestion_digest.reset_mock()
         mock_fetch_external_data.reset_mock()
         mock_fetch_external_data.return_value = article_return_value
 
@@ -300,14 +616,21 @@ class UtilsTestCaseWithFixtures(TestCase):
 
         assert IngestionConfiguration.objects.filter(last_sync=_now).count() == 2
 
-        assert mock_send_notification.call_count == 4
+        mock_send_ingestion_digest.delay.assert_called_once_with(
+            list(
+                PageRevision.objects.filter(page__in=ExternalArticle.objects.all())
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+            ingestion_dummy_user.id,
+        )
 
     @override_settings(NOTIFY_AFTER_INGESTING_CONTENT=False)
-    @mock.patch("developerportal.apps.ingestion.utils.send_notification")
+    @mock.patch("developerportal.apps.ingestion.tasks.send_ingestion_digest")
     @mock.patch("developerportal.apps.ingestion.utils.fetch_external_data")
     @mock.patch("developerportal.apps.ingestion.utils.tz_now")
     def test_ingest_content__no_notifications_option_set(
-        self, mock_tz_now, mock_fetch_external_data, mock_send_notification
+        self, mock_tz_now, mock_fetch_external_data, mock_send_ingestion_digest
     ):
 
         _now = datetime.datetime(12, 12, 13, 12, 34, 56, tzinfo=pytz.UTC)
@@ -342,16 +665,15 @@ class UtilsTestCaseWithFixtures(TestCase):
         assert Video.objects.count() == 0
         ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
         assert Video.objects.count() == 1
-        assert not mock_send_notification.called  # This is what we care about here
+        # This is what we care about here
+        assert not mock_send_ingestion_digest.delay.called
 
     @mock.patch("developerportal.apps.ingestion.utils.fetch_external_data")
-    @mock.patch("developerportal.apps.ingestion.utils.send_notification")
+    @mock.patch("developerportal.apps.ingestion.tasks.send_ingestion_digest")
     def test_ingest_content__unhappy_path(
-        self, mock_send_notification, mock_fetch_external_data
+        self, mock_send_ingestion_digest, mock_fetch_external_data
     ):
 
-        mock_send_notification.return_value = False
-
         IngestionConfiguration.objects.all().delete()
 
         IngestionConfiguration.objects.create(
@@ -383,7 +705,7 @@ class UtilsTestCaseWithFixtures(TestCase):
             ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
         assert Video.objects.count() == 1
 
-        draft_page = Video.objects.filter(live=False).get()
+        assert Video.objects.filter(live=False).count() == 1
 
         self.assertEqual(
             cm.output,
@@ -397,14 +719,280 @@ class UtilsTestCaseWithFixtures(TestCase):
                     "'description': '<p>Test description</p>', "
                     "'timestamp': datetime.datetime(2020, 1, 10, 22, 47, 43, "
                     "tzinfo=<UTC>), 'owner': <User: ingestion_user>}"
-                ),
-                (
-                    "WARNING:developerportal.apps.ingestion.utils:"
-                    f"Failed to send notification that {draft_page} was created."
-                ),
+                )
             ],
         )
 
+    @mock.patch("developerportal.apps.ingestion.tasks.send_ingestion_digest")
+    @mock.patch("developerportal.apps.ingestion.utils._store_external_images")
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_all_external_data")
+    def test_ingest_content__images_stored_before_transaction(
+        self,
+        mock_fetch_all_external_data,
+        mock_store_external_images,
+        mock_send_ingestion_digest,
+    ):
+        IngestionConfiguration.objects.all().delete()
+        config = IngestionConfiguration.objects.create(
+            source_name="One",
+            source_url="https://example.com/one.xml",
+            integration_type=IngestionConfiguration.CONTENT_TYPE_VIDEO,
+            last_sync=datetime.datetime(12, 12, 12, tzinfo=pytz.UTC),
+        )
+        mock_fetch_all_external_data.return_value = {
+            config.pk: [
+                dict(
+                    title="Test one",
+                    authors=["Fernando McTest"],
+                    url="https://example.com/thing/one/",
+                    description="<p>Test description</p>",
+                    image_url="https://example.com/one.png",
+                    timestamp=datetime.datetime(
+                        2020, 1, 10, 22, 47, 43, tzinfo=pytz.UTC
+                    ),
+                )
+            ]
+        }
+        image = MozImage.objects.create(width=1, height=1)
+        atomic_depths = []
+
+        def fake_store_external_images(image_urls):
+            atomic_depths.append(len(connection.atomic_blocks))
+            return {image_url: image for image_url in image_urls}
+
+        mock_store_external_images.side_effect = fake_store_external_images
+
+        # The test itself runs inside a transaction, so compare against that
+        test_atomic_depth = len(connection.atomic_blocks)
+        ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
+
+        self.assertEqual(atomic_depths, [test_atomic_depth])
+        self.assertEqual(Video.objects.get().card_image, image)
+
+    @mock.patch("developerportal.apps.ingestion.tasks.send_ingestion_digest")
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_all_external_data")
+    def test_ingest_content__skips_ingested_urls(
+        self, mock_fetch_all_external_data, mock_send_ingestion_digest
+    ):
+        IngestionConfiguration.objects.all().delete()
+        config = IngestionConfiguration.objects.create(
+            source_name="One",
+            source_url="https://example.com/one.xml",
+            integration_type=IngestionConfiguration.CONTENT_TYPE_VIDEO,
+            last_sync=datetime.datetime(12, 12, 12, tzinfo=pytz.UTC),
+        )
+
+        def _data(title, url):
+            return dict(
+                title=title,
+                authors=[],
+                url=url,
+                description="<p>Test description</p>",
+                timestamp=datetime.datetime(2020, 1, 10, tzinfo=pytz.UTC),
+            )
+
+        mock_fetch_all_external_data.return_value = {
+            config.pk: [
+                _data("Test one", "https://www.youtube.com/watch?v=one"),
+                _data("Test one again", "http://www.YouTube.com/watch?v=one#t=1"),
+            ]
+        }
+        ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
+
+        mock_fetch_all_external_data.return_value = {
+            config.pk: [
+                _data("Test one, retitled", "https://www.youtube.com/watch?v=one"),
+                _data("Test two", "https://www.youtube.com/watch?v=two"),
+            ]
+        }
+        with self.assertNumQueries(1):
+            new_items = _exclude_ingested_items(
+                IngestionConfiguration.CONTENT_TYPE_VIDEO,
+                mock_fetch_all_external_data.return_value[config.pk],
+            )
+        self.assertEqual([data["title"] for data in new_items], ["Test two"])
+
+        ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
+
+        self.assertEqual(
+            sorted(Video.objects.values_list("title", flat=True)),
+            ["Test one", "Test two"],
+        )
+        ingested_item = IngestedItem.objects.get(page__title="Test two")
+        self.assertEqual(ingested_item.url, "https://www.youtube.com/watch?v=two")
+
+    def test_index_ingested_items_command(self):
+        video_page = Page.objects.get(slug="videos")
+        video = video_page.add_child(
+            instance=Video(
+                title="Existing video",
+                slug="existing-video",
+                video_url=[
+                    ("embed", EmbedValue("https://www.youtube.com/watch?v=abc"))
+                ],
+            )
+        )
+        out = StringIO()
+
+        call_command("index_ingested_items", stdout=out)
+
+        self.assertEqual(out.getvalue(), "Found 1 URLs, indexed 1 new ones\n")
+        self.assertEqual(
+            _exclude_ingested_items(
+                IngestionConfiguration.CONTENT_TYPE_VIDEO,
+                [{"url": "http://www.youtube.com/watch?v=abc"}],
+            ),
+            [],
+        )
+        self.assertEqual(IngestedItem.objects.get().page.pk, video.pk)
+
+        # Running it again finds nothing new
+        out = StringIO()
+        call_command("index_ingested_items", stdout=out)
+        self.assertEqual(out.getvalue(), "Found 1 URLs, indexed 0 new ones\n")
+
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_all_external_data")
+    def test_ingest_content__feed_not_fetched(self, mock_fetch_all_external_data):
+        mock_fetch_all_external_data.return_value = {}
+        last_sync = datetime.datetime(12, 12, 12, tzinfo=pytz.UTC)
+
+        IngestionConfiguration.objects.all().delete()
+        config = IngestionConfiguration.objects.create(
+            source_name="One",
+            source_url="https://example.com/one.xml",
+            integration_type=IngestionConfiguration.CONTENT_TYPE_VIDEO,
+            last_sync=last_sync,
+        )
+
+        ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
+
+        # The feed will be tried again from the same point next time
+        config.refresh_from_db()
+        self.assertEqual(config.last_sync, last_sync)
+        assert Video.objects.count() == 0
+        self.assertFalse(config.runs.get().completed)
+
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    def test_ingest_content__feed_failed(self, mock_urlopen):
+        mock_urlopen.side_effect = OSError("Connection refused")
+        last_sync = datetime.datetime(12, 12, 12, tzinfo=pytz.UTC)
+
+        IngestionConfiguration.objects.all().delete()
+        config = IngestionConfiguration.objects.create(
+            source_name="One",
+            source_url="https://example.com/one.xml",
+            integration_type=IngestionConfiguration.CONTENT_TYPE_VIDEO,
+            last_sync=last_sync,
+        )
+
+        with self.assertLogs("developerportal.apps.ingestion.utils", "WARNING"):
+            ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
+
+        # Unlike a feed with nothing new, it's tried again from the same point
+        config.refresh_from_db()
+        self.assertEqual(config.last_sync, last_sync)
+        self.assertIsNone(config.sync_interval)
+        run = config.runs.get()
+        self.assertFalse(run.completed)
+        self.assertIsNotNone(run.fetch_duration)
+
+    @mock.patch("developerportal.apps.ingestion.tasks.send_ingestion_digest")
+    @mock.patch("developerportal.apps.ingestion.utils._store_external_images")
+    @mock.patch("developerportal.apps.ingestion.utils.urlopen")
+    @mock.patch("developerportal.apps.ingestion.utils.tz_now")
+    def test_ingest_content__records_runs(
+        self,
+        mock_tz_now,
+        mock_urlopen,
+        mock_store_external_images,
+        mock_send_ingestion_digest,
+    ):
+        _now = datetime.datetime(2020, 1, 10, 12, tzinfo=pytz.UTC)
+        mock_tz_now.return_value = _now
+        mock_store_external_images.return_value = {}
+        with open(
+            UtilsTestCaseWithoutFixtures.BLOG_RSS_FEED_URL.replace("file://", ""), "rb"
+        ) as feed:
+            content = feed.read()
+        response = mock_urlopen.return_value.__enter__.return_value
+        response.read.side_effect = BytesIO(content).read
+        response.headers = {}
+
+        IngestionConfiguration.objects.all().delete()
+        config = IngestionConfiguration.objects.create(
+            source_name="One",
+            source_url="https://example.com/one.xml",
+            integration_type=IngestionConfiguration.CONTENT_TYPE_ARTICLE,
+            last_sync=datetime.datetime(2019, 12, 1, tzinfo=pytz.UTC),
+        )
+        old_run = IngestionRun.objects.create(
+            config=config, started_at=_now - datetime.timedelta(days=31)
+        )
+
+        ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_ARTICLE)
+
+        # Runs older than settings.INGESTION_RUN_RETENTION_DAYS are dropped
+        self.assertFalse(IngestionRun.objects.filter(pk=old_run.pk).exists())
+        run = config.runs.get()
+        self.assertEqual(run.started_at, _now)
+        self.assertTrue(run.completed)
+        self.assertGreater(run.bytes_fetched, 0)
+        self.assertEqual(run.entries_parsed, 6)
+        self.assertEqual(run.items_created, 6)
+        self.assertEqual(run.items_skipped, 0)
+        self.assertIsNotNone(run.fetch_duration)
+        self.assertIsNotNone(run.image_download_duration)
+        self.assertIsNotNone(run.transaction_duration)
+
+    @override_settings(INGESTION_MIN_SYNC_INTERVAL=60)
+    @mock.patch("developerportal.apps.ingestion.utils.tz_now")
+    @mock.patch("developerportal.apps.ingestion.utils.fetch_all_external_data")
+    def test_ingest_content__only_syncs_due_sources(
+        self, mock_fetch_all_external_data, mock_tz_now
+    ):
+        _now = datetime.datetime(2020, 1, 10, 12, tzinfo=pytz.UTC)
+        mock_tz_now.return_value = _now
+        last_sync = datetime.datetime(12, 12, 12, tzinfo=pytz.UTC)
+
+        IngestionConfiguration.objects.all().delete()
+
+        def _config(source_name, **kwargs):
+            return IngestionConfiguration.objects.create(
+                source_name=source_name,
+                source_url=f"https://example.com/{source_name}.xml",
+                integration_type=IngestionConfiguration.CONTENT_TYPE_VIDEO,
+                last_sync=last_sync,
+                **kwargs,
+            )
+
+        never_synced = _config("never-synced")
+        due = _config(
+            "due",
+            sync_interval=datetime.timedelta(minutes=4),
+            next_sync=_now - datetime.timedelta(minutes=1),
+        )
+        not_due = _config(
+            "not-due",
+            sync_interval=datetime.timedelta(minutes=4),
+            next_sync=_now + datetime.timedelta(minutes=1),
+        )
+        mock_fetch_all_external_data.return_value = {never_synced.pk: [], due.pk: []}
+
+        ingest_content(type_=IngestionConfiguration.CONTENT_TYPE_VIDEO)
+
+        [configs] = mock_fetch_all_external_data.call_args[0]
+        self.assertEqual({config.pk for config in configs}, {never_synced.pk, due.pk})
+        # Neither had anything new, so will wait twice as long next time
+        never_synced.refresh_from_db()
+        self.assertEqual(never_synced.sync_interval, datetime.timedelta(minutes=2))
+        self.assertEqual(never_synced.next_sync, _now + datetime.timedelta(minutes=2))
+        due.refresh_from_db()
+        self.assertEqual(due.sync_interval, datetime.timedelta(minutes=8))
+        self.assertEqual(due.next_sync, _now + datetime.timedelta(minutes=8))
+        not_due.refresh_from_db()
+        self.assertEqual(not_due.last_sync, last_sync)
+        self.assertEqual(not_due.next_sync, _now + datetime.timedelta(minutes=1))
+
     def test__get_factory_func(self):
 
         self.assertEqual(_get_factory_func("Video"), _make_video_page)
@@ -421,8 +1009,14 @@ class UtilsTestCaseWithFixtures(TestCase):
                 with self.assertRaises(NotImplementedError):
                     _get_factory_func(model_name=klass.__name__)
 
-    @mock.patch("developerportal.apps.ingestion.utils.requests.get")
-    def test__store_external_image__local_filesystem(self, mock_requests_get):
+    def _mock_image_response(self, mock_get, chunks, headers=None):
+        mock_response = mock_get.return_value
+        mock_response.headers = headers or {}
+        mock_response.iter_content.return_value = chunks
+        return mock_response
+
+    @mock.patch("developerportal.apps.ingestion.utils._http_session.get")
+    def test__store_external_image__local_filesystem(self, mock_get):
         # This test is written assuming local file storage, even though
         # everything apart from CI will be using S3 as its backend. The function
         # HAS been tested with S3, though.
@@ -430,19 +1024,100 @@ class UtilsTestCaseWithFixtures(TestCase):
             settings.DEFAULT_FILE_STORAGE
             == "django.core.files.storage.FileSystemStorage"
         )
-        mock_response = mock.Mock()
-        mock_response.content = image_one_bytearray
-        mock_requests_get.return_value = mock_response
+        mock_response = self._mock_image_response(
+            mock_get, [bytes(image_one_bytearray)]
+        )
 
         saved_image = _store_external_image(image_url="https://example.com/test.png")
 
-        mock_requests_get.assert_called_once_with("https://example.com/test.png")
+        mock_get.assert_called_once_with(
+            "https://example.com/test.png",
+            stream=True,
+            timeout=settings.INGESTION_FETCH_TIMEOUT,
+        )
+        assert mock_response.close.called
 
         saved_image.file.open()
         saved_image.file.seek(0)
         comparison_content = saved_image.file.read()
         self.assertEqual(bytearray(comparison_content), image_one_bytearray)
 
+    @mock.patch("developerportal.apps.ingestion.utils._http_session.get")
+    def test__store_external_image__reuses_image_with_same_content(self, mock_get):
+        self._mock_image_response(mock_get, [bytes(image_one_bytearray)])
+
+        first_image = _store_external_image(image_url="https://example.com/one.png")
+        second_image = _store_external_image(image_url="https://example.com/two.png")
+
+        self.assertEqual(second_image, first_image)
+        self.assertEqual(MozImage.objects.count(), 1)
+
+    @override_settings(INGESTION_MAX_IMAGE_SIZE=10)
+    @mock.patch("developerportal.apps.ingestion.utils._http_session.get")
+    def test__store_external_image__too_large(self, mock_get):
+        for headers, chunks in (
+            # Known to be too large up front
+            ({"content-length": "11"}, [b"x" * 11]),
+            # Only found to be too large while downloading
+            ({}, [b"x" * 6, b"x" * 6]),
+        ):
+            with self.subTest(headers=headers):
+                mock_response = self._mock_image_response(mock_get, chunks, headers)
+
+                with self.assertLogs("developerportal.apps.ingestion.utils") as cm:
+                    image = _store_external_image(
+                        image_url="https://example.com/huge.png"
+                    )
+
+                self.assertIsNone(image)
+                self.assertEqual(
+                    cm.output,
+                    [
+                        "WARNING:developerportal.apps.ingestion.utils:Problem "
+                        "downloading image from https://example.com/huge.png: "
+                        "Image is too large"
+                    ],
+                )
+                assert mock_response.close.called
+        self.assertEqual(MozImage.objects.count(), 0)
+
+    @mock.patch("developerportal.apps.ingestion.utils._http_session.get")
+    def test__store_external_images(self, mock_get):
+        def fake_get(image_url, **kwargs):
+            response = mock.Mock(headers={})
+            response.iter_content.return_value = [bytes(image_one_bytearray)]
+            if image_url == "https://example.com/missing.png":
+                response.raise_for_status.side_effect = requests.HTTPError("404")
+            return response
+
+        mock_get.side_effect = fake_get
+
+        with self.assertLogs("developerportal.apps.ingestion.utils", "WARNING"):
+            images = _store_external_images(
+                [
+                    "https://example.com/one.png",
+                    "https://example.com/missing.png",
+                    "https://example.com/one.png",
+                    "https://example.com/two.png",
+                ]
+            )
+
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(
+            set(images),
+            {
+                "https://example.com/one.png",
+                "https://example.com/missing.png",
+                "https://example.com/two.png",
+            },
+        )
+        self.assertIsNone(images["https://example.com/missing.png"])
+        # Both URLs have the same content, so share one image
+        self.assertEqual(
+            images["https://example.com/one.png"], images["https://example.com/two.png"]
+        )
+        self.assertEqual(MozImage.objects.count(), 1)
+
     @mock.patch("developerportal.apps.ingestion.utils._store_external_image")
     def test_generate_draft_from_external_data__externalarticle(
         self, mock_store_external_image
@@ -475,7 +1150,12 @@ class UtilsTestCaseWithFixtures(TestCase):
         self.assertEqual(obj.card_image, image)
         self.assertFalse(obj.live)
         self.assertTrue(obj.has_unpublished_changes)
-        self.assertTrue(obj.get_parent().slug == "root")
+        # ExternalArticles are kept in a folder per month, within one per year
+        parent = obj.get_parent()
+        self.assertEqual(parent.specific_class, ExternalContentFolder)
+        self.assertEqual(parent.slug, "2019-12")
+        self.assertEqual(parent.get_parent().slug, "external-2019")
+        self.assertEqual(parent.get_parent().get_parent().slug, "root")
 
     @mock.patch("developerportal.apps.ingestion.utils._store_external_image")
     def test_generate_draft_from_external_data__video(self, mock_store_external_image):
@@ -508,6 +1188,198 @@ class UtilsTestCaseWithFixtures(TestCase):
         self.assertTrue(obj.has_unpublished_changes)
         self.assertTrue(obj.get_parent().slug == "videos")
 
+    def test_generate_drafts_from_external_data(self):
+        ingestion_user = User.objects.get(username=INGESTION_USER_USERNAME)
+        image = MozImage.objects.create(width=1, height=1)
+        items = [
+            (
+                dict(
+                    title=f"Test {number}",
+                    url=f"https://www.youtube.com/watch?v={number}",
+                    description="<p>Test description</p>",
+                    timestamp=datetime.datetime(2020, 1, 10, tzinfo=pytz.UTC),
+                ),
+                image if number == "one" else None,
+            )
+            for number in ("one", "two")
+        ]
+        # Reusing the same data gives a clashing slug
+        items.append(items[0])
+
+        with self.assertLogs("developerportal.apps.ingestion.utils") as cm:
+            revisions = generate_drafts_from_external_data(
+                factory_func=_make_video_page, items=items, owner=ingestion_user
+            )
+
+        self.assertEqual(
+            [revision.page.title for revision in revisions], ["Test one", "Test two"]
+        )
+        self.assertIn("WARNING", cm.output[-1])
+        self.assertEqual(Video.objects.count(), 2)
+        for revision in PageRevision.objects.filter(
+            page__in=[revision.page for revision in revisions]
+        ):
+            self.assertTrue(revision.submitted_for_moderation)
+            self.assertEqual(revision.user, ingestion_user)
+            video = revision.as_page_object()
+            self.assertEqual(video.get_parent().slug, "videos")
+            self.assertEqual(video.owner, ingestion_user)
+            self.assertEqual(video.latest_revision_created_at, revision.created_at)
+            self.assertFalse(video.live)
+        self.assertEqual(Video.objects.get(title="Test one").card_image, image)
+
+    def test_generate_drafts_from_external_data__videos_share_a_parent(self):
+        ingestion_user = User.objects.get(username=INGESTION_USER_USERNAME)
+        items = [
+            (
+                dict(
+                    title=f"Test {month}",
+                    url=f"https://www.youtube.com/watch?v={month}",
+                    description="<p>Test description</p>",
+                    timestamp=datetime.datetime(2020, month, 10, tzinfo=pytz.UTC),
+                ),
+                None,
+            )
+            for month in (1, 2, 3)
+        ]
+
+        with mock.patch(
+            "developerportal.apps.ingestion.utils.add_children", wraps=add_children
+        ) as mock_add_children:
+            revisions = generate_drafts_from_external_data(
+                factory_func=_make_video_page, items=items, owner=ingestion_user
+            )
+
+        self.assertEqual(len(revisions), 3)
+        mock_add_children.assert_called_once()
+        parent, pages = mock_add_children.call_args[0]
+        self.assertEqual(parent.slug, "videos")
+        self.assertEqual([page.title for page in pages], ["Test 1", "Test 2", "Test 3"])
+
+    @override_settings(BASE_URL="https://cms.example.com")
+    def test_send_drafts_digest(self):
+        ingestion_user = User.objects.get(username=INGESTION_USER_USERNAME)
+        User.objects.create_superuser("moderator", "moderator@example.com", "pass")
+        not_interested = User.objects.create_superuser(
+            "not-interested", "not-interested@example.com", "pass"
+        )
+        profile = UserProfile.get_for_user(not_interested)
+        profile.submitted_notifications = False
+        profile.save()
+        User.objects.create_superuser("no-email", "", "pass")
+
+        revisions = generate_drafts_from_external_data(
+            factory_func=_make_video_page,
+            items=[
+                (
+                    dict(
+                        title=f"Test {number}",
+                        url=f"https://www.youtube.com/watch?v={number}",
+                        description="<p>Test description</p>",
+                        timestamp=datetime.datetime(2020, 1, 10, tzinfo=pytz.UTC),
+                    ),
+                    None,
+                )
+                for number in ("one", "two")
+            ],
+            owner=ingestion_user,
+        )
+
+        send_drafts_digest(
+            [revision.id for revision in revisions], excluded_user_id=ingestion_user.id
+        )
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["moderator@example.com"])
+        self.assertEqual(
+            mail.outbox[0].subject, "2 ingested pages submitted for moderation"
+        )
+        for revision in revisions:
+            self.assertIn(
+                f"{revision.page.title}: https://cms.example.com"
+                f"/admin/pages/{revision.page.id}/edit/",
+                mail.outbox[0].body,
+            )
+
+    @mock.patch("developerportal.apps.ingestion.utils.send_mail")
+    def test_send_drafts_digest__unhappy_path(self, mock_send_mail):
+        mock_send_mail.side_effect = OSError("Connection refused")
+        ingestion_user = User.objects.get(username=INGESTION_USER_USERNAME)
+        User.objects.create_superuser("moderator", "moderator@example.com", "pass")
+        [revision] = generate_drafts_from_external_data(
+            factory_func=_make_video_page,
+            items=[
+                (
+                    dict(
+                        title="Test one",
+                        url="https://www.youtube.com/watch?v=one",
+                        description="<p>Test description</p>",
+                        timestamp=datetime.datetime(2020, 1, 10, tzinfo=pytz.UTC),
+                    ),
+                    None,
+                )
+            ],
+            owner=ingestion_user,
+        )
+
+        with self.assertLogs("developerportal.apps.ingestion.utils", "WARNING") as cm:
+            send_drafts_digest([revision.id], excluded_user_id=ingestion_user.id)
+
+        self.assertEqual(
+            cm.output,
+            [
+                "WARNING:developerportal.apps.ingestion.utils:Failed to send digest "
+                "of 1 ingested drafts to moderator@example.com: Connection refused"
+            ],
+        )
+
+    @override_settings(INGESTION_MIN_SYNC_INTERVAL=60, INGESTION_MAX_SYNC_INTERVAL=300)
+    def test_schedule_next_sync(self):
+        _now = datetime.datetime(2020, 1, 10, 12, tzinfo=pytz.UTC)
+        config = IngestionConfiguration()
+
+        for found_new_items, expected_interval in (
+            # Starts from the minimum, which it can't go below...
+            (True, 60),
+            # ...and backs off while there's nothing new...
+            (False, 120),
+            (False, 240),
+            # ...up to the maximum...
+            (False, 300),
+            (False, 300),
+            # ...and catches up again once there is
+            (True, 150),
+            (True, 75),
+            (True, 60),
+        ):
+            schedule_next_sync(config, found_new_items, _now)
+            self.assertEqual(
+                config.sync_interval, datetime.timedelta(seconds=expected_interval)
+            )
+            self.assertEqual(config.next_sync, _now + config.sync_interval)
+
+    def test_normalise_url(self):
+        for url in (
+            "https://blog.mozvr.com/ecsy-developer-tools",
+            "http://blog.mozvr.com/ecsy-developer-tools/",
+            "https://Blog.MozVR.com:443/ecsy-developer-tools#comments",
+            "https://blog.mozvr.com/ecsy-developer-tools/?utm_source=feed",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(
+                    normalise_url(url), "https://blog.mozvr.com/ecsy-developer-tools"
+                )
+        self.assertEqual(
+            normalise_url("https://example.com:8000/search?q=a&b=&utm_medium=rss"),
+            "https://example.com:8000/search?b=&q=a",
+        )
+        # Malformed URLs are left alone rather than raising
+        self.assertEqual(normalise_url(" http://host:abc/ "), "http://host:abc/")
+        self.assertEqual(
+            get_url_hash("http://host:abc/"),
+            hashlib.sha1(b"http://host:abc/").hexdigest(),
+        )
+
     def test_get_slug(self):
 
         cases = [
@@ -0,0 +1,88 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+import pytz
+
+from ..models import IngestionConfiguration, IngestionRun
+
+
+@override_settings(RATELIMIT_ENABLE=False, INGESTION_METRICS_TOKEN="s3cret")
+class MetricsViewTests(TestCase):
+    def _get_metrics(self):
+        return self.client.get(
+            reverse("ingestion.metrics"), HTTP_AUTHORIZATION="Bearer s3cret"
+        )
+
+    def test_metrics(self):
+        IngestionConfiguration.objects.all().delete()
+        config = IngestionConfiguration.objects.create(
+            source_name='The "Best" Blog',
+            source_url="https://example.com/feed.xml",
+            integration_type=IngestionConfiguration.CONTENT_TYPE_ARTICLE,
+            last_sync=datetime.datetime(2020, 1, 10, tzinfo=pytz.UTC),
+        )
+        IngestionRun.objects.create(
+            config=config,
+            started_at=datetime.datetime(2020, 1, 9, tzinfo=pytz.UTC),
+            items_created=5,
+        )
+        IngestionRun.objects.create(
+            config=config,
+            started_at=datetime.datetime(2020, 1, 10, tzinfo=pytz.UTC),
+            fetch_duration=1.5,
+            bytes_fetched=1024,
+            items_created=2,
+        )
+
+        response = self._get_metrics()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4")
+        labels = 'source="The \\"Best\\" Blog",integration_type="ExternalArticle"'
+        lines = response.content.decode("utf-8").splitlines()
+        # Only the latest run for each source is given
+        for line in (
+            "# TYPE ingestion_created_items gauge",
+            f"ingestion_created_items{{{labels}}} 2",
+            f"ingestion_fetch_duration_seconds{{{labels}}} 1.5",
+            f"ingestion_fetched_bytes{{{labels}}} 1024",
+            f"ingestion_last_run_completed{{{labels}}} 1",
+            f"ingestion_last_run_timestamp_seconds{{{labels}}} 1578614400.0",
+        ):
+            self.assertIn(line, lines)
+        self.assertNotIn(f"ingestion_created_items{{{labels}}} 5", lines)
+        # Nothing is given for values that weren't recorded
+        self.assertFalse(
+            any(
+                line.startswith("ingestion_transaction_duration_seconds{")
+                for line in lines
+            )
+        )
+
+    def test_access(self):
+        url = reverse("ingestion.metrics")
+        for headers in ({}, {"HTTP_AUTHORIZATION": "Bearer wrong"}):
+            with self.subTest(headers=headers):
+                self.assertEqual(self.client.get(url, **headers).status_code, 403)
+
+        self.client.force_login(User.objects.create_user("editor"))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(User.objects.create_user("admin", is_staff=True))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(INGESTION_METRICS_TOKEN=None)
+    def test_no_token_configured(self):
+        response = self.client.get(
+            reverse("ingestion.metrics"), HTTP_AUTHORIZATION="Bearer "
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_disallowed_methods(self):
+        response = self.client.post(
+            reverse("ingestion.metrics"), HTTP_AUTHORIZATION="Bearer s3cret"
+        )
+        self.assertEqual(response.status_code, 405)
@@ -0,0 +1,5 @@
+from django.conf.urls import url
+
+from . import views
+
+urlpatterns = [url(r"^metrics/ingestion/?$", views.metrics, name="ingestion.metrics")]
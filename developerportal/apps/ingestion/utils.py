@@ -2,41 +2,67 @@
 import datetime
 import hashlib
 import logging
-from io import BytesIO
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from typing import List
+from urllib.error import HTTPError
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from urllib.request import Request, urlopen
+from xml.etree import ElementTree
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
 from django.core.files.images import ImageFile
+from django.core.mail import get_connection
 from django.db import transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
 from django.utils.text import slugify
 from django.utils.timezone import now as tz_now
 
 import requests
 from dateutil.parser import parse as parse_datetime
-from wagtail.admin.mail import send_notification
-from wagtail.core.models import Page
+from requests.adapters import HTTPAdapter
+from wagtail.admin.auth import users_with_page_permission
+from wagtail.admin.mail import send_mail
+from wagtail.core.models import Page, PageRevision
 from wagtail.embeds.blocks import EmbedValue
+from wagtail.users.models import UserProfile
 
 import bleach
 import feedparser
 from bs4 import BeautifulSoup
 
 from ..common.constants import DESCRIPTION_MAX_LENGTH, NON_SPACE_WHITESPACE
+from ..common.utils import add_children
 from ..externalcontent import models as externalcontent_models
 from ..mozimages.models import MozImage
 from ..videos import models as video_models
 from .constants import INGESTION_USER_USERNAME
-from .models import IngestionConfiguration
+from .models import IngestedItem, IngestionConfiguration, IngestionRun
 
 FEED_TYPE_ATOM = "atom"
 FEED_TYPE_RSS = "rss"
 
 VALID_FEED_TYPES = (FEED_TYPE_ATOM, FEED_TYPE_RSS)
 
+ATOM_NAMESPACE = "{http://www.w3.org/2005/Atom}"
+FEED_ENTRY_TAGS = ("item", f"{ATOM_NAMESPACE}entry")
+FEED_ENTRY_DATE_TAGS = ("pubDate", f"{ATOM_NAMESPACE}published")
+FEED_READ_CHUNK_SIZE = 16 * 1024
+IMAGE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 logger = logging.getLogger(__name__)
 
+# Shared by all thumbnail downloads, so that connections to the same host are
+# reused, with a pool big enough for them all to be downloaded at once
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(pool_maxsize=settings.INGESTION_MAX_CONCURRENT_FETCHES)
+_http_session.mount("http://", _http_adapter)
+_http_session.mount("https://", _http_adapter)
+
 
 def _get_item_image(entry) -> str:
     if entry and hasattr(entry, "media_thumbnail") and entry.media_thumbnail[0]:
@@ -117,7 +143,9 @@ def _get_item_description(entry) -> str:
     return desc
 
 
-def fetch_external_data(feed_url: str, last_synced: datetime.datetime) -> list:
+def fetch_external_data(
+    feed_url: str, last_synced: datetime.datetime, config=None, run=None
+) -> list:
     """For the given feed_url, fetch all entries that are timestamped since
     last_synced and return them as a list of 0...n standardised dictionaries
     in the format:
@@ -134,10 +162,36 @@ def fetch_external_data(feed_url: str, last_synced: datetime.datetime) -> list:
         },
         ...
     ]
+
+    If the IngestionConfiguration for the feed is given as config, the feed is
+    only downloaded and parsed if it has changed since it was last fetched.
+
+    If an (unsaved) IngestionRun is given as run, it's updated with how long
+    the fetch took, and how much was fetched, or marked as not completed if the
+    feed couldn't be fetched, to tell that apart from a feed with nothing new.
     """
 
     output = []
-    parsed_data = feedparser.parse(feed_url)
+    started = time.monotonic()
+    try:
+        parsed_data = _download_feed(
+            feed_url, last_synced=last_synced, config=config, run=run
+        )
+    except OSError as err:
+        logger.warning("Problem fetching feed from %s: %s", feed_url, err)
+        if run is not None:
+            run.completed = False
+        return output
+    finally:
+        if run is not None:
+            run.fetch_duration = time.monotonic() - started
+
+    if parsed_data is None:
+        logger.info(f"Feed at {feed_url} has not changed since it was last fetched")
+        return output
+
+    if run is not None:
+        run.entries_parsed = len(parsed_data.entries)
 
     # DANGER: we can't do this next check with feeds that lack an <updated> node:
     if "updated" in parsed_data.feed.keys():
@@ -170,6 +224,221 @@ def fetch_external_data(feed_url: str, last_synced: datetime.datetime) -> list:
     return output
 
 
+def _download_feed(feed_url: str, last_synced=None, config=None, run=None):
+    """Download and parse the feed at feed_url, giving up on it if the server
+    takes more than settings.INGESTION_FETCH_TIMEOUT seconds to respond.
+
+    If last_synced is given, and settings.INGESTION_INCREMENTAL_FEED_PARSING
+    is on, the download stops at the first entry that isn't timestamped since
+    then (see _read_new_entries).
+
+    If a config is given, the request is made conditional on the ETag and
+    Last-Modified from its last fetch, and None is returned if the feed is
+    unchanged since then, either according to the server or because the content
+    read is identical. The config is updated, but not saved, with the new
+    values."""
+
+    # Identify ourselves as feedparser did when it made the request itself
+    request = Request(feed_url, headers={"User-Agent": feedparser.USER_AGENT})
+    if config is not None and config.etag:
+        request.add_header("If-None-Match", config.etag)
+    if config is not None and config.last_modified:
+        request.add_header("If-Modified-Since", config.last_modified)
+
+    try:
+        with urlopen(request, timeout=settings.INGESTION_FETCH_TIMEOUT) as response:
+            headers = {key.lower(): value for key, value in response.headers.items()}
+            if last_synced is not None and settings.INGESTION_INCREMENTAL_FEED_PARSING:
+                content, new_entries = _read_new_entries(response, last_synced)
+            else:
+                content, new_entries = response.read(), None
+    except HTTPError as err:
+        if err.code == 304:  # Not Modified
+            return None
+        raise
+
+    if run is not None:
+        run.bytes_fetched = len(content)
+
+    if config is not None:
+        content_hash = hashlib.sha1(content).hexdigest()
+        unchanged = content_hash == config.content_hash
+        config.etag = _get_storable_validator(config, "etag", headers)
+        config.last_modified = _get_storable_validator(config, "last_modified", headers)
+        config.content_hash = content_hash
+        if unchanged:
+            return None
+
+    if new_entries is not None:
+        # The document has been re-encoded as UTF-8, XML's default encoding
+        headers["content-type"] = "application/xml"
+        content = new_entries
+    return feedparser.parse(content, response_headers=headers)
+
+
+def _get_storable_validator(config, field_name, headers) -> str:
+    """Return the value of the response header for the config's field, or ""
+    if it's too long to save: a truncated validator would never match"""
+    value = headers.get(field_name.replace("_", "-"), "")
+    if len(value) > config._meta.get_field(field_name).max_length:
+        return ""
+    return value
+
+
+def _is_entry_since(entry, last_synced) -> bool:
+    for tag in FEED_ENTRY_DATE_TAGS:
+        date = entry.findtext(tag)
+        if date:
+            try:
+                return parse_datetime(date) > last_synced
+            except (ValueError, TypeError, OverflowError):
+                break
+    # If in doubt, leave it to feedparser
+    return True
+
+
+def _read_new_entries(stream, last_synced):
+    """Read the RSS or Atom feed from the stream only as far as the first entry
+    not timestamped since last_synced, to avoid downloading and parsing all of
+    a long feed when only the first few entries are new.
+
+    Returns the bytes read, plus a document of the feed with just its new
+    entries, or None in place of that if the whole feed was read (including
+    if the feed couldn't be parsed like this, and is left to feedparser)."""
+
+    read = []
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    open_elements = []
+    try:
+        for chunk in iter(lambda: stream.read(FEED_READ_CHUNK_SIZE), b""):
+            read.append(chunk)
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == "start":
+                    open_elements.append(element)
+                    continue
+                open_elements.pop()
+                if (
+                    element.tag in FEED_ENTRY_TAGS
+                    and open_elements
+                    and not _is_entry_since(element, last_synced)
+                ):
+                    # Drop this entry, and any parsed after it
+                    parent = open_elements[-1]
+                    index = list(parent).index(element)
+                    del parent[index:]
+                    new_entries = ElementTree.tostring(open_elements[0], "utf-8")
+                    return b"".join(read), new_entries
+    except ElementTree.ParseError:
+        read.append(stream.read())
+
+    return b"".join(read), None
+
+
+def fetch_all_external_data(configs, runs=None) -> dict:
+    """Fetch the new entries from each config's feed at the same time, so that
+    one slow feed doesn't hold up the others. Returns a dict of the entries
+    for each config (see fetch_external_data), keyed by config pk.
+
+    Any IngestionRuns given in runs, also keyed by config pk, are updated with
+    the details of each fetch.
+
+    Any feeds not fetched within settings.INGESTION_FETCH_DEADLINE seconds, or
+    which failed unexpectedly, are left out, so that they're tried again from
+    the same point next time."""
+
+    output = {}
+
+    def add_result(future):
+        config = futures[future]
+        try:
+            output[config.pk] = future.result()
+        except Exception:
+            # Eg a feed that breaks the parser, which shouldn't stop the others
+            logger.exception("Problem fetching feed from %s", config.source_url)
+
+    executor = ThreadPoolExecutor(max_workers=settings.INGESTION_MAX_CONCURRENT_FETCHES)
+    futures = {
+        executor.submit(
+            fetch_external_data,
+            feed_url=config.source_url,
+            last_synced=config.last_sync,
+            config=config,
+            run=(runs or {}).get(config.pk),
+        ): config
+        for config in configs
+    }
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=settings.INGESTION_FETCH_DEADLINE):
+            pending.discard(future)
+            add_result(future)
+    except TimeoutError:
+        for future, config in futures.items():
+            if future not in pending:
+                continue
+            # Some may have finished since the deadline passed
+            if future.done():
+                add_result(future)
+            else:
+                future.cancel()
+                logger.warning("Gave up waiting for feed from %s", config.source_url)
+    finally:
+        # Don't wait for any stragglers: they'll stop at their own timeout
+        executor.shutdown(wait=False)
+
+    return output
+
+
+def normalise_url(url: str) -> str:
+    """Return a canonical form of the given URL, so that an item is recognised
+    however it's linked to: http becomes https, the host is lowercased, and any
+    default port, fragment, trailing slash and utm_* tracking parameters are
+    dropped, with the remaining query parameters sorted. A URL too malformed to
+    pick apart, eg with a non-numeric port, is returned as it is."""
+
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = "https" if parts.scheme.lower() == "http" else parts.scheme.lower()
+    netloc = parts.hostname or ""
+    if port and port not in (80, 443):
+        netloc = f"{netloc}:{port}"
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.startswith("utm_")
+        )
+    )
+    return urlunsplit((scheme, netloc, parts.path.rstrip("/"), query, ""))
+
+
+def get_url_hash(url: str) -> str:
+    "Return the SHA-1 of the normalised URL, which is what IngestedItem stores"
+    return hashlib.sha1(normalise_url(url).encode("utf-8")).hexdigest()
+
+
+def _exclude_ingested_items(integration_type: str, items: list) -> list:
+    """Return the items (see fetch_external_data) whose URLs haven't been
+    ingested before, or seen earlier in the list, with one query for them all"""
+    url_hashes = [get_url_hash(data["url"]) for data in items]
+    seen = set(
+        IngestedItem.objects.filter(
+            integration_type=integration_type, url_hash__in=url_hashes
+        ).values_list("url_hash", flat=True)
+    )
+    new_items = []
+    for data, url_hash in zip(items, url_hashes):
+        if url_hash not in seen:
+            seen.add(url_hash)
+            new_items.append(data)
+    return new_items
+
+
 def _get_factory_func(model_name):
     """Get an appropriate helper function generate the desired ingestion target.
     That func will be passed into generate_draft_from_external_data"""
@@ -188,77 +457,262 @@ def _get_factory_func(model_name):
 
 def ingest_content(type_: str):
     """For the given type_:
-    * fetch the relevant data from the configured sources
-    * for each item of source data:
+    * fetch the relevant data from the configured sources that are due to be
+      synced, all at once
+    * for each item of source data that hasn't been ingested before:
+        * store its thumbnail, if any
         * create an appropriate ExternalContent page subclass, as a draft
-    * update the last_sync timestamp for each configured source
+    * update the last_sync timestamp for each configured source, and schedule
+      its next sync
     * submit all just-created draft pages for moderation
+    * queue a digest of them to be emailed to moderators
+    * record an IngestionRun for each source, with timings and counts
     """
 
     _now = tz_now()
     model_name = type_
 
-    configs = IngestionConfiguration.objects.filter(integration_type=type_)
+    # Claim the sources that are due, putting their next sync back for now, so
+    # that an overlapping run doesn't sync them too. They're rescheduled
+    # properly once synced.
+    claimed_until = _now + datetime.timedelta(
+        seconds=settings.INGESTION_MIN_SYNC_INTERVAL
+    )
+    with transaction.atomic():
+        configs = list(
+            IngestionConfiguration.objects.select_for_update(skip_locked=True).filter(
+                Q(next_sync__isnull=True) | Q(next_sync__lte=_now),
+                integration_type=type_,
+            )
+        )
+        IngestionConfiguration.objects.filter(
+            pk__in=[config.pk for config in configs]
+        ).update(next_sync=claimed_until)
 
     factory_func = _get_factory_func(model_name)
 
     ingestion_user = User.objects.get(username=INGESTION_USER_USERNAME)
 
+    runs = {
+        config.pk: IngestionRun(config=config, started_at=_now) for config in configs
+    }
+    data_by_config = fetch_all_external_data(configs, runs=runs)
+
+    revision_ids = []
     for config in configs:
-        draft_page_revision_buffer = []
+        run = runs[config.pk]
+        if config.pk not in data_by_config or not run.completed:
+            # Try it again from the same point once it's due
+            run.completed = False
+            continue
+
+        # Store any thumbnails before starting the transaction, so that it isn't
+        # held open while they're downloaded and uploaded
+        items = _exclude_ingested_items(type_, data_by_config[config.pk])
+        started = time.monotonic()
+        images = _store_external_images(
+            data["image_url"] for data in items if data.get("image_url")
+        )
+        run.image_download_duration = time.monotonic() - started
+        staged_items = [(data, images.get(data.get("image_url"))) for data in items]
 
+        started = time.monotonic()
         with transaction.atomic():
-            data_from_source = fetch_external_data(
-                feed_url=config.source_url, last_synced=config.last_sync
-            )
             config.last_sync = _now
+            schedule_next_sync(config, bool(data_by_config[config.pk]), _now)
             config.save()
 
-            for data in data_from_source:
-                data.update(owner=ingestion_user)
-                try:
-                    draft_page = generate_draft_from_external_data(
-                        factory_func=factory_func, data=data
-                    )
-                except ValidationError as ve:
-                    logger.warning("Problem ingesting article from %s: %s", data, ve)
-                else:
-                    draft_page.owner = ingestion_user
-                    draft_page.save()
-                    revision = draft_page.save_revision(
-                        submitted_for_moderation=True, user=ingestion_user
-                    )
-                    draft_page_revision_buffer.append(revision)
-
-        # If the transaction completes, we send the notification emails. If the
-        # notifications don't send even tho the data is now set in the DB, it's
-        # not the end of the world: the main CMS admin page will still
-        # show the items needing approval.
-        if settings.NOTIFY_AFTER_INGESTING_CONTENT:
-            for revision in draft_page_revision_buffer:
-                notification_success = send_notification(
-                    page_revision_id=revision.id,
-                    notification="submitted",
-                    excluded_user_id=ingestion_user.id,
+            draft_page_revision_buffer = generate_drafts_from_external_data(
+                factory_func=factory_func, items=staged_items, owner=ingestion_user
+            )
+
+        run.transaction_duration = time.monotonic() - started
+        run.items_created = len(draft_page_revision_buffer)
+        run.items_skipped = len(data_by_config[config.pk]) - run.items_created
+
+        revision_ids.extend(revision.id for revision in draft_page_revision_buffer)
+
+    IngestionRun.objects.bulk_create(runs.values())
+    retention = datetime.timedelta(days=settings.INGESTION_RUN_RETENTION_DAYS)
+    IngestionRun.objects.filter(started_at__lt=_now - retention).delete()
+
+    # Once all the transactions complete, the notification emails are sent as
+    # one digest, separately, so that ingestion isn't held up sending them. If
+    # they don't send even tho the data is now set in the DB, it's not the end
+    # of the world: the main CMS admin page will still show the items needing
+    # approval.
+    if settings.NOTIFY_AFTER_INGESTING_CONTENT and revision_ids:
+        from .tasks import send_ingestion_digest
+
+        send_ingestion_digest.delay(revision_ids, ingestion_user.id)
+
+
+def schedule_next_sync(config, found_new_items: bool, now: datetime.datetime):
+    """Set when the given config's source should next be synced, learning from
+    whether this sync found new items: the interval between syncs is halved if
+    it did, and doubled if it didn't, within settings.INGESTION_MIN_SYNC_INTERVAL
+    and settings.INGESTION_MAX_SYNC_INTERVAL. So busy feeds are soon polled
+    often, and quiet ones rarely. The config isn't saved."""
+
+    min_interval = datetime.timedelta(seconds=settings.INGESTION_MIN_SYNC_INTERVAL)
+    max_interval = datetime.timedelta(seconds=settings.INGESTION_MAX_SYNC_INTERVAL)
+    interval = config.sync_interval or min_interval
+    interval = interval / 2 if found_new_items else interval * 2
+    config.sync_interval = max(min_interval, min(interval, max_interval))
+    config.next_sync = now + config.sync_interval
+
+
+def send_drafts_digest(revision_ids, excluded_user_id):
+    """Email each moderator who can publish any of the given revisions one
+    digest of them all, rather than an email per revision as with Wagtail's
+    own notifications (see wagtail.admin.mail.send_notification). Moderators
+    who have turned off "submitted" notifications are left out, as is the
+    excluded user."""
+
+    revisions = (
+        PageRevision.objects.filter(id__in=revision_ids)
+        .select_related("page")
+        .order_by("id")
+    )
+    include_superusers = getattr(
+        settings, "WAGTAILADMIN_NOTIFICATION_INCLUDE_SUPERUSERS", True
+    )
+
+    # Pages with the same parent have the same moderators, so only look them
+    # up once for each parent
+    moderators_by_parent_path = {}
+    revisions_by_moderator = defaultdict(list)
+    for revision in revisions:
+        parent_path = Page._get_parent_path_from_path(revision.page.path)
+        if parent_path not in moderators_by_parent_path:
+            moderators_by_parent_path[parent_path] = users_with_page_permission(
+                revision.page, "publish", include_superusers
+            )
+        for moderator in moderators_by_parent_path[parent_path]:
+            revisions_by_moderator[moderator].append(revision)
+
+    # Share one connection to the mail server between all the emails
+    with get_connection() as connection:
+        for moderator, moderator_revisions in revisions_by_moderator.items():
+            if (
+                not moderator.email
+                or moderator.pk == excluded_user_id
+                or not UserProfile.get_for_user(moderator).submitted_notifications
+            ):
+                continue
+
+            context = {
+                "revisions": moderator_revisions,
+                "settings": settings,
+                "user": moderator,
+            }
+            try:
+                send_mail(
+                    render_to_string(
+                        "wagtailadmin/notifications/ingestion_digest_subject.txt",
+                        context,
+                    ).strip(),
+                    render_to_string(
+                        "wagtailadmin/notifications/ingestion_digest.txt", context
+                    ).strip(),
+                    [moderator.email],
+                    connection=connection,
+                )
+            except Exception as err:
+                logger.warning(
+                    "Failed to send digest of %d ingested drafts to %s: %s",
+                    len(moderator_revisions),
+                    moderator.email,
+                    err,
                 )
-                if not notification_success:
-                    logger.warning(
-                        "Failed to send notification that %s was created.",
-                        revision.page,
-                    )
 
 
-def _store_external_image(image_url: str) -> MozImage:
-    """Download an image from the given URL and store it as a Wagtail image"""
-    response = requests.get(image_url)
+def _download_image(image_url: str):
+    """Download the image at the given URL to a temporary file, a chunk at a
+    time so that the whole image is never held in memory.
+
+    Returns the (open) file and the SHA-1 of its content, or None if the image
+    couldn't be downloaded or is bigger than settings.INGESTION_MAX_IMAGE_SIZE
+    """
+    max_size = settings.INGESTION_MAX_IMAGE_SIZE
+    file_ = tempfile.TemporaryFile()
+    try:
+        response = _http_session.get(
+            image_url, stream=True, timeout=settings.INGESTION_FETCH_TIMEOUT
+        )
+        try:
+            response.raise_for_status()
+            if int(response.headers.get("content-length") or 0) > max_size:
+                raise ValueError("Image is too large")
+            hash_ = hashlib.sha1()
+            for chunk in response.iter_content(IMAGE_DOWNLOAD_CHUNK_SIZE):
+                if file_.tell() + len(chunk) > max_size:
+                    raise ValueError("Image is too large")
+                hash_.update(chunk)
+                file_.write(chunk)
+        finally:
+            response.close()
+    except (requests.RequestException, ValueError) as err:
+        file_.close()
+        logger.warning("Problem downloading image from %s: %s", image_url, err)
+        return None
+
+    file_.seek(0)
+    return file_, hash_.hexdigest()
+
+
+def _save_downloaded_image(image_url: str, file_, file_hash: str) -> MozImage:
+    """Store the file downloaded from the given URL as a Wagtail image, unless
+    an image with the same content is already stored"""
+    existing_image = MozImage.objects.filter(file_hash=file_hash).first()
+    if existing_image:
+        return existing_image
+
     filename = image_url.split("/")[-1]
     image = MozImage(
-        title=filename, file=ImageFile(BytesIO(response.content), name=filename)
+        title=filename, file=ImageFile(file_, name=filename), file_hash=file_hash,
     )
     image.save()
     return image
 
 
+def _store_external_image(image_url: str) -> MozImage:
+    """Download an image from the given URL and store it as a Wagtail image,
+    unless an image with the same content is already stored.
+
+    Returns None if the image couldn't be downloaded (see _download_image)."""
+    downloaded = _download_image(image_url)
+    if downloaded is None:
+        return None
+    file_, file_hash = downloaded
+    with file_:
+        return _save_downloaded_image(image_url, file_, file_hash)
+
+
+def _store_external_images(image_urls) -> dict:
+    """Bulk version of _store_external_image, which downloads all the images
+    at once. Returns a dict of the stored images (or None, for any that
+    couldn't be downloaded) keyed by URL."""
+    image_urls = list(dict.fromkeys(image_urls))
+    if not image_urls:
+        return {}
+
+    with ThreadPoolExecutor(
+        max_workers=settings.INGESTION_MAX_CONCURRENT_FETCHES
+    ) as executor:
+        downloads = list(executor.map(_download_image, image_urls))
+
+    images = {}
+    for image_url, downloaded in zip(image_urls, downloads):
+        if downloaded is None:
+            images[image_url] = None
+            continue
+        file_, file_hash = downloaded
+        with file_:
+            images[image_url] = _save_downloaded_image(image_url, file_, file_hash)
+    return images
+
+
 def _get_slug(data):
     """Return a slug for the Page being imported, making it unique (enough) by
     adding a 12-char truncated hash of the whole data payload at the end
@@ -275,7 +729,7 @@ def _get_slug(data):
 
 
 def _make_external_article_page(data, extra_kwargs):
-    "Callable that takes care of making ExternalArticles"
+    "Callable that takes care of making (unsaved) ExternalArticles"
     instance_data = dict(
         title=data["title"],
         draft_title=data["title"],
@@ -288,15 +742,11 @@ def _make_external_article_page(data, extra_kwargs):
         external_url=data["url"],
     )
 
-    page = externalcontent_models.ExternalArticle(**instance_data)
-    # These get added to the root page
-    parent_page = Page.objects.filter(slug="root").first().specific
-    parent_page.add_child(instance=page)  # Takes care of saving
-
-    return page
+    return externalcontent_models.ExternalArticle(**instance_data)
 
 
 def _make_video_page(data, extra_kwargs):
+    "Callable that takes care of making (unsaved) Videos"
 
     _video_url = data.get("url")
 
@@ -313,17 +763,25 @@ def _make_video_page(data, extra_kwargs):
 
     page = video_models.Video(**instance_data)
     page.video_url = [("embed", EmbedValue(_video_url))]
-    parent_page = Page.objects.filter(slug="videos").first().specific
-    parent_page.add_child(instance=page)  # Takes care of saving
-
     return page
 
 
+def _get_parent_page(page):
+    """Return the page that an ingested page should be added to: Videos get
+    added to the videos page, and ExternalArticles to the folder for their month
+    (see ExternalContentFolder)"""
+    if isinstance(page, video_models.Video):
+        return Page.objects.filter(slug="videos").first()
+    return externalcontent_models.ExternalContentFolder.for_date(page.date)
+
+
 @transaction.atomic()
-def generate_draft_from_external_data(factory_func, data, **kwargs):
+def generate_draft_from_external_data(factory_func, data, image=None, **kwargs):
     """Create a draft page of the appropriate `model` (eg: ExternalArticle,
     Video) from the given `factory_func` and `data`, including any associated
     thumbnail (which is saved down as a Wagtail image on the card_image field).
+
+    If the thumbnail has already been stored, pass it as `image`.
     """
     logger.info(
         f"Generating a new draft using {factory_func.__name__} from {str(data)}"
@@ -332,8 +790,76 @@ def generate_draft_from_external_data(factory_func, data, **kwargs):
     page = factory_func(data=data, extra_kwargs=kwargs)
 
     # If there's an image to be associated, do that.
-    if data.get("image_url"):
+    if image is None and data.get("image_url"):
         image = _store_external_image(data["image_url"])
-        page.card_image = image
-        page.save()
+    page.card_image = image
+
+    _get_parent_page(page).add_child(instance=page)  # Takes care of saving
     return page
+
+
+@transaction.atomic()
+def generate_drafts_from_external_data(factory_func, items, owner):
+    """Bulk version of generate_draft_from_external_data, for a list of
+    (data, image) `items`, which also submits each draft for moderation by
+    `owner`. The pages are added to the tree together (see
+    common.utils.add_children) and their revisions inserted in one query.
+
+    Returns the revisions of the drafts that were created."""
+
+    _now = tz_now()
+    pages = []
+    for data, image in items:
+        data.update(owner=owner)
+        logger.info(
+            f"Generating a new draft using {factory_func.__name__} from {str(data)}"
+        )
+        page = factory_func(data=data, extra_kwargs={"owner": owner})
+        page.card_image = image
+        page.latest_revision_created_at = _now
+        pages.append(page)
+
+    # Add the pages to each parent together (see _get_parent_page): all Videos
+    # share one, and ExternalArticles share their month's folder
+    indexes_by_parent = defaultdict(list)
+    for index, page in enumerate(pages):
+        if isinstance(page, video_models.Video):
+            key = "videos"
+        else:
+            key = (page.date.year, page.date.month)
+        indexes_by_parent[key].append(index)
+
+    errors = [None] * len(pages)
+    for indexes in indexes_by_parent.values():
+        sibling_pages = [pages[index] for index in indexes]
+        parent = _get_parent_page(sibling_pages[0])
+        for index, error in zip(indexes, add_children(parent, sibling_pages)):
+            errors[index] = error
+
+    revisions = []
+    ingested_items = []
+    for (data, image), page, error in zip(items, pages, errors):
+        if error is not None:
+            logger.warning("Problem ingesting article from %s: %s", data, error)
+            continue
+        revisions.append(
+            PageRevision(
+                page=page,
+                content_json=page.to_json(),
+                user=owner,
+                submitted_for_moderation=True,
+                created_at=_now,
+            )
+        )
+        ingested_items.append(
+            IngestedItem(
+                # The factory funcs' models are named after the integration types
+                integration_type=type(page).__name__,
+                url_hash=get_url_hash(data["url"]),
+                url=data["url"],
+                page=page,
+            )
+        )
+
+    IngestedItem.objects.bulk_create(ingested_items, ignore_conflicts=True)
+    return PageRevision.objects.bulk_create(revisions)
@@ -0,0 +1,91 @@
+import datetime
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+from .models import IngestionRun
+
+# The IngestionRun fields exported as gauges for each source, with their names
+# and descriptions
+METRICS = (
+    ("started_at", "ingestion_last_run_timestamp_seconds", "When the run began"),
+    (
+        "completed",
+        "ingestion_last_run_completed",
+        "1 if the feed was fetched without errors, in time",
+    ),
+    ("fetch_duration", "ingestion_fetch_duration_seconds", "Time taken to fetch"),
+    ("bytes_fetched", "ingestion_fetched_bytes", "Bytes of feed downloaded"),
+    ("entries_parsed", "ingestion_parsed_entries", "Feed entries parsed"),
+    ("items_created", "ingestion_created_items", "Draft pages created"),
+    ("items_skipped", "ingestion_skipped_items", "New items not created"),
+    (
+        "image_download_duration",
+        "ingestion_image_download_duration_seconds",
+        "Time taken to download thumbnails",
+    ),
+    (
+        "transaction_duration",
+        "ingestion_transaction_duration_seconds",
+        "Time taken to create the drafts",
+    ),
+)
+
+
+def _is_allowed_to_see_metrics(request):
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = settings.INGESTION_METRICS_TOKEN
+    return bool(token) and constant_time_compare(
+        request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {token}"
+    )
+
+
+def _escape_label_value(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _get_metric_value(run, field):
+    value = getattr(run, field)
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+@never_cache
+@require_safe
+def metrics(request):
+    """The details of the latest IngestionRun for each source, in the
+    Prometheus text format, for staff or scrapers with the metrics token"""
+
+    if not _is_allowed_to_see_metrics(request):
+        return HttpResponseForbidden()
+
+    latest_runs = list(
+        IngestionRun.objects.select_related("config")
+        .order_by("config", "-started_at")
+        .distinct("config")
+    )
+
+    lines = []
+    for field, name, help_text in METRICS:
+        lines.append(f"# HELP {name} {help_text}, in the latest run for each source")
+        lines.append(f"# TYPE {name} gauge")
+        for run in latest_runs:
+            value = _get_metric_value(run, field)
+            if value is None:
+                continue
+            labels = 'source="{}",integration_type="{}"'.format(
+                _escape_label_value(run.config.source_name),
+                run.config.integration_type,
+            )
+            lines.append(f"{name}{{{labels}}} {value}")
+
+    return HttpResponse(
+        "\n".join(lines) + "\n", content_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,43 @@
+from wagtail.contrib.modeladmin.helpers import PermissionHelper
+from wagtail.contrib.modeladmin.options import ModelAdmin, modeladmin_register
+
+from .models import IngestionRun
+
+
+class ReadOnlyPermissionHelper(PermissionHelper):
+    """IngestionRuns are only ever created by ingestion itself"""
+
+    def user_can_create(self, user):
+        return False
+
+    def user_can_edit_obj(self, user, obj):
+        return False
+
+    def user_can_delete_obj(self, user, obj):
+        return False
+
+
+class IngestionRunAdmin(ModelAdmin):
+    model = IngestionRun
+    menu_label = "Ingestion runs"
+    menu_icon = "time"
+    add_to_settings_menu = True
+    permission_helper_class = ReadOnlyPermissionHelper
+    inspect_view_enabled = True
+    list_display = (
+        "config",
+        "started_at",
+        "completed",
+        "fetch_duration",
+        "bytes_fetched",
+        "entries_parsed",
+        "items_created",
+        "items_skipped",
+        "image_download_duration",
+        "transaction_duration",
+    )
+    list_filter = ("config", "completed")
+    list_select_related = ("config",)
+
+
+modeladmin_register(IngestionRunAdmin)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class MozImagesConfig(AppConfig):
+    name = "developerportal.apps.mozimages"
+
+    def ready(self):
+        from .signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
@@ -0,0 +1,58 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ...models import MozImage
+from ...tasks import generate_template_renditions
+
+PROGRESS_INTERVAL = 100
+
+
+def _generate(image_id):
+    generate_template_renditions(image_id)
+    return image_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the renditions used by our templates for every image, "
+        "spreading the work over a pool of processes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Number of worker processes to use. 1 means no pool is used.",
+        )
+        parser.add_argument(
+            "--chunksize",
+            type=int,
+            default=10,
+            help="Number of images handed to a worker process at a time",
+        )
+
+    def handle(self, *args, **options):
+        image_ids = list(MozImage.objects.order_by("pk").values_list("pk", flat=True))
+        total = len(image_ids)
+
+        if options["processes"] == 1:
+            results = map(_generate, image_ids)
+            self._report_progress(results, total)
+        else:
+            # Forked workers must not share the parent's database connections
+            connections.close_all()
+            with multiprocessing.Pool(options["processes"]) as pool:
+                results = pool.imap_unordered(
+                    _generate, image_ids, chunksize=options["chunksize"]
+                )
+                self._report_progress(results, total)
+
+        self.stdout.write(f"Generated renditions for {total} images")
+
+    def _report_progress(self, results, total):
+        for count, _ in enumerate(results, 1):
+            if count % PROGRESS_INTERVAL == 0:
+                self.stdout.write(f"{count}/{total} images done")
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mozimages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mozimage',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+    ]
@@ -1,14 +1,131 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.forms.utils import flatatt
+from django.utils.safestring import mark_safe
+
+from wagtail.images.models import AbstractImage, AbstractRendition, Filter, Image
 
-from wagtail.images.models import AbstractImage, AbstractRendition, Image
+from ..common.utils import override_cache_control_policy
+
+# Marks a rendition as queued for generation, so that the requests which find it
+# missing until then don't each queue it again
+RENDITION_QUEUED_CACHE_KEY = "rendition-queued-{}-{}"
+RENDITION_QUEUED_TIMEOUT = 60
 
 
 class MozImage(AbstractImage):
     # Additional fields:
     caption = models.CharField(max_length=255, blank=True)
 
+    # Overridden to add an index, so that images can be looked up by content
+    file_hash = models.CharField(
+        max_length=40, blank=True, editable=False, db_index=True
+    )
+
     admin_form_fields = Image.admin_form_fields + ("caption",)
 
+    def save(self, *args, **kwargs):
+        """If a new image has the same content as an existing one, reuse the
+        existing file (and its renditions) rather than uploading another copy.
+
+        Files can therefore be shared between images: see
+        mozimages.signal_handlers.delete_unshared_file."""
+
+        if self._state.adding:
+            original = self._get_original()
+        else:
+            original = None
+            if not getattr(self.file, "_committed", True):
+                self._detach_shared_file()
+        if original is not None:
+            self.file.name = original.file.name
+            self.file._committed = True
+        super().save(*args, **kwargs)
+        if (
+            original is not None
+            and self.get_focal_point() == original.get_focal_point()
+        ):
+            self._copy_renditions(original)
+
+    def _get_original(self):
+        """Return the first image with the same content as this one, if this
+        one's file hasn't been uploaded yet"""
+        if not self.file_hash or getattr(self.file, "_committed", True):
+            return None
+        return (
+            MozImage.objects.filter(file_hash=self.file_hash)
+            .exclude(file="")
+            .order_by("pk")
+            .first()
+        )
+
+    def _detach_shared_file(self):
+        """Wagtail's admin deletes the old file when an image's file is
+        replaced, so give any other images sharing it a copy of their own"""
+        old_name = (
+            MozImage.objects.filter(pk=self.pk).values_list("file", flat=True).first()
+        )
+        others = MozImage.objects.filter(file=old_name).exclude(pk=self.pk)
+        if old_name and others.exists():
+            storage = self.file.storage
+            with storage.open(old_name) as old_file:
+                new_name = storage.save(old_name, old_file)
+            others.update(file=new_name)
+
+    def _copy_renditions(self, original):
+        Rendition.objects.bulk_create(
+            [
+                Rendition(
+                    image=self,
+                    filter_spec=rendition.filter_spec,
+                    focal_point_key=rendition.focal_point_key,
+                    file=rendition.file.name,
+                    width=rendition.width,
+                    height=rendition.height,
+                )
+                for rendition in original.renditions.all()
+            ]
+        )
+
+    def get_rendition(self, filter):
+        """Look for the rendition among any that were fetched in bulk (see
+        mozimages.utils.prefetch_renditions, or prefetch_related("renditions"))
+        before falling back to Wagtail's one-query-per-rendition approach.
+
+        If a rendition is known to be missing, it is queued for generation (once
+        every RENDITION_QUEUED_TIMEOUT seconds at most) and a DeferredRendition
+        is returned, rather than generating it during the request, unless
+        settings.DEFER_RENDITION_GENERATION is False."""
+
+        prefetched = self._get_prefetched_renditions()
+        if isinstance(filter, str):
+            filter = Filter(spec=filter)
+        if prefetched is None or not prefetched.covers(filter.spec):
+            return super().get_rendition(filter)
+
+        key = (filter.spec, filter.get_cache_key(self))
+        if key not in prefetched:
+            if settings.DEFER_RENDITION_GENERATION:
+                from .tasks import generate_renditions
+
+                queued_key = RENDITION_QUEUED_CACHE_KEY.format(self.pk, filter.spec)
+                if cache.add(queued_key, True, timeout=RENDITION_QUEUED_TIMEOUT):
+                    generate_renditions.delay(self.pk, [filter.spec])
+                prefetched[key] = DeferredRendition(self)
+            else:
+                prefetched[key] = super().get_rendition(filter)
+        return prefetched[key]
+
+    def _get_prefetched_renditions(self):
+        if not hasattr(self, "_prefetched_renditions"):
+            if "renditions" not in getattr(self, "_prefetched_objects_cache", {}):
+                return None
+            self._prefetched_renditions = PrefetchedRenditions(self.renditions.all())
+        return self._prefetched_renditions
+
 
 class Rendition(AbstractRendition):
     image = models.ForeignKey(
@@ -17,3 +134,67 @@ class Rendition(AbstractRendition):
 
     class Meta:
         unique_together = (("image", "filter_spec", "focal_point_key"),)
+
+
+class PrefetchedRenditions(dict):
+    """Renditions of one image keyed by (filter_spec, focal_point_key).
+
+    If filter_specs is given, only those specs were fetched, so only they can be
+    said to be missing; other specs have to be looked up as normal."""
+
+    def __init__(self, renditions, filter_specs=None):
+        super().__init__(
+            ((rendition.filter_spec, rendition.focal_point_key), rendition)
+            for rendition in renditions
+        )
+        self.filter_specs = set(filter_specs) if filter_specs is not None else None
+
+    def covers(self, filter_spec):
+        return self.filter_specs is None or filter_spec in self.filter_specs
+
+
+class DeferredRendition:
+    """Stands in for a Rendition that has been queued for generation, by
+    showing the original image in the meantime. Quacks like a Rendition as far
+    as templates are concerned.
+
+    The response it's shown in is only cached briefly, so that the CDN doesn't
+    hold on to the full-size image for long after the rendition is ready."""
+
+    def __init__(self, image):
+        override_cache_control_policy("deferred_rendition")
+        self.image = image
+        self.file = image.file
+        self.width = image.width
+        self.height = image.height
+
+    @property
+    def url(self):
+        return self.file.url
+
+    @property
+    def alt(self):
+        return self.image.title
+
+    @property
+    def attrs(self):
+        return flatatt(self.attrs_dict)
+
+    @property
+    def attrs_dict(self):
+        return OrderedDict(
+            [
+                ("src", self.url),
+                ("width", self.width),
+                ("height", self.height),
+                ("alt", self.alt),
+            ]
+        )
+
+    def img_tag(self, extra_attributes=None):
+        attrs = self.attrs_dict.copy()
+        attrs.update(extra_attributes or {})
+        return mark_safe(f"<img{flatatt(attrs)}>")
+
+    def __html__(self):
+        return self.img_tag()
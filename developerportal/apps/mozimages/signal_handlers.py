@@ -0,0 +1,75 @@
+from django.db import transaction
+from django.db.models import ForeignKey
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.core.fields import StreamField
+from wagtail.core.signals import page_published
+from wagtail.images.blocks import ImageChooserBlock
+from wagtail.images.signal_handlers import post_delete_file_cleanup
+
+from .models import MozImage, Rendition
+from .tasks import generate_template_renditions
+
+
+def queue_template_renditions(image_ids):
+    """Queue generation of the template renditions for each image, once the
+    current transaction is committed so that the worker can see the image"""
+    for image_id in set(image_ids):
+        transaction.on_commit(
+            lambda image_id=image_id: generate_template_renditions.delay(image_id)
+        )
+
+
+def get_page_image_ids(page):
+    """Return the ids of the images a page refers to, via its image fields or
+    the top-level image blocks in its StreamFields"""
+    image_ids = []
+    for field in page._meta.get_fields():
+        if isinstance(field, ForeignKey) and field.related_model is MozImage:
+            image_ids.append(getattr(page, field.attname))
+        elif isinstance(field, StreamField):
+            stream_value = getattr(page, field.name)
+            if not stream_value:
+                continue
+            child_blocks = stream_value.stream_block.child_blocks
+            image_ids.extend(
+                item["value"]
+                for item in stream_value.get_prep_value()
+                if isinstance(child_blocks.get(item["type"]), ImageChooserBlock)
+            )
+    return [image_id for image_id in image_ids if image_id]
+
+
+def generate_renditions_on_image_save(sender, instance, **kwargs):
+    queue_template_renditions([instance.pk])
+
+
+def generate_renditions_on_publish(sender, instance, **kwargs):
+    queue_template_renditions(get_page_image_ids(instance))
+
+
+def delete_unshared_file(sender, instance, **kwargs):
+    """Delete the file of a deleted image or rendition, unless another one with
+    the same content still uses it (see MozImage.save)"""
+    name = instance.file.name
+
+    def delete():
+        if not sender.objects.filter(file=name).exists():
+            instance.file.delete(False)
+
+    transaction.on_commit(delete)
+
+
+def register_signal_handlers():
+    """Connect the handlers above. This is done by MozImagesConfig.ready(), so
+    that they're also connected in the Celery worker, which never loads the
+    wagtail_hooks modules."""
+    post_save.connect(generate_renditions_on_image_save, sender=MozImage)
+    page_published.connect(generate_renditions_on_publish)
+
+    # Replace Wagtail's cleanup, which would delete files that are still shared.
+    # It's connected by wagtail.images' own ready(), so this app has to come
+    # after wagtail.images in INSTALLED_APPS.
+    for model in (MozImage, Rendition):
+        post_delete.disconnect(post_delete_file_cleanup, sender=model)
+        post_delete.connect(delete_unshared_file, sender=model)
@@ -0,0 +1,32 @@
+import logging
+import os
+
+from developerportal.apps.taskqueue.celery import app
+
+from ..common.constants import TEMPLATE_RENDITION_FILTER_SPECS
+from .models import MozImage
+
+logging.basicConfig(level=os.environ.get("LOGLEVEL", logging.INFO))
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def generate_renditions(image_id, filter_specs):
+    """Generate (or find) the given renditions of an image, so that they are
+    ready for the next request that needs them."""
+    log_prefix = "[Generate renditions]"
+    try:
+        image = MozImage.objects.get(pk=image_id)
+    except MozImage.DoesNotExist:
+        logger.info(f"{log_prefix} Image {image_id} no longer exists")
+        return
+
+    logger.info(f"{log_prefix} Generating {filter_specs} for image {image_id}")
+    for filter_spec in filter_specs:
+        image.get_rendition(filter_spec)
+
+
+@app.task
+def generate_template_renditions(image_id):
+    """Generate the renditions our templates use, ahead of them being needed"""
+    generate_renditions(image_id, list(TEMPLATE_RENDITION_FILTER_SPECS))
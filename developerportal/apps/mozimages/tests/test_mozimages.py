@@ -0,0 +1,304 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase, override_settings
+
+from wagtail.core.signals import page_published
+from wagtail.images.signal_handlers import post_delete_file_cleanup
+from wagtail.images.tests.utils import get_test_image_file
+
+from ...articles.models import Article
+from ...common.constants import TEMPLATE_RENDITION_FILTER_SPECS
+from ...common.utils import cache_control_policy_override
+from ..models import RENDITION_QUEUED_CACHE_KEY, DeferredRendition, MozImage, Rendition
+from ..signal_handlers import (
+    delete_unshared_file,
+    generate_renditions_on_image_save,
+    generate_renditions_on_publish,
+    get_page_image_ids,
+)
+from ..tasks import generate_renditions, generate_template_renditions
+from ..utils import prefetch_card_renditions, prefetch_renditions
+
+
+class RenditionPrefetchTests(TestCase):
+    def setUp(self):
+        self.image = MozImage.objects.create(
+            title="Test image", file=get_test_image_file()
+        )
+        self.rendition = self.image.get_rendition("width-480")
+        cache.delete(RENDITION_QUEUED_CACHE_KEY.format(self.image.pk, "width-400"))
+
+    def test_prefetch_renditions(self):
+        image = MozImage.objects.get(pk=self.image.pk)
+        with self.assertNumQueries(1):
+            prefetch_renditions([image, None], ["width-480"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(image.get_rendition("width-480"), self.rendition)
+
+    @mock.patch("developerportal.apps.mozimages.tasks.generate_renditions.delay")
+    @override_settings(DEFER_RENDITION_GENERATION=True)
+    def test_get_rendition__missing_rendition_is_deferred(self, mock_delay):
+        image = MozImage.objects.get(pk=self.image.pk)
+        prefetch_renditions([image], ["width-480", "width-400"])
+
+        with self.assertNumQueries(0):
+            rendition = image.get_rendition("width-400")
+            self.assertEqual(image.get_rendition("width-400"), rendition)
+
+        self.assertIsInstance(rendition, DeferredRendition)
+        self.assertEqual(rendition.url, image.file.url)
+        self.assertEqual(rendition.attrs_dict["alt"], "Test image")
+        mock_delay.assert_called_once_with(image.pk, ["width-400"])
+        self.assertFalse(
+            Rendition.objects.filter(image=image, filter_spec="width-400").exists()
+        )
+
+    @mock.patch("developerportal.apps.mozimages.tasks.generate_renditions.delay")
+    @override_settings(DEFER_RENDITION_GENERATION=True)
+    def test_get_rendition__missing_rendition_is_queued_once(self, mock_delay):
+        # As by concurrent requests, each with their own copy of the image
+        for _ in range(3):
+            image = MozImage.objects.get(pk=self.image.pk)
+            prefetch_renditions([image], ["width-400"])
+            self.assertIsInstance(image.get_rendition("width-400"), DeferredRendition)
+
+        mock_delay.assert_called_once_with(self.image.pk, ["width-400"])
+
+    @mock.patch("developerportal.apps.mozimages.tasks.generate_renditions.delay")
+    @override_settings(DEFER_RENDITION_GENERATION=True)
+    def test_get_rendition__deferred_rendition_shortens_caching(self, mock_delay):
+        image = MozImage.objects.get(pk=self.image.pk)
+        prefetch_renditions([image], ["width-400"])
+
+        with cache_control_policy_override() as override:
+            image.get_rendition("width-480")
+            self.assertEqual(override, {})
+            image.get_rendition("width-400")
+
+        self.assertEqual(override, {"policy_name": "deferred_rendition"})
+
+    @mock.patch("developerportal.apps.mozimages.tasks.generate_renditions.delay")
+    @override_settings(DEFER_RENDITION_GENERATION=False)
+    def test_get_rendition__missing_rendition_not_deferred(self, mock_delay):
+        image = MozImage.objects.get(pk=self.image.pk)
+        prefetch_renditions([image], ["width-400"])
+
+        rendition = image.get_rendition("width-400")
+
+        self.assertIsInstance(rendition, Rendition)
+        assert not mock_delay.called
+
+    @mock.patch("developerportal.apps.mozimages.tasks.generate_renditions.delay")
+    def test_get_rendition__spec_not_prefetched(self, mock_delay):
+        image = MozImage.objects.get(pk=self.image.pk)
+        prefetch_renditions([image], ["width-400"])
+
+        rendition = image.get_rendition("width-480")
+
+        self.assertEqual(rendition, self.rendition)
+        assert not mock_delay.called
+
+    def test_get_rendition__prefetch_related(self):
+        image = MozImage.objects.prefetch_related("renditions").get(pk=self.image.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(image.get_rendition("width-480"), self.rendition)
+
+
+class CardRenditionPrefetchTests(TestCase):
+    fixtures = ["common.json"]
+
+    def test_prefetch_card_renditions(self):
+        image = MozImage.objects.create(title="Card", file=get_test_image_file())
+        rendition = image.get_rendition("width-480")
+        Article.objects.update(card_image=image)
+        articles = list(Article.objects.all())
+
+        with self.assertNumQueries(2):
+            prefetch_card_renditions(articles, ["width-480"])
+
+        with self.assertNumQueries(0):
+            for article in articles:
+                self.assertEqual(
+                    article.card_image.get_rendition("width-480"), rendition
+                )
+
+
+class TasksTests(TestCase):
+    def test_generate_renditions(self):
+        image = MozImage.objects.create(title="Test", file=get_test_image_file())
+
+        generate_renditions(image.pk, ["width-400", "fill-375x210"])
+
+        self.assertEqual(
+            set(image.renditions.values_list("filter_spec", flat=True)),
+            {"width-400", "fill-375x210"},
+        )
+
+    @mock.patch("developerportal.apps.mozimages.tasks.logger")
+    def test_generate_renditions__missing_image(self, mock_logger):
+        generate_renditions(99999, ["width-400"])
+        mock_logger.info.assert_called_once_with(
+            "[Generate renditions] Image 99999 no longer exists"
+        )
+
+
+@mock.patch(
+    "developerportal.apps.mozimages.signal_handlers.transaction.on_commit",
+    side_effect=lambda func: func(),
+)
+@mock.patch(
+    "developerportal.apps.mozimages.signal_handlers.generate_template_renditions.delay"
+)
+class EagerRenditionTests(TestCase):
+    fixtures = ["common.json"]
+
+    def setUp(self):
+        self.image = MozImage.objects.create(title="Image", file=get_test_image_file())
+        self.other_image = MozImage.objects.create(
+            title="Other image", file=get_test_image_file()
+        )
+
+    def test_generate_renditions_on_image_save(self, mock_delay, mock_on_commit):
+        generate_renditions_on_image_save(sender=MozImage, instance=self.image)
+        mock_delay.assert_called_once_with(self.image.pk)
+
+    def test_generate_renditions_on_publish(self, mock_delay, mock_on_commit):
+        article = Article.objects.first()
+        article.card_image = self.image
+        article.card_image_3_2 = self.image
+        article.body = json.dumps(
+            [
+                {"type": "image", "value": self.other_image.pk},
+                {"type": "paragraph", "value": "<p>Text</p>"},
+            ]
+        )
+
+        self.assertEqual(
+            sorted(get_page_image_ids(article)),
+            sorted([self.image.pk, self.image.pk, self.other_image.pk]),
+        )
+
+        generate_renditions_on_publish(sender=Article, instance=article)
+        self.assertEqual(
+            sorted(call[0][0] for call in mock_delay.call_args_list),
+            sorted([self.image.pk, self.other_image.pk]),
+        )
+
+
+class BackfillRenditionsTests(TestCase):
+    def test_generate_template_renditions(self):
+        image = MozImage.objects.create(title="Test", file=get_test_image_file())
+        generate_template_renditions(image.pk)
+        self.assertEqual(
+            set(image.renditions.values_list("filter_spec", flat=True)),
+            set(TEMPLATE_RENDITION_FILTER_SPECS),
+        )
+
+    @mock.patch(
+        "developerportal.apps.mozimages.management.commands.backfill_renditions."
+        "generate_template_renditions"
+    )
+    def test_backfill_renditions_command(self, mock_generate):
+        images = [
+            MozImage.objects.create(title="Test", file=get_test_image_file())
+            for _ in range(2)
+        ]
+        out = StringIO()
+
+        call_command("backfill_renditions", processes=1, stdout=out)
+
+        self.assertEqual(
+            [call[0][0] for call in mock_generate.call_args_list],
+            [image.pk for image in images],
+        )
+        self.assertEqual(out.getvalue(), "Generated renditions for 2 images\n")
+
+
+def _set_file(image, colour="white"):
+    """Set an image's file the way Wagtail's admin does, with its hash"""
+    image.file = get_test_image_file(colour=colour)
+    image.file.seek(0)
+    image._set_file_hash(image.file.read())
+    image.file.seek(0)
+
+
+def _create_image(colour="white"):
+    image = MozImage(title="Test image")
+    _set_file(image, colour=colour)
+    image.save()
+    return image
+
+
+@mock.patch(
+    "developerportal.apps.mozimages.signal_handlers.transaction.on_commit",
+    side_effect=lambda func: func(),
+)
+class ContentDeduplicationTests(TestCase):
+    def test_duplicate_upload_shares_file_and_renditions(self, mock_on_commit):
+        original = _create_image()
+        rendition = original.get_rendition("width-480")
+
+        duplicate = _create_image()
+
+        self.assertNotEqual(duplicate.pk, original.pk)
+        self.assertEqual(duplicate.file.name, original.file.name)
+        self.assertEqual(duplicate.renditions.count(), 1)
+        self.assertEqual(
+            duplicate.get_rendition("width-480").file.name, rendition.file.name
+        )
+
+    def test_different_upload_is_stored_separately(self, mock_on_commit):
+        original = _create_image()
+
+        other = _create_image(colour="black")
+
+        self.assertNotEqual(other.file.name, original.file.name)
+        self.assertEqual(other.renditions.count(), 0)
+
+    def test_shared_file_is_kept_until_unused(self, mock_on_commit):
+        original = _create_image()
+        duplicate = _create_image()
+        storage = original.file.storage
+        name = original.file.name
+
+        original.delete()
+        self.assertTrue(storage.exists(name))
+
+        duplicate.delete()
+        self.assertFalse(storage.exists(name))
+
+    def test_replacing_shared_file_detaches_it(self, mock_on_commit):
+        original = _create_image()
+        duplicate = _create_image()
+        shared_name = original.file.name
+
+        _set_file(duplicate, colour="black")
+        duplicate.save()
+        # As Wagtail's admin does when a file is replaced
+        duplicate.file.storage.delete(shared_name)
+
+        original.refresh_from_db()
+        self.assertNotEqual(original.file.name, shared_name)
+        self.assertTrue(original.file.storage.exists(original.file.name))
+
+
+class SignalHandlerTests(TestCase):
+    def test_handlers_are_connected_when_ready(self):
+        # Rather than by wagtail_hooks, which the Celery worker never loads
+        self.assertIn(
+            generate_renditions_on_image_save, post_save._live_receivers(MozImage)
+        )
+        self.assertIn(
+            generate_renditions_on_publish, page_published._live_receivers(Article)
+        )
+        for model in (MozImage, Rendition):
+            with self.subTest(model=model):
+                receivers = post_delete._live_receivers(model)
+                self.assertIn(delete_unshared_file, receivers)
+                self.assertNotIn(post_delete_file_cleanup, receivers)
@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+from .models import MozImage, PrefetchedRenditions, Rendition
+
+
+def prefetch_renditions(images, filter_specs):
+    """Fetch the existing renditions matching `filter_specs` for all of the
+    given images in one query, so that MozImage.get_rendition() - and so the
+    {% image %} tag - can use them instead of running a query per image.
+
+    Renditions that don't exist yet will be queued for generation when they
+    are asked for, rather than generated during the request."""
+
+    images_by_pk = defaultdict(list)
+    for image in images:
+        if image is not None:
+            images_by_pk[image.pk].append(image)
+    if not images_by_pk:
+        return
+
+    renditions_by_image = defaultdict(list)
+    for rendition in Rendition.objects.filter(
+        image_id__in=images_by_pk, filter_spec__in=filter_specs
+    ):
+        renditions_by_image[rendition.image_id].append(rendition)
+
+    for pk, same_images in images_by_pk.items():
+        for image in same_images:
+            image._prefetched_renditions = PrefetchedRenditions(
+                renditions_by_image[pk], filter_specs=filter_specs
+            )
+
+
+def prefetch_card_renditions(pages, filter_specs, image_field="card_image"):
+    """Fetch the card images of a listing's pages, plus their renditions matching
+    `filter_specs`, in two queries in total. Pages without the image field
+    (eg a mixed listing) are skipped."""
+
+    pages = [page for page in pages if hasattr(page, f"{image_field}_id")]
+    image_ids = {getattr(page, f"{image_field}_id") for page in pages} - {None}
+    if not image_ids:
+        return
+
+    images = MozImage.objects.in_bulk(image_ids)
+    for page in pages:
+        image_id = getattr(page, f"{image_field}_id")
+        if image_id in images:
+            setattr(page, image_field, images[image_id])
+
+    prefetch_renditions(images.values(), filter_specs)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...models import PersonContribution
+
+
+class Command(BaseCommand):
+    help = "Rebuild the index of which live pages each Person authored or spoke at"
+
+    def handle(self, *args, **options):
+        count = PersonContribution.objects.rebuild()
+        self.stdout.write(f"Rebuilt {count} person contributions")
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0041_group_collection_permissions_verbose_name_plural'),
+        ('people', '0038_make_Person_country_optional'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonContribution',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('author', 'Author'), ('speaker', 'Speaker')], max_length=16)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='person_contributions', to='wagtailcore.Page')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contributions', to='people.Person')),
+            ],
+            options={
+                'unique_together': {('person', 'page', 'role')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+"""Fill the PersonContribution index from the pages already live, as the
+`rebuild_person_contributions` management command does"""
+
+from django.db import migrations
+
+from developerportal.apps.people.models import build_person_contributions
+
+
+def forwards(apps, schema_editor):
+    PersonContribution = apps.get_model("people", "PersonContribution")
+    PersonContribution.objects.bulk_create(
+        build_person_contributions(apps), batch_size=500
+    )
+
+
+def backwards(apps, schema_editor):
+    apps.get_model("people", "PersonContribution").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0043_index_article_date"),
+        ("events", "0032_index_event_start_date"),
+        ("externalcontent", "0033_externalcontentfolder"),
+        ("videos", "0014_index_video_date"),
+        ("people", "0039_personcontribution"),
+    ]
+
+    operations = [migrations.RunPython(forwards, backwards)]
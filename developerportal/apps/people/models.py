@@ -2,12 +2,15 @@ from itertools import chain
 from operator import attrgetter
 from typing import List
 
+from django.db import transaction
 from django.db.models import (
     CASCADE,
     SET_NULL,
     CharField,
     FileField,
     ForeignKey,
+    Manager,
+    Model,
     Q,
     TextField,
 )
@@ -34,15 +37,25 @@ from ..common.blocks import PersonalWebsiteBlock
 from ..common.constants import (
     LOCATION_QUERYSTRING_KEY,
     DESCRIPTION_MAX_LENGTH,
+    PAGINATION_AFTER_QUERYSTRING_KEY,
+    PAGINATION_BEFORE_QUERYSTRING_KEY,
     PAGINATION_QUERYSTRING_KEY,
+    PERSON_CARD_IMAGE_FILTER_SPEC,
     RICH_TEXT_FEATURES_SIMPLE,
     ROLE_CHOICES,
     ROLE_QUERYSTRING_KEY,
     TOPIC_QUERYSTRING_KEY,
 )
+from ..common.identity_map import get_related_instance, memoize
 from ..common.models import BasePage
-from ..common.utils import get_past_event_cutoff, paginate_resources
+from ..common.utils import (
+    get_past_event_cutoff,
+    paginate_resources,
+    paginate_resources_by_cursor,
+    use_cursor_pagination,
+)
 from ..common.validators import check_for_svg_file
+from ..mozimages.utils import prefetch_card_renditions
 from .edit_handlers import CustomLabelFieldPanel
 
 
@@ -148,6 +161,7 @@ class People(BasePage):
         context = super().get_context(request)
         context["filters"] = self.get_filters()
         context["people"] = self.get_people(request)
+        prefetch_card_renditions(context["people"], [PERSON_CARD_IMAGE_FILTER_SPEC])
         return context
 
     def get_people(self, request):
@@ -170,6 +184,15 @@ class People(BasePage):
 
         people = Person.published_objects.filter(combined_q).order_by("title")
 
+        if use_cursor_pagination(request):
+            return paginate_resources_by_cursor(
+                people,
+                per_page=self.RESOURCES_PER_PAGE,
+                order_by="title",
+                after=request.GET.get(PAGINATION_AFTER_QUERYSTRING_KEY),
+                before=request.GET.get(PAGINATION_BEFORE_QUERYSTRING_KEY),
+            )
+
         people = paginate_resources(
             people,
             page_ref=request.GET.get(PAGINATION_QUERYSTRING_KEY),
@@ -372,18 +395,10 @@ class Person(BasePage):
         """
         from ..events.models import Event
 
-        upcoming_events = Event.published_objects.filter(
-            start_date__gte=get_past_event_cutoff()
-        )
-
-        speaker_events = Event.published_objects.none()
-
-        for event in upcoming_events.all():
-            # add the event to the list if the current person is a speaker
-            if event.has_speaker(self):
-                speaker_events = speaker_events | Event.published_objects.page(event)
-
-        return speaker_events.order_by("start_date")
+        return Event.published_objects.filter(
+            pk__in=self._get_contribution_page_ids(PersonContribution.SPEAKER),
+            start_date__gte=get_past_event_cutoff(),
+        ).order_by("start_date")
 
     @property
     def articles(self):
@@ -394,21 +409,9 @@ class Person(BasePage):
         from ..articles.models import Article
         from ..externalcontent.models import ExternalArticle
 
-        articles = Article.published_objects.none()
-        external_articles = ExternalArticle.published_objects.none()
-
-        all_articles = Article.published_objects.all()
-        all_external_articles = ExternalArticle.published_objects.all()
-
-        for article in all_articles:
-            if article.has_author(self):
-                articles = articles | Article.published_objects.page(article)
-
-        for external_article in all_external_articles:
-            if external_article.has_author(self):
-                external_articles = external_articles | (
-                    ExternalArticle.published_objects.page(external_article)
-                )
+        page_ids = self._get_contribution_page_ids(PersonContribution.AUTHOR)
+        articles = Article.published_objects.filter(pk__in=page_ids)
+        external_articles = ExternalArticle.published_objects.filter(pk__in=page_ids)
 
         return sorted(
             chain(articles, external_articles), key=attrgetter("date"), reverse=True
@@ -423,26 +426,17 @@ class Person(BasePage):
         from ..videos.models import Video
         from ..externalcontent.models import ExternalVideo
 
-        videos = Video.published_objects.none()
-        external_videos = ExternalVideo.published_objects.none()
-
-        all_videos = Video.published_objects.all()
-        all_external_videos = ExternalVideo.published_objects.all()
-
-        for video in all_videos:
-            if video.has_speaker(self):
-                videos = videos | Video.published_objects.page(video)
-
-        for external_video in all_external_videos:
-            if external_video.has_speaker(self):
-                external_videos = external_videos | (
-                    ExternalVideo.published_objects.page(external_video)
-                )
+        page_ids = self._get_contribution_page_ids(PersonContribution.SPEAKER)
+        videos = Video.published_objects.filter(pk__in=page_ids)
+        external_videos = ExternalVideo.published_objects.filter(pk__in=page_ids)
 
         return sorted(
             chain(videos, external_videos), key=attrgetter("date"), reverse=True
         )
 
+    def _get_contribution_page_ids(self, role):
+        return self.contributions.filter(role=role).values("page_id")
+
     @property
     def role_group(self):
         return {"slug": self.role, "title": dict(ROLE_CHOICES).get(self.role, "")}
@@ -461,5 +455,129 @@ class Person(BasePage):
         # Note that we do this in Python because django-modelcluster won't support
         # `filter(topic__live=True)` when _previewing_ pages (even tho it'll work
         # on saved ones)
-        topics = [pt.topic for pt in self.topics.all()]
-        return [t for t in topics if t.live]
+        def get_live_topics():
+            topics = [get_related_instance(pt, "topic") for pt in self.topics.all()]
+            return [t for t in topics if t.live]
+
+        return memoize(("topics", self.pk), get_live_topics)
+
+
+class PersonContributionManager(Manager):
+
+    # Maps each model with Person authors/speakers to its StreamField and the
+    # name of the PageChooserBlock inside it that points at a Person
+    SOURCES = {
+        "articles.Article": ("authors", "author"),
+        "externalcontent.ExternalArticle": ("authors", "author"),
+        "videos.Video": ("speakers", "speaker"),
+        "externalcontent.ExternalVideo": ("speakers", "speaker"),
+        "events.Event": ("speakers", "speaker"),
+    }
+
+    def update_for_page(self, page):
+        """Replace the contributions recorded for a page with the people currently
+        named in it, or remove them if the page is no longer live."""
+
+        page = page.specific
+        source = self.SOURCES.get(page._meta.label)
+        if not source:
+            return
+
+        role = PersonContribution.ROLE_FOR_BLOCK[source[1]]
+        with transaction.atomic():
+            self.filter(page_id=page.pk).delete()
+            if not page.live:
+                return
+
+            # Blocks can still refer to people who have since been deleted
+            person_ids = Person.objects.filter(
+                pk__in=self.get_person_ids(page)
+            ).values_list("pk", flat=True)
+            self.bulk_create(
+                self.model(person_id=person_id, page_id=page.pk, role=role)
+                for person_id in person_ids
+            )
+
+    def get_person_ids(self, page):
+        """Return the ids of the people currently named in a specific page,
+        whether or not it's live, without checking they still exist"""
+        source = self.SOURCES.get(page._meta.label)
+        if not source:
+            return []
+        field_name, block_name = source
+        return _get_person_ids(getattr(page, field_name), block_name)
+
+    @transaction.atomic
+    def rebuild(self):
+        """Replace every contribution with fresh ones read from the live pages.
+
+        Returns the number of contributions created."""
+        from django.apps import apps
+
+        self.all().delete()
+        contributions = build_person_contributions(apps)
+        self.bulk_create(contributions, batch_size=500)
+        return len(contributions)
+
+
+class PersonContribution(Model):
+    """Reverse index of the live pages that name a Person as an author or a
+    speaker, so that Person.articles, .videos and .events can be answered with
+    indexed lookups rather than by inspecting every page's StreamField.
+
+    Kept up to date by the signal handlers in people/wagtail_hooks.py and
+    regenerated by the `rebuild_person_contributions` management command."""
+
+    AUTHOR = "author"
+    SPEAKER = "speaker"
+    ROLE_CHOICES = ((AUTHOR, "Author"), (SPEAKER, "Speaker"))
+    ROLE_FOR_BLOCK = {"author": AUTHOR, "speaker": SPEAKER}
+
+    person = ForeignKey("Person", on_delete=CASCADE, related_name="contributions")
+    page = ForeignKey(
+        "wagtailcore.Page", on_delete=CASCADE, related_name="person_contributions"
+    )
+    role = CharField(max_length=16, choices=ROLE_CHOICES)
+
+    objects = PersonContributionManager()
+
+    class Meta:
+        unique_together = ("person", "page", "role")
+
+    def __str__(self):
+        return f"{self.person_id} {self.role} of {self.page_id}"
+
+
+def build_person_contributions(apps):
+    """Return unsaved PersonContributions for every live page naming a Person,
+    using the models in `apps`. This is also used by a data migration, so it
+    sticks to fields, rather than the methods of the current models."""
+    contribution_model = apps.get_model("people", "PersonContribution")
+    existing_person_ids = set(
+        apps.get_model("people", "Person").objects.values_list("pk", flat=True)
+    )
+    contributions = []
+    for model, (field_name, block_name) in PersonContributionManager.SOURCES.items():
+        role = PersonContribution.ROLE_FOR_BLOCK[block_name]
+        pages = apps.get_model(model).objects.filter(live=True).only("pk", field_name)
+        for page in pages.iterator(chunk_size=500):
+            person_ids = _get_person_ids(getattr(page, field_name), block_name)
+            contributions.extend(
+                contribution_model(person_id=person_id, page_id=page.pk, role=role)
+                for person_id in person_ids
+                if person_id in existing_person_ids
+            )
+    return contributions
+
+
+def _get_person_ids(stream_value, block_name):
+    """Return the unique Person ids chosen in `block_name` blocks in a StreamField,
+    using its raw JSON-ish data so that the Person pages aren't fetched"""
+    if not stream_value:
+        return []
+    person_ids = []
+    for item in stream_value.get_prep_value():
+        if item["type"] == block_name and item["value"]:
+            if item["value"] not in person_ids:
+                person_ids.append(item["value"])
+    return person_ids
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save
+
+from wagtail.core.signals import page_unpublished
+
+from .models import PersonContribution
+
+
+def update_person_contributions(sender, instance, **kwargs):
+    PersonContribution.objects.update_for_page(instance)
+
+
+def update_person_contributions_on_save(sender, instance, update_fields=None, **kwargs):
+    # Publishing does a full save of the page, so this covers page_published too.
+    # Wagtail saves draft revisions with `update_fields` set, when the in-memory
+    # page holds unpublished content, so only full saves reflect the live page.
+    if update_fields is None and instance.live:
+        update_person_contributions(sender, instance, **kwargs)
+
+
+def register_signal_handlers():
+    """Connect the handlers above. This is done by PeopleConfig.ready(), so that
+    pages published and expired on a schedule by the Celery worker, which never
+    loads the wagtail_hooks modules, update their contributions too."""
+    page_unpublished.connect(update_person_contributions)
+    for model in PersonContribution.objects.SOURCES:
+        post_save.connect(update_person_contributions_on_save, sender=model)
@@ -1,13 +1,26 @@
+import json
+from datetime import timedelta
+from io import StringIO
 from unittest import mock
 
+from django.core.management import call_command
 from django.db.models import Q
-from django.test import RequestFactory
+from django.db.models.signals import post_save
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from wagtail.core.signals import page_unpublished
 
 from developerportal.apps.common.test_helpers import PatchedWagtailPageTests
 
+from ...articles.models import Article
 from ...content.models import ContentPage
 from ...home.models import HomePage
-from ..models import People, Person
+from ..models import People, Person, PersonContribution
+from ..signal_handlers import (
+    update_person_contributions,
+    update_person_contributions_on_save,
+)
 
 
 class PersonTests(PatchedWagtailPageTests):
@@ -167,3 +180,89 @@ class PeopleTests(PatchedWagtailPageTests):
         ]
 
         self.assertEqual(output, expected)
+
+
+class PersonContributionTests(TestCase):
+
+    fixtures = ["common.json"]
+
+    def setUp(self):
+        self.person = Person.objects.first()
+        self.article = Article.objects.live().first()
+
+    def _set_authors(self, page, person_ids):
+        page.authors = json.dumps(
+            [{"type": "author", "value": person_id} for person_id in person_ids]
+        )
+
+    def test_saving_live_page_records_authors(self):
+        self._set_authors(self.article, [self.person.pk, self.person.pk])
+        self.article.save()
+
+        contribution = PersonContribution.objects.get()
+        self.assertEqual(contribution.person, self.person)
+        self.assertEqual(contribution.page_id, self.article.pk)
+        self.assertEqual(contribution.role, PersonContribution.AUTHOR)
+        self.assertEqual(self.person.articles, [self.article])
+        self.assertEqual(self.person.videos, [])
+
+    def test_saving_draft_revision_does_not_record_authors(self):
+        self._set_authors(self.article, [self.person.pk])
+        self.article.save_revision()
+
+        self.assertFalse(PersonContribution.objects.exists())
+        self.assertEqual(self.person.articles, [])
+
+    def test_update_for_page__unpublished_page(self):
+        self._set_authors(self.article, [self.person.pk])
+        self.article.save()
+        self.assertTrue(PersonContribution.objects.exists())
+
+        self.article.live = False
+        self.article.save()
+        PersonContribution.objects.update_for_page(self.article)
+        self.assertFalse(PersonContribution.objects.exists())
+
+    def test_update_for_page__missing_person(self):
+        self._set_authors(self.article, [self.person.pk, 99999])
+        self.article.save()
+
+        self.assertEqual(
+            list(PersonContribution.objects.values_list("person_id", flat=True)),
+            [self.person.pk],
+        )
+
+    def test_scheduled_publishing_updates_contributions(self):
+        # The Celery worker runs publish_scheduled_pages, and never loads the
+        # wagtail_hooks modules, so the handlers have to be connected when ready
+        self.assertIn(
+            update_person_contributions_on_save, post_save._live_receivers(Article)
+        )
+        self.assertIn(
+            update_person_contributions, page_unpublished._live_receivers(Article)
+        )
+
+        self.article.unpublish()
+        self._set_authors(self.article, [self.person.pk])
+        self.article.save_revision(
+            approved_go_live_at=timezone.now() - timedelta(minutes=1)
+        )
+        call_command("publish_scheduled_pages", stdout=StringIO())
+        self.assertEqual(self.person.articles, [self.article])
+
+        self.article.refresh_from_db()
+        self.article.expire_at = timezone.now() - timedelta(minutes=1)
+        self.article.save(update_fields=["expire_at"])
+        call_command("publish_scheduled_pages", stdout=StringIO())
+        self.assertFalse(PersonContribution.objects.exists())
+
+    def test_rebuild(self):
+        self._set_authors(self.article, [self.person.pk])
+        self.article.save()
+        PersonContribution.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_person_contributions", stdout=out)
+
+        self.assertEqual(out.getvalue(), "Rebuilt 1 person contributions\n")
+        self.assertEqual(self.person.articles, [self.article])
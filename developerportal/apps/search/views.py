@@ -3,12 +3,17 @@ from django.shortcuts import render
 from wagtail.core.models import Page
 
 from ..common.constants import PAGINATION_QUERYSTRING_KEY, SEARCH_QUERYSTRING_KEY
-from ..common.utils import paginate_resources, prep_search_terms
+from ..common.utils import (
+    paginate_resources,
+    prep_search_terms,
+    with_cache_control_policy,
+)
 from ..search.utils import get_page_ids_to_omit_from_site_search
 
 SEARCH_RESULTS_PAGE_SIZE = 15
 
 
+@with_cache_control_policy("search")
 def site_search(request, template_name="site-search.html"):
     "Whole-site search view"
     search_query = request.GET.get(SEARCH_QUERYSTRING_KEY, None)
@@ -27,17 +27,27 @@ app.conf.beat_schedule = {
         "schedule": crontab(minute=15, hour=0),  # 15 past midnight
         "args": (),
     },
+    # Invalidations are normally flushed once their window has passed, so this
+    # just catches any left behind if that didn't work
+    "flush-cdn-invalidation-queue-every-ten-minutes": {
+        "task": "developerportal.apps.taskqueue.tasks.flush_cdn_invalidation_queue",
+        "schedule": crontab(minute="*/10"),
+        "args": (),
+    },
     # We're registering these tasks on behalf of `developerportal.apps.ingestion`
     # because we only want to run one celerybeat scheduler (for now) to keep things
     # simpler at the ops level.
-    "ingest-articles-every-two-hours": {
+    # Each run only syncs the sources that are due, according to their own
+    # schedules, so these just need to run more often than the shortest
+    # settings.INGESTION_MIN_SYNC_INTERVAL
+    "ingest-due-articles-every-five-minutes": {
         "task": "developerportal.apps.ingestion.tasks.ingest_articles",
-        "schedule": crontab(minute=17, hour="*/2"),  # Every two hours, at 17 min past
+        "schedule": crontab(minute="1-59/5"),  # Every five minutes, from 1 min past
         "args": (),
     },
-    "ingest-videos-every-two-hours": {
+    "ingest-due-videos-every-five-minutes": {
         "task": "developerportal.apps.ingestion.tasks.ingest_videos",
-        "schedule": crontab(minute=37, hour="*/2"),  # Every two hours, at 37 min past
+        "schedule": crontab(minute="3-59/5"),  # Every five minutes, from 3 min past
         "args": (),
     },
     "rebuild-search-index-weekly": {
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvalidationBatch',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sent_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('queued_paths', models.PositiveIntegerField(help_text='Distinct paths taken from the queue')),
+                ('paths', models.TextField(help_text='The paths sent, one per line')),
+                ('path_count', models.PositiveIntegerField(help_text='Paths sent, after merging them into wildcards')),
+                ('queue_wait', models.FloatField(help_text='Seconds the oldest path spent in the queue')),
+                ('request_duration', models.FloatField(blank=True, help_text='Seconds', null=True)),
+                ('invalidation_id', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'ordering': ['-sent_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='QueuedInvalidation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('queued_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
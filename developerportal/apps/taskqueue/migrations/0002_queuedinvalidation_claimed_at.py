@@ -0,0 +1,18 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskqueue', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedinvalidation',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a flush took it to send', null=True),
+        ),
+    ]
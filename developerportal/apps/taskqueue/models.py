@@ -1 +1,39 @@
-# empty models.py to allow Django to accept the `taskqueue` app
+from django.db import models
+from django.utils.timezone import now as tz_now
+
+
+class QueuedInvalidation(models.Model):
+    """A CDN path waiting to be invalidated in the next batch"""
+
+    path = models.CharField(max_length=255, unique=True)
+    queued_at = models.DateTimeField(default=tz_now)
+    claimed_at = models.DateTimeField(
+        null=True, blank=True, help_text="When a flush took it to send"
+    )
+
+    def __str__(self):
+        return self.path
+
+
+class InvalidationBatch(models.Model):
+    """A record of one CDN invalidation sent from the queue"""
+
+    sent_at = models.DateTimeField(default=tz_now, db_index=True)
+    queued_paths = models.PositiveIntegerField(
+        help_text="Distinct paths taken from the queue"
+    )
+    paths = models.TextField(help_text="The paths sent, one per line")
+    path_count = models.PositiveIntegerField(
+        help_text="Paths sent, after merging them into wildcards"
+    )
+    queue_wait = models.FloatField(
+        help_text="Seconds the oldest path spent in the queue"
+    )
+    request_duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    invalidation_id = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ["-sent_at"]
+
+    def __str__(self):
+        return "{} paths at {}".format(self.path_count, self.sent_at.isoformat())
@@ -1,18 +1,26 @@
+import datetime
 import logging
 import os
 
+from django.core.cache import cache
 from django.core.management import call_command
 
 from developerportal.apps.taskqueue.celery import app
 
-from ..events.models import Events
-from ..people.models import People
-from ..topics.models import Topics
-from .utils import invalidate_cdn
+from ..common.utils import get_past_event_cutoff
+from .utils import (
+    get_expired_event_invalidation_targets,
+    invalidate_cdn,
+    queue_invalidation,
+    send_queued_invalidations,
+)
 
 logging.basicConfig(level=os.environ.get("LOGLEVEL", logging.INFO))
 logger = logging.getLogger(__name__)
 
+# The get_past_event_cutoff() when selectively_invalidate_cdn last ran
+PAST_EVENT_CUTOFF_CACHE_KEY = "cdn-invalidation-past-event-cutoff"
+
 
 @app.task
 def update_wagtail_search_index():
@@ -36,36 +44,42 @@ def invalidate_entire_cdn():
     invalidate_cdn()
 
 
+@app.task
+def flush_cdn_invalidation_queue():
+    log_prefix = "[Flush CDN invalidation queue]"
+    batch = send_queued_invalidations()
+    if batch is None:
+        logger.info(f"{log_prefix} Nothing to invalidate")
+    else:
+        logger.info(
+            f"{log_prefix} Sent {batch.path_count} paths for "
+            f"{batch.queued_paths} queued, after {batch.queue_wait:.1f}s"
+        )
+
+
 @app.task
 def selectively_invalidate_cdn():
-    """Purge certain pages which have content isn't suitable for long-term
-    cacheing by the CDN.
+    """Purge the pages showing events which have become past events since the
+    last run, as what counts as 'future' or 'past' depends on when the page is
+    viewed, so a stale page in the CDN would be significantly out of date.
 
     Scheduled to run once a day, after midnight (UTC)
-
-    A good example of this is the Events page, which shows future and past
-    events, and what counts as 'future' or 'past' depends on when the page
-    is viewed, so a stale page in the CDN would be significantly out of date.
     """
 
     log_prefix = "[Selectively invalidate CDN]"
 
-    events_root_path = Events.objects.first().url
-    people_root_path = People.objects.first().url
-    topics_root_path = Topics.objects.first().url
-
-    selected_targets = [
-        # Start with the main Events page
-        f"{events_root_path}*",
-        # TODO: in the future, it would be good to make these very specific,
-        # by hitting the DB to work out which People and Topic pages reference
-        # Events which have just gone past
-        f"{people_root_path}*",
-        f"{topics_root_path}*",
-    ]
-
-    logger.info(
-        f"{log_prefix} Issuing purge command for "
-        f"selected CDN keys: {selected_targets}"
-    )
-    invalidate_cdn(invalidation_targets=selected_targets)
+    cutoff = get_past_event_cutoff()
+    last_cutoff = cache.get(PAST_EVENT_CUTOFF_CACHE_KEY)
+    if last_cutoff is None:
+        last_cutoff = cutoff - datetime.timedelta(days=1)
+
+    selected_targets = get_expired_event_invalidation_targets(last_cutoff, cutoff)
+    if selected_targets:
+        logger.info(
+            f"{log_prefix} Queueing purge command for "
+            f"selected CDN keys: {selected_targets}"
+        )
+        queue_invalidation(selected_targets)
+    else:
+        logger.info(f"{log_prefix} No events have become past events")
+    cache.set(PAST_EVENT_CUTOFF_CACHE_KEY, cutoff, timeout=None)
@@ -1,8 +1,13 @@
+import datetime
 from unittest import mock
 
+from django.core.cache import cache
 from django.test import TestCase
 
+from ..models import InvalidationBatch
 from ..tasks import (
+    PAST_EVENT_CUTOFF_CACHE_KEY,
+    flush_cdn_invalidation_queue,
     invalidate_entire_cdn,
     selectively_invalidate_cdn,
     update_wagtail_search_index,
@@ -19,14 +24,72 @@ class TasksTestCase(TestCase):
         invalidate_entire_cdn()
         mock_invalidate_cdn.assert_called_once_with()
 
-    @mock.patch("developerportal.apps.taskqueue.tasks.invalidate_cdn")
-    def test_selectively_invalidate_cdn(self, mock_invalidate_cdn):
+    @mock.patch("developerportal.apps.taskqueue.tasks.send_queued_invalidations")
+    def test_flush_cdn_invalidation_queue(self, mock_send_queued_invalidations):
+        mock_send_queued_invalidations.return_value = None
+        with self.assertLogs("developerportal.apps.taskqueue.tasks") as cm:
+            flush_cdn_invalidation_queue()
+        self.assertEqual(
+            cm.output,
+            [
+                "INFO:developerportal.apps.taskqueue.tasks:"
+                "[Flush CDN invalidation queue] Nothing to invalidate"
+            ],
+        )
 
-        assert not mock_invalidate_cdn.called
+        mock_send_queued_invalidations.return_value = InvalidationBatch(
+            queued_paths=12, paths="/posts/*\n/sitemap.xml", path_count=2, queue_wait=61
+        )
+        with self.assertLogs("developerportal.apps.taskqueue.tasks") as cm:
+            flush_cdn_invalidation_queue()
+        self.assertEqual(
+            cm.output,
+            [
+                "INFO:developerportal.apps.taskqueue.tasks:"
+                "[Flush CDN invalidation queue] Sent 2 paths for 12 queued, "
+                "after 61.0s"
+            ],
+        )
+
+    @mock.patch("developerportal.apps.taskqueue.tasks.queue_invalidation")
+    @mock.patch(
+        "developerportal.apps.taskqueue.tasks.get_expired_event_invalidation_targets"
+    )
+    @mock.patch("developerportal.apps.taskqueue.tasks.get_past_event_cutoff")
+    def test_selectively_invalidate_cdn(
+        self,
+        mock_get_past_event_cutoff,
+        mock_get_expired_event_invalidation_targets,
+        mock_queue_invalidation,
+    ):
+        cache.delete(PAST_EVENT_CUTOFF_CACHE_KEY)
+        self.addCleanup(cache.delete, PAST_EVENT_CUTOFF_CACHE_KEY)
+        mock_get_expired_event_invalidation_targets.return_value = [
+            "/events/",
+            "/events/?*",
+            "/events/foo/*",
+        ]
+
+        # The first run looks back a day
+        mock_get_past_event_cutoff.return_value = datetime.date(2020, 3, 5)
+        selectively_invalidate_cdn()
+        mock_get_expired_event_invalidation_targets.assert_called_once_with(
+            datetime.date(2020, 3, 4), datetime.date(2020, 3, 5)
+        )
+        mock_queue_invalidation.assert_called_once_with(
+            ["/events/", "/events/?*", "/events/foo/*"]
+        )
+
+        # Later ones look back to the previous run
+        mock_get_expired_event_invalidation_targets.reset_mock()
+        mock_queue_invalidation.reset_mock()
+        mock_get_expired_event_invalidation_targets.return_value = []
+        mock_get_past_event_cutoff.return_value = datetime.date(2020, 3, 8)
         selectively_invalidate_cdn()
-        mock_invalidate_cdn.assert_called_once_with(
-            invalidation_targets=["/events/*", "/communities/people/*", "/topics/*"]
+        mock_get_expired_event_invalidation_targets.assert_called_once_with(
+            datetime.date(2020, 3, 5), datetime.date(2020, 3, 8)
         )
+        mock_queue_invalidation.assert_not_called()
 
     @mock.patch("developerportal.apps.taskqueue.tasks.call_command")
     def test_update_wagtail_search_index(self, mock_call_command):
@@ -50,6 +113,7 @@ class ConfigurationTestCase(TestCase):
                 [
                     "developerportal.apps.taskqueue.tasks.publish_scheduled_pages",
                     "developerportal.apps.taskqueue.tasks.selectively_invalidate_cdn",
+                    "developerportal.apps.taskqueue.tasks.flush_cdn_invalidation_queue",
                     "developerportal.apps.ingestion.tasks.ingest_articles",
                     "developerportal.apps.ingestion.tasks.ingest_videos",
                     "developerportal.apps.taskqueue.tasks.update_wagtail_search_index",
@@ -1,9 +1,34 @@
 import datetime
+import json
 from unittest import mock
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings
+from django.utils.timezone import now as tz_now
 
-from developerportal.apps.taskqueue.utils import invalidate_cdn
+from wagtail.core.models import Page
+
+from developerportal.apps.articles.models import Article
+from developerportal.apps.events.models import (
+    Event,
+    Events,
+    EventTopic,
+    get_default_events_window_end,
+)
+from developerportal.apps.home.models import HomePage
+from developerportal.apps.people.models import Person
+from developerportal.apps.taskqueue.models import InvalidationBatch, QueuedInvalidation
+from developerportal.apps.taskqueue.utils import (
+    FLUSH_SCHEDULED_CACHE_KEY,
+    CDNInvalidationError,
+    collapse_invalidation_targets,
+    get_expired_event_invalidation_targets,
+    get_invalidation_targets,
+    invalidate_cdn,
+    queue_invalidation,
+    send_queued_invalidations,
+)
+from developerportal.apps.topics.models import Topic, TopicPerson
 
 
 @override_settings(AWS_CLOUDFRONT_DISTRIBUTION_ID="testdistribution")
@@ -136,7 +161,8 @@ class CDNInvalidationTests(TestCase):
         with self.assertLogs(
             "developerportal.apps.taskqueue.utils", level="DEBUG"
         ) as cm:
-            invalidate_cdn()
+            with self.assertRaises(CDNInvalidationError):
+                invalidate_cdn()
 
         self.assertEqual(
             cm.output,
@@ -151,3 +177,370 @@ class CDNInvalidationTests(TestCase):
                 ).format(_mock_response_content),
             ],
         )
+
+    @mock.patch("developerportal.apps.taskqueue.utils.boto3.client")
+    def test_invalidate_cdn__given_client(self, mock_boto3_client):
+        stub_client = mock.Mock(name="stub_cloudfront_client")
+        stub_client.create_invalidation.return_value = {
+            "ResponseMetadata": {"HTTPStatusCode": 201},
+            "Invalidation": {"Status": "InProgress"},
+        }
+
+        invalidate_cdn(invalidation_targets=["/foo/*", "/bar/"], client=stub_client)
+
+        mock_boto3_client.assert_not_called()
+        batch = stub_client.create_invalidation.call_args[1]["InvalidationBatch"]
+        self.assertEqual(batch["Paths"], {"Items": ["/foo/*", "/bar/"], "Quantity": 2})
+
+
+class InvalidationTargetsTests(TestCase):
+
+    fixtures = ["common.json"]
+
+    ARTICLE_PATH = "/posts/faster-smarter-javascript-debugging-in-firefox/"
+
+    def test_article(self):
+        article = Article.objects.get(pk=8)
+        self.assertEqual(
+            get_invalidation_targets(article),
+            [
+                f"{self.ARTICLE_PATH}*",
+                "/posts/",
+                "/posts/?*",
+                "/topics/css/",
+                "/topics/css/?*",
+                "/topics/javascript/",
+                "/topics/javascript/?*",
+                "/posts-feed/",
+                "/sitemap.xml",
+            ],
+        )
+
+    def test_article__featured_on_home_page(self):
+        home_page = HomePage.objects.get()
+        home_page.featured = json.dumps([{"type": "post", "value": 8}])
+        home_page.save()
+
+        targets = get_invalidation_targets(Article.objects.get(pk=8))
+        self.assertIn("/", targets)
+        self.assertIn("/?*", targets)
+        self.assertNotIn("/*", targets)
+
+        # Other articles don't need the home page invalidating
+        self.assertNotIn("/", get_invalidation_targets(Article.objects.get(pk=12)))
+
+    def test_article__with_author(self):
+        article = Article.objects.get(pk=8)
+        article.authors = json.dumps([{"type": "author", "value": 11}])
+        article.save()
+
+        targets = get_invalidation_targets(article)
+        self.assertIn("/communities/people/josh-marinacci/", targets)
+        self.assertIn("/communities/people/josh-marinacci/?*", targets)
+
+    def test_person(self):
+        person = Person.objects.get(pk=11)
+        self.assertEqual(
+            get_invalidation_targets(person),
+            [
+                "/communities/people/josh-marinacci/*",
+                "/communities/people/",
+                "/communities/people/?*",
+                "/sitemap.xml",
+            ],
+        )
+
+        # Topic pages list the people they're about
+        TopicPerson.objects.create(topic=Topic.objects.get(pk=7), person=person)
+        targets = get_invalidation_targets(person)
+        self.assertIn("/topics/javascript/", targets)
+        self.assertNotIn("/topics/css/", targets)
+
+    def test_topic_not_in_menus(self):
+        topic = Topic.objects.get(pk=7)
+        topic.show_in_menus = False
+        topic.save()
+
+        targets = get_invalidation_targets(topic)
+        self.assertEqual(
+            targets[:3], ["/topics/javascript/*", "/topics/", "/topics/?*"]
+        )
+        # Every article tagged with the topic shows it
+        for path in (
+            self.ARTICLE_PATH,
+            "/posts/es6-depth-iterators-and-loop/",
+            "/posts/es6-depth-destructuring/",
+        ):
+            self.assertIn(path, targets)
+        self.assertNotIn("/posts/firefox-66-sound-silence/", targets)
+        self.assertNotIn("/posts-feed/", targets)
+
+    def test_pages_shown_site_wide(self):
+        for pk in (3, 4, 5, 6, 9, 33, 35):
+            with self.subTest(pk=pk):
+                page = Page.objects.get(pk=pk)
+                self.assertEqual(get_invalidation_targets(page), ["/*"])
+
+
+class ExpiredEventInvalidationTargetsTests(TestCase):
+
+    fixtures = ["common.json"]
+
+    LAST_CUTOFF = datetime.date(2020, 3, 4)
+    CUTOFF = datetime.date(2020, 3, 5)
+
+    def _add_event(self, slug, start_date, **kwargs):
+        event = Event(title=slug, slug=slug, start_date=start_date, **kwargs)
+        Events.objects.get().add_child(instance=event)
+        return event
+
+    def test_events_becoming_past_events(self):
+        self._add_event("old", datetime.date(2020, 3, 1))
+        self._add_event("upcoming", datetime.date(2020, 3, 20))
+        event = self._add_event(
+            "yesterday",
+            datetime.date(2020, 3, 4),
+            speakers=json.dumps([{"type": "speaker", "value": 11}]),
+        )
+        EventTopic.objects.create(event=event, topic=Topic.objects.get(pk=7))
+
+        targets = get_expired_event_invalidation_targets(self.LAST_CUTOFF, self.CUTOFF)
+
+        self.assertEqual(targets[:3], ["/events/", "/events/?*", "/events/yesterday/*"])
+        self.assertCountEqual(
+            targets[3:],
+            [
+                "/communities/people/josh-marinacci/",
+                "/communities/people/josh-marinacci/?*",
+                "/topics/javascript/",
+                "/topics/javascript/?*",
+            ],
+        )
+
+    def test_events_featured_on_topic(self):
+        event = self._add_event("yesterday", datetime.date(2020, 3, 4))
+        topic = Topic.objects.get(pk=6)
+        topic.relevant_events = json.dumps([{"type": "event", "value": event.pk}])
+        topic.save()
+
+        targets = get_expired_event_invalidation_targets(self.LAST_CUTOFF, self.CUTOFF)
+
+        self.assertIn("/topics/css/", targets)
+        self.assertNotIn("/topics/javascript/", targets)
+
+    def test_events_entering_default_window(self):
+        self._add_event("later", get_default_events_window_end(self.CUTOFF))
+        self.assertEqual(
+            get_expired_event_invalidation_targets(self.LAST_CUTOFF, self.CUTOFF),
+            ["/events/", "/events/?*"],
+        )
+
+    def test_no_changes(self):
+        self._add_event("old", datetime.date(2020, 3, 1))
+        self._add_event("upcoming", datetime.date(2020, 3, 20))
+        self.assertEqual(
+            get_expired_event_invalidation_targets(self.LAST_CUTOFF, self.CUTOFF), []
+        )
+
+
+@override_settings(
+    AWS_CLOUDFRONT_DISTRIBUTION_ID="testdistribution",
+    CDN_INVALIDATION_WINDOW=60,
+    CDN_INVALIDATION_MAX_PATHS=5,
+)
+class InvalidationQueueTests(TestCase):
+    def setUp(self):
+        cache.delete(FLUSH_SCHEDULED_CACHE_KEY)
+        self.stub_client = mock.Mock(name="stub_cloudfront_client")
+        self.stub_client.create_invalidation.return_value = {
+            "ResponseMetadata": {"HTTPStatusCode": 201},
+            "Invalidation": {"Id": "INVALIDATION_ID", "Status": "InProgress"},
+        }
+
+    def tearDown(self):
+        cache.delete(FLUSH_SCHEDULED_CACHE_KEY)
+
+    @mock.patch(
+        "developerportal.apps.taskqueue.tasks.flush_cdn_invalidation_queue.apply_async"
+    )
+    def test_queue_invalidation(self, mock_apply_async):
+        queue_invalidation(["/posts/foo/*", "/posts/", "/sitemap.xml"])
+        queue_invalidation(["/posts/bar/*", "/posts/", "/sitemap.xml"])
+
+        self.assertEqual(
+            sorted(QueuedInvalidation.objects.values_list("path", flat=True)),
+            ["/posts/", "/posts/bar/*", "/posts/foo/*", "/sitemap.xml"],
+        )
+        # Only the first one in the window schedules a flush
+        mock_apply_async.assert_called_once_with(countdown=60)
+
+    def test_send_queued_invalidations(self):
+        for path in ("/posts/foo/*", "/posts/", "/posts/?*", "/sitemap.xml"):
+            QueuedInvalidation.objects.create(path=path)
+
+        batch = send_queued_invalidations(client=self.stub_client)
+
+        invalidation_batch = self.stub_client.create_invalidation.call_args[1][
+            "InvalidationBatch"
+        ]
+        self.assertEqual(
+            invalidation_batch["Paths"],
+            {
+                "Items": ["/posts/", "/posts/?*", "/posts/foo/*", "/sitemap.xml"],
+                "Quantity": 4,
+            },
+        )
+        self.assertEqual(batch, InvalidationBatch.objects.get())
+        self.assertEqual(batch.queued_paths, 4)
+        self.assertEqual(batch.path_count, 4)
+        self.assertEqual(batch.invalidation_id, "INVALIDATION_ID")
+        self.assertIsNotNone(batch.request_duration)
+        self.assertGreaterEqual(batch.queue_wait, 0)
+        self.assertFalse(QueuedInvalidation.objects.exists())
+
+        # Nothing is sent when there's nothing queued
+        self.stub_client.create_invalidation.reset_mock()
+        self.assertIsNone(send_queued_invalidations(client=self.stub_client))
+        self.stub_client.create_invalidation.assert_not_called()
+
+    def test_send_queued_invalidations__merges_many_paths(self):
+        for path in (
+            "/posts/foo/*",
+            "/posts/bar/*",
+            "/posts/baz/*",
+            "/posts/",
+            "/posts/?*",
+            "/topics/css/",
+            "/sitemap.xml",
+        ):
+            QueuedInvalidation.objects.create(path=path)
+
+        batch = send_queued_invalidations(client=self.stub_client)
+
+        self.assertEqual(batch.paths, "/posts/*\n/sitemap.xml\n/topics/css/")
+        self.assertEqual(batch.queued_paths, 7)
+        self.assertEqual(batch.path_count, 3)
+
+    def test_send_queued_invalidations__failure(self):
+        QueuedInvalidation.objects.create(path="/posts/foo/*")
+        self.stub_client.create_invalidation.side_effect = Exception("Throttled")
+
+        with self.assertRaises(Exception):
+            send_queued_invalidations(client=self.stub_client)
+
+        # It's left for the next flush
+        self.assertTrue(
+            QueuedInvalidation.objects.filter(
+                path="/posts/foo/*", claimed_at__isnull=True
+            ).exists()
+        )
+        self.assertFalse(InvalidationBatch.objects.exists())
+
+    def test_send_queued_invalidations__error_response(self):
+        QueuedInvalidation.objects.create(path="/posts/foo/*")
+        self.stub_client.create_invalidation.return_value = {
+            "ResponseMetadata": {"HTTPStatusCode": 400}
+        }
+
+        with self.assertLogs("developerportal.apps.taskqueue.utils", "WARNING"):
+            with self.assertRaises(CDNInvalidationError):
+                send_queued_invalidations(client=self.stub_client)
+
+        self.assertTrue(
+            QueuedInvalidation.objects.filter(
+                path="/posts/foo/*", claimed_at__isnull=True
+            ).exists()
+        )
+        self.assertFalse(InvalidationBatch.objects.exists())
+
+    @mock.patch(
+        "developerportal.apps.taskqueue.tasks.flush_cdn_invalidation_queue.apply_async"
+    )
+    def test_send_queued_invalidations__requeued_while_sending(self, mock_apply_async):
+        QueuedInvalidation.objects.create(path="/posts/foo/*")
+        QueuedInvalidation.objects.create(path="/posts/")
+        response = self.stub_client.create_invalidation.return_value
+
+        def requeue_while_sending(**kwargs):
+            queue_invalidation(["/posts/foo/*"])
+            return response
+
+        self.stub_client.create_invalidation.side_effect = requeue_while_sending
+
+        batch = send_queued_invalidations(client=self.stub_client)
+
+        self.assertEqual(batch.queued_paths, 2)
+        # The path changed again after it was sent, so it's sent next time
+        self.assertEqual(
+            list(QueuedInvalidation.objects.values_list("path", "claimed_at")),
+            [("/posts/foo/*", None)],
+        )
+
+    def test_send_queued_invalidations__skips_claimed_paths(self):
+        QueuedInvalidation.objects.create(path="/posts/foo/*", claimed_at=tz_now())
+        QueuedInvalidation.objects.create(
+            path="/posts/bar/*", claimed_at=tz_now() - datetime.timedelta(seconds=600),
+        )
+
+        batch = send_queued_invalidations(client=self.stub_client)
+
+        # A flush which is still sending keeps its paths, but a dead one doesn't
+        self.assertEqual(batch.paths, "/posts/bar/*")
+        self.assertEqual(
+            list(QueuedInvalidation.objects.values_list("path", flat=True)),
+            ["/posts/foo/*"],
+        )
+
+    def test_collapse_invalidation_targets(self):
+        targets = [
+            "/posts/foo/*",
+            "/posts/",
+            "/posts/?*",
+            "/topics/css/",
+            "/topics/css/?*",
+            "/topics/javascript/",
+            "/topics/javascript/?*",
+            "/posts-feed/",
+            "/sitemap.xml",
+        ]
+        cases = [
+            (20, sorted(targets)),
+            (
+                8,
+                [
+                    "/posts-feed/",
+                    "/posts/",
+                    "/posts/?*",
+                    "/posts/foo/*",
+                    "/sitemap.xml",
+                    "/topics/css/",
+                    "/topics/css/?*",
+                    "/topics/javascript/*",
+                ],
+            ),
+            (
+                5,
+                [
+                    "/posts-feed/",
+                    "/posts/*",
+                    "/sitemap.xml",
+                    "/topics/css/*",
+                    "/topics/javascript/*",
+                ],
+            ),
+            (1, ["/*"]),
+        ]
+        for max_paths, expected in cases:
+            with self.subTest(max_paths=max_paths):
+                self.assertEqual(
+                    collapse_invalidation_targets(targets, max_paths), expected
+                )
+
+        # Paths already covered by a wildcard are dropped
+        self.assertEqual(
+            collapse_invalidation_targets(
+                ["/posts/*", "/posts/foo/*", "/posts/", "/sitemap.xml"], 5
+            ),
+            ["/posts/*", "/sitemap.xml"],
+        )
+        self.assertEqual(collapse_invalidation_targets(["/*", "/posts/"], 5), ["/*"])
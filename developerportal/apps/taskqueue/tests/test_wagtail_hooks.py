@@ -5,17 +5,33 @@ from django.test import TestCase
 from wagtail.core.models import Page
 from wagtail.core.signals import page_published, page_unpublished
 
+from developerportal.apps.articles.models import Article
 
+
+@mock.patch("developerportal.apps.taskqueue.wagtail_hooks.queue_invalidation")
 class SignalsTestCase(TestCase):
-    @mock.patch(
-        "developerportal.apps.taskqueue.wagtail_hooks.invalidate_entire_cdn.delay"
-    )
-    def test_cdn_invalidation_signal_handler(self, mock_invalidate_entire_cdn__delay):
-
-        cases = [{"signal": page_published}, {"signal": page_unpublished}]
-
-        for case in cases:
-            mock_invalidate_entire_cdn__delay.reset_mock()
-            with self.subTest(case=case):
-                case["signal"].send(sender=Page, instance=None)
-                mock_invalidate_entire_cdn__delay.assert_called_once_with()
+
+    fixtures = ["common.json"]
+
+    def test_cdn_invalidation_signal_handler(self, mock_queue_invalidation):
+        article = Article.objects.get(pk=8)
+        for signal in (page_published, page_unpublished):
+            mock_queue_invalidation.reset_mock()
+            with self.subTest(signal=signal):
+                signal.send(sender=Article, instance=article)
+                mock_queue_invalidation.assert_called_once()
+                targets = mock_queue_invalidation.call_args[0][0]
+                self.assertIn(
+                    "/posts/faster-smarter-javascript-debugging-in-firefox/*", targets
+                )
+                self.assertNotIn("/*", targets)
+
+    def test_cdn_invalidation_signal_handler__page_shown_site_wide(
+        self, mock_queue_invalidation
+    ):
+        home_page = Page.objects.get(pk=3)
+        for signal in (page_published, page_unpublished):
+            mock_queue_invalidation.reset_mock()
+            with self.subTest(signal=signal):
+                signal.send(sender=Page, instance=home_page)
+                mock_queue_invalidation.assert_called_once_with(["/*"])
@@ -1,11 +1,36 @@
+import datetime
 import logging
 import os
+import time
+from collections import defaultdict
 from http import HTTPStatus
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
 from django.utils.timezone import now as tz_now
 
 import boto3
+from wagtail.core.blocks import PageChooserBlock
+from wagtail.core.models import Page
+
+from ..articles.models import Article, Articles
+from ..common.cache_tags import is_shown_site_wide
+from ..events.models import Event, Events, EventSpeaker, get_default_events_window_end
+from ..externalcontent.models import (
+    ExternalArticle,
+    ExternalContentFolder,
+    ExternalEvent,
+    ExternalEventSpeaker,
+    ExternalVideo,
+    ExternalVideoPerson,
+)
+from ..home.models import HomePage
+from ..people.models import People, Person, PersonContribution
+from ..topics.models import ParentTopic, Topic, TopicPerson, Topics
+from ..videos.models import Video, Videos
+from .models import InvalidationBatch, QueuedInvalidation
 
 logging.basicConfig(level=os.environ.get("LOGLEVEL", logging.INFO))
 logger = logging.getLogger(__name__)
@@ -29,7 +54,16 @@ def set_up_boto3():
     boto3.setup_default_session(**session_kwargs)
 
 
-def invalidate_cdn(invalidation_targets=None):
+class CDNInvalidationError(Exception):
+    """CloudFront didn't accept an invalidation"""
+
+
+def invalidate_cdn(invalidation_targets=None, client=None):
+    """Ask CloudFront to invalidate the given paths, or everything if none are
+    given. `client` defaults to a boto3 CloudFront client.
+
+    Returns CloudFront's response, or None if there's no distribution. Raises
+    CDNInvalidationError if CloudFront responds with anything but a 201."""
 
     set_up_boto3()
 
@@ -43,7 +77,8 @@ def invalidate_cdn(invalidation_targets=None):
         if invalidation_targets is None:
             invalidation_targets = ["/*"]  # this wildcard should catch everything
 
-        client = boto3.client("cloudfront")
+        if client is None:
+            client = boto3.client("cloudfront")
 
         # Make a unique string so that this call to invalidate is not ignored
         caller_reference = tz_now().isoformat()
@@ -75,3 +110,354 @@ def invalidate_cdn(invalidation_targets=None):
             logger.warning(
                 "Got an unexpected response from Cloudfront: {}".format(response)
             )
+            raise CDNInvalidationError(f"Unexpected response status: {http_status}")
+        return response
+
+
+FLUSH_SCHEDULED_CACHE_KEY = "cdn-invalidation-flush-scheduled"
+
+# Seconds after which paths claimed by a flush that never finished, eg because
+# its worker died, can be claimed by another one
+INVALIDATION_CLAIM_TIMEOUT = 300
+
+
+def queue_invalidation(invalidation_targets):
+    """Add paths to the shared invalidation queue, to be sent in one batch with
+    everything else queued in the next settings.CDN_INVALIDATION_WINDOW seconds"""
+    from .tasks import flush_cdn_invalidation_queue
+
+    queued_at = tz_now()
+    # A flush which has already claimed some of these paths may have sent them
+    # before this change, so hand them back; it only deletes what it still holds
+    QueuedInvalidation.objects.filter(
+        path__in=invalidation_targets, claimed_at__isnull=False
+    ).update(claimed_at=None, queued_at=queued_at)
+    QueuedInvalidation.objects.bulk_create(
+        [
+            QueuedInvalidation(path=path, queued_at=queued_at)
+            for path in invalidation_targets
+        ],
+        ignore_conflicts=True,
+    )
+    # Only the first path queued in each window schedules a flush
+    window = settings.CDN_INVALIDATION_WINDOW
+    if cache.add(FLUSH_SCHEDULED_CACHE_KEY, True, timeout=window):
+        flush_cdn_invalidation_queue.apply_async(countdown=window)
+
+
+def send_queued_invalidations(client=None):
+    """Send everything in the invalidation queue as one invalidation, and
+    record it. Returns the InvalidationBatch, or None if the queue was empty.
+
+    The paths are claimed in a short transaction, so that no lock is held while
+    CloudFront is called. If the invalidation fails, they're handed back to the
+    queue, and the error is raised."""
+    claimed_at = tz_now()
+    stale_claimed_at = claimed_at - datetime.timedelta(
+        seconds=INVALIDATION_CLAIM_TIMEOUT
+    )
+    with transaction.atomic():
+        # Another flush may be claiming some at the same time
+        queued = list(
+            QueuedInvalidation.objects.select_for_update(skip_locked=True)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale_claimed_at))
+            .order_by("queued_at")
+        )
+        if not queued:
+            return None
+        claimed = QueuedInvalidation.objects.filter(pk__in=[item.pk for item in queued])
+        claimed.update(claimed_at=claimed_at)
+
+    # Anything re-queued meanwhile is unclaimed, and so stays in the queue
+    claimed = claimed.filter(claimed_at=claimed_at)
+    invalidation_targets = collapse_invalidation_targets(
+        [item.path for item in queued], settings.CDN_INVALIDATION_MAX_PATHS
+    )
+    sent_at = tz_now()
+    started = time.monotonic()
+    try:
+        response = invalidate_cdn(
+            invalidation_targets=invalidation_targets, client=client
+        )
+    except Exception:
+        claimed.update(claimed_at=None)
+        raise
+    request_duration = time.monotonic() - started
+
+    claimed.delete()
+    return InvalidationBatch.objects.create(
+        sent_at=sent_at,
+        queued_paths=len(queued),
+        paths="\n".join(invalidation_targets),
+        path_count=len(invalidation_targets),
+        queue_wait=(sent_at - queued[0].queued_at).total_seconds(),
+        request_duration=request_duration if response is not None else None,
+        invalidation_id=(response or {}).get("Invalidation", {}).get("Id", ""),
+    )
+
+
+def collapse_invalidation_targets(invalidation_targets, max_paths):
+    """Return the paths, without any already covered by a wildcard, and with
+    the most specific groups of them merged into wildcards until there are no
+    more than `max_paths`"""
+    targets = _remove_covered_targets(set(invalidation_targets))
+    while len(targets) > max_paths:
+        groups = defaultdict(set)
+        for target in targets:
+            groups[_get_merge_prefix(target)].add(target)
+
+        # Merge the deepest group that has more than one path in it, or else
+        # make the deepest path more general, so it can be merged later
+        mergeable = [prefix for prefix, group in groups.items() if len(group) > 1]
+        prefix = max(
+            mergeable or groups,
+            key=lambda prefix: (prefix.count("/"), len(groups[prefix]), prefix),
+        )
+        targets = _remove_covered_targets((targets - groups[prefix]) | {f"{prefix}*"})
+    return sorted(targets)
+
+
+def _remove_covered_targets(targets):
+    prefixes = [target[:-1] for target in targets if target.endswith("*")]
+    return {
+        target
+        for target in targets
+        if not any(
+            target.startswith(prefix) and target != f"{prefix}*" for prefix in prefixes
+        )
+    }
+
+
+def _get_merge_prefix(target):
+    """Return the prefix of the wildcard a path could be merged into: a page's
+    own path for it and its query strings (eg "/posts/" for "/posts/" and
+    "/posts/?*"), or else its parent's (eg "/posts/" for "/posts/foo/*", and
+    "/" for "/sitemap.xml")"""
+    if "?" in target:
+        return target.split("?")[0]
+    if target.endswith("/"):
+        return target
+    path = target.rstrip("*").rstrip("/")
+    return path[: path.rfind("/") + 1]
+
+
+# The listing pages which show each kind of content
+LISTING_PAGE_MODELS = {
+    Article: Articles,
+    ExternalArticle: Articles,
+    Video: Videos,
+    ExternalVideo: Videos,
+    Event: Events,
+    ExternalEvent: Events,
+    Person: People,
+    Topic: Topics,
+}
+
+# Models which can be tagged with Topics, via their `topics` relation
+TOPIC_TAGGED_MODELS = (
+    Article,
+    ExternalArticle,
+    Event,
+    ExternalEvent,
+    Video,
+    ExternalVideo,
+    Person,
+)
+
+# Pages which hand-pick other pages to feature, and the StreamFields they use
+FEATURING_PAGE_FIELDS = {
+    HomePage: ("featured", "featured_people"),
+    Topic: ("featured", "recent_work", "relevant_events"),
+    Events: ("featured",),
+}
+
+# Models which appear in the RSS feed
+FEED_MODELS = (Article, Video)
+FEED_PATH = "/posts-feed/"
+SITEMAP_PATH = "/sitemap.xml"
+
+
+def get_invalidation_targets(page):
+    """Return the CDN paths that need invalidating when `page` is published or
+    unpublished: the page itself, the listing pages it appears on, the Topic,
+    Person and home pages which link to it, the RSS feed and the sitemap.
+
+    Pages which appear in the site's navigation, like the home page and the
+    directory pages, are shown on every page, so they invalidate everything.
+
+    This needs to be called while the page is still around, so it's done when
+    the publish/unpublish signal is sent, rather than in the task."""
+
+    page = page.specific
+    if is_shown_site_wide(page):
+        return ["/*"]
+
+    targets = _get_own_targets([page])
+    targets.extend(
+        _get_dependent_targets(
+            _get_listing_pages(page) + list(_get_related_pages(page))
+        )
+    )
+
+    if isinstance(page, FEED_MODELS):
+        targets.append(FEED_PATH)
+    targets.append(SITEMAP_PATH)
+
+    # Keep the first occurrence of each, to keep the result predictable
+    return list(dict.fromkeys(targets))
+
+
+def get_expired_event_invalidation_targets(last_cutoff, cutoff):
+    """Return the CDN paths which need invalidating because events have become
+    past events since the `get_past_event_cutoff()` was `last_cutoff`: those
+    events, the Topic and Person pages which show them, and the Events page.
+
+    The Events page is also invalidated if events have come into its default
+    window, even if none have become past events."""
+
+    events = [
+        *Event.objects.live().filter(start_date__range=(last_cutoff, cutoff)),
+        *ExternalEvent.objects.live().filter(start_date__range=(last_cutoff, cutoff)),
+    ]
+    window_end_range = (
+        get_default_events_window_end(last_cutoff),
+        get_default_events_window_end(cutoff),
+    )
+    events_entering_window = (
+        Event.objects.live().filter(start_date__range=window_end_range).exists()
+        or ExternalEvent.objects.live()
+        .filter(start_date__range=window_end_range)
+        .exists()
+    )
+    if not events and not events_entering_window:
+        return []
+
+    targets = _get_dependent_targets(Events.objects.live())
+    targets.extend(_get_own_targets(events))
+    related_pages = [page for event in events for page in _get_related_pages(event)]
+    # Most related pages are Topics, Events and People, but featuring pages
+    # such as the home page are included too
+    targets.extend(_get_dependent_targets(related_pages))
+    return list(dict.fromkeys(targets))
+
+
+def _get_own_targets(pages):
+    """Return each page's path as a prefix, to catch any query strings and the
+    pages beneath it"""
+    return [f"{path}*" for path in _get_paths(pages)]
+
+
+def _get_dependent_targets(pages):
+    """Return each page's path, and its query strings (eg for filtering and
+    pagination), but not its whole subtree"""
+    return [target for path in _get_paths(pages) for target in (path, f"{path}?*")]
+
+
+def _get_paths(pages):
+    """Return the site-relative paths of the routable pages given"""
+    paths = []
+    for page in pages:
+        url_parts = page.get_url_parts()
+        if url_parts:
+            paths.append(url_parts[2])
+    return paths
+
+
+def _get_listing_pages(page):
+    listing_pages = []
+
+    parent = page.get_parent()
+    if parent.depth > 2 and not isinstance(parent.specific, ExternalContentFolder):
+        listing_pages.append(parent)
+
+    listing_model = LISTING_PAGE_MODELS.get(type(page))
+    if listing_model:
+        listing_pages.extend(
+            listing_page
+            for listing_page in listing_model.objects.live()
+            if listing_page.pk != parent.pk
+        )
+    return listing_pages
+
+
+def _get_related_pages(page):
+    """Return the live pages, other than listing pages, which show `page`"""
+    page_ids = set()
+
+    if isinstance(page, TOPIC_TAGGED_MODELS):
+        page_ids.update(page.topics.values_list("topic_id", flat=True))
+
+    # Person pages list the content people contributed to
+    page_ids.update(PersonContribution.objects.get_person_ids(page))
+
+    # Speakers chosen in inline panels rather than StreamFields
+    if isinstance(page, Event):
+        page_ids.update(page.speaker.values_list("speaker_id", flat=True))
+    elif isinstance(page, ExternalEvent):
+        page_ids.update(page.speakers.values_list("speaker_id", flat=True))
+    elif isinstance(page, ExternalVideo):
+        page_ids.update(page.people.values_list("person_id", flat=True))
+
+    if isinstance(page, Topic):
+        for model in TOPIC_TAGGED_MODELS:
+            page_ids.update(
+                model.objects.filter(topics__topic=page).values_list("pk", flat=True)
+            )
+        page_ids.update(
+            ParentTopic.objects.filter(child=page).values_list("parent_id", flat=True)
+        )
+        page_ids.update(
+            ParentTopic.objects.filter(parent=page).values_list("child_id", flat=True)
+        )
+
+    if isinstance(page, Person):
+        page_ids.update(
+            PersonContribution.objects.filter(person=page).values_list(
+                "page_id", flat=True
+            )
+        )
+        page_ids.update(
+            TopicPerson.objects.filter(person=page).values_list("topic_id", flat=True)
+        )
+        page_ids.update(
+            EventSpeaker.objects.filter(speaker=page).values_list("event_id", flat=True)
+        )
+        page_ids.update(
+            ExternalEventSpeaker.objects.filter(speaker=page).values_list(
+                "article_id", flat=True
+            )
+        )
+        page_ids.update(
+            ExternalVideoPerson.objects.filter(person=page).values_list(
+                "article_id", flat=True
+            )
+        )
+
+    for model, field_names in FEATURING_PAGE_FIELDS.items():
+        for featuring_page in model.objects.live().only("pk", *field_names):
+            if page.pk in _get_chosen_page_ids(featuring_page, field_names):
+                page_ids.add(featuring_page.pk)
+
+    page_ids.discard(page.pk)
+    return (
+        Page.objects.live()
+        .filter(pk__in=page_ids)
+        .exclude(depth__lte=1)
+        .order_by("path")
+    )
+
+
+def _get_chosen_page_ids(page, field_names):
+    """Return the ids of the pages chosen directly in some StreamFields, using
+    their raw data so that the chosen pages aren't fetched"""
+    page_ids = set()
+    for field_name in field_names:
+        stream_value = getattr(page, field_name)
+        if not stream_value:
+            continue
+        child_blocks = stream_value.stream_block.child_blocks
+        for item in stream_value.get_prep_value():
+            block = child_blocks.get(item["type"])
+            if isinstance(block, PageChooserBlock) and item["value"]:
+                page_ids.add(item["value"])
+    return page_ids
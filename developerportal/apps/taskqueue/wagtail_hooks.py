@@ -1,13 +1,15 @@
 from wagtail.core.signals import page_published, page_unpublished
 
-from .tasks import invalidate_entire_cdn
+from ..common.cache_tags import get_cache_tags_for_page, purge_cache_tags
+from .utils import get_invalidation_targets, queue_invalidation
 
 
-def purge_cdn_on_publish(signal, **kwargs):
-    # TODO: refine this to be more selective and only invalidate the
-    # keys we know we need to. At the moment we're erring on the side
-    # of caution.
-    invalidate_entire_cdn.delay()
+def purge_cdn_on_publish(signal, instance, **kwargs):
+    # Work out what's affected now, while the page is certain to exist, and
+    # send it along with anything else published around the same time
+    queue_invalidation(get_invalidation_targets(instance))
+    # And anything else which was built from it
+    purge_cache_tags(get_cache_tags_for_page(instance))
 
 
 page_published.connect(purge_cdn_on_publish)
@@ -30,7 +30,11 @@ from wagtail.search import index
 from ..common.blocks import FeaturedExternalBlock
 from ..common.constants import DESCRIPTION_MAX_LENGTH, RICH_TEXT_FEATURES_SIMPLE
 from ..common.models import BasePage
-from ..common.utils import get_combined_articles, get_combined_videos
+from ..common.utils import (
+    get_combined_articles,
+    get_combined_videos,
+    prefetch_page_chooser_blocks,
+)
 from ..common.validators import check_for_svg_file
 
 
@@ -289,6 +293,13 @@ class Topic(BasePage):
         index.FilterField("slug"),
     ]
 
+    def get_context(self, request):
+        context = super().get_context(request)
+        prefetch_page_chooser_blocks(
+            self, ["featured", "recent_work", "relevant_events"]
+        )
+        return context
+
     @property
     def articles(self):
         return get_combined_articles(self, topics__topic__pk=self.pk)
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.14 on 2026-10-18 10:12
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0013_add_3_2_ratio_image'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='video',
+            name='date',
+            field=models.DateField(db_index=True, default=datetime.date.today, verbose_name='Upload date'),
+        ),
+    ]
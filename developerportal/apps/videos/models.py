@@ -37,6 +37,7 @@ from ..common.constants import (
     RICH_TEXT_FEATURES_SIMPLE,
     VIDEO_TYPE,
 )
+from ..common.identity_map import get_related_instance, memoize
 from ..common.models import BasePage
 from ..common.utils import get_combined_articles_and_videos
 
@@ -204,7 +205,7 @@ class Video(BasePage):
         help_text="An image in 3:2 aspect ratio",
     )
     # Meta fields
-    date = DateField("Upload date", default=datetime.date.today)
+    date = DateField("Upload date", default=datetime.date.today, db_index=True)
     keywords = ClusterTaggableManager(through=VideoTag, blank=True)
 
     # Content panels
@@ -304,8 +305,12 @@ class Video(BasePage):
     @property
     def primary_topic(self):
         """Return the first (primary) topic specified for the video."""
-        video_topic = self.topics.first()
-        return video_topic.topic if video_topic else None
+
+        def get_primary_topic():
+            video_topic = self.topics.first()
+            return get_related_instance(video_topic, "topic") if video_topic else None
+
+        return memoize(("primary_topic", self.pk), get_primary_topic)
 
     @property
     def read_time(self):
@@ -315,8 +320,14 @@ class Video(BasePage):
     def related_resources(self):
         """Returns resources that are related to the current resource, i.e. live,
         public articles and videos which have the same topics."""
-        topic_pks = [topic.topic.pk for topic in self.topics.all()]
-        return get_combined_articles_and_videos(self, topics__topic__pk__in=topic_pks)
+
+        def get_related_resources():
+            topic_pks = [topic.topic_id for topic in self.topics.all()]
+            return get_combined_articles_and_videos(
+                self, topics__topic__pk__in=topic_pks
+            )
+
+        return memoize(("related_resources", self.pk), get_related_resources)
 
     def has_speaker(self, person):
         for speaker in self.speakers:  # pylint: disable=not-an-iterable
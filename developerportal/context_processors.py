@@ -80,7 +80,13 @@ def topics_title(request):
 def pagination_constants(request):
     from developerportal.apps.common import constants
 
-    return {"PAGINATION_QUERYSTRING_KEY": constants.PAGINATION_QUERYSTRING_KEY}
+    return {
+        "PAGINATION_QUERYSTRING_KEY": constants.PAGINATION_QUERYSTRING_KEY,
+        "PAGINATION_AFTER_QUERYSTRING_KEY": constants.PAGINATION_AFTER_QUERYSTRING_KEY,
+        "PAGINATION_BEFORE_QUERYSTRING_KEY": (
+            constants.PAGINATION_BEFORE_QUERYSTRING_KEY
+        ),
+    }
 
 
 def filtering_constants(request):
@@ -42,7 +42,6 @@ INSTALLED_APPS = [
     "developerportal.apps.health",
     "developerportal.apps.home",
     "developerportal.apps.ingestion",
-    "developerportal.apps.mozimages",
     "developerportal.apps.people",
     "developerportal.apps.search",
     "developerportal.apps.taskqueue",
@@ -58,6 +57,8 @@ INSTALLED_APPS = [
     "wagtail.snippets",
     "wagtail.documents",
     "wagtail.images",
+    # After wagtail.images, to replace one of its signal handlers when ready
+    "developerportal.apps.mozimages",
     "wagtail.search",
     "wagtail.contrib.postgres_search",
     "wagtail.admin",
@@ -95,6 +96,9 @@ MIDDLEWARE = [
     # In case someone has their Auth0 revoked while logged in, revalidate it:
     "mozilla_django_oidc.middleware.SessionRefresh",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
+    "developerportal.apps.common.middleware.request_identity_map",
+    "developerportal.apps.common.middleware.request_cache_tags",
+    "developerportal.apps.common.middleware.cache_control_policy",
 ]
 
 ROOT_URLCONF = "developerportal.urls"
@@ -291,6 +295,71 @@ MEDIA_ROOT = None
 
 S3_BUCKET = os.environ.get("S3_BUCKET")
 AWS_CLOUDFRONT_DISTRIBUTION_ID = os.environ.get("AWS_CLOUDFRONT_DISTRIBUTION_ID")
+# How many seconds to collect CDN invalidations for before sending them as one
+CDN_INVALIDATION_WINDOW = int(os.environ.get("CDN_INVALIDATION_WINDOW", 60))
+# The most paths to send in one invalidation, above which they're merged into
+# wildcards. CloudFront bills per path, and a wildcard counts as one.
+CDN_INVALIDATION_MAX_PATHS = int(os.environ.get("CDN_INVALIDATION_MAX_PATHS", 30))
+# What purges cached responses by their cache tags (see common/cache_tags.py)
+CACHE_TAGS_BACKEND = os.environ.get(
+    "CACHE_TAGS_BACKEND",
+    "developerportal.apps.common.cache_tags.CloudFrontCacheTagBackend",
+)
+# Cache-Control for anonymous GETs of each kind of page (see
+# BasePage.cache_control_policy) and view (see `with_cache_control_policy`).
+# The CDN holds pages for s_maxage, and is invalidated when they're published,
+# so browsers get a shorter max_age. Both may serve stale pages while fetching
+# a fresh one, or while the origin is erroring.
+CACHE_CONTROL_POLICIES = {
+    "default": {
+        "max_age": 5 * 60,
+        "s_maxage": 60 * 60,
+        "stale_while_revalidate": 60,
+        "stale_if_error": 24 * 60 * 60,
+    },
+    "article": {
+        "max_age": 5 * 60,
+        "s_maxage": 24 * 60 * 60,
+        "stale_while_revalidate": 60 * 60,
+        "stale_if_error": 24 * 60 * 60,
+    },
+    "event": {
+        "max_age": 5 * 60,
+        "s_maxage": 60 * 60,
+        "stale_while_revalidate": 10 * 60,
+        "stale_if_error": 24 * 60 * 60,
+    },
+    "events": {
+        "max_age": 60,
+        "s_maxage": 15 * 60,
+        "stale_while_revalidate": 5 * 60,
+        "stale_if_error": 24 * 60 * 60,
+    },
+    "search": {
+        "max_age": 0,
+        "s_maxage": 5 * 60,
+        "stale_while_revalidate": 60,
+        "stale_if_error": 60 * 60,
+    },
+    "feed": {
+        "max_age": 15 * 60,
+        "s_maxage": 60 * 60,
+        "stale_while_revalidate": 10 * 60,
+        "stale_if_error": 24 * 60 * 60,
+    },
+    # In place of any of the above for pages showing original images while their
+    # renditions are generated (see DEFER_RENDITION_GENERATION)
+    "deferred_rendition": {"max_age": 0, "s_maxage": 60},
+}
+# Responses built from more pages than this, like listings, aren't tagged with
+# their pages, and are left to be invalidated by path. This also limits how many
+# tags are recorded for each response.
+CACHE_TAGS_MAX_PAGES = int(os.environ.get("CACHE_TAGS_MAX_PAGES", 50))
+# How many seconds to remember which paths were served with each tag. This
+# needs to be longer than anything stays in the CDN.
+CACHE_TAGS_INDEX_TIMEOUT = int(
+    os.environ.get("CACHE_TAGS_INDEX_TIMEOUT", 7 * 24 * 60 * 60)
+)
 
 LOGIN_ERROR_URL = "/admin/"
 LOGIN_REDIRECT_URL = "/admin/"
@@ -301,6 +370,18 @@ GOOGLE_ANALYTICS = os.environ.get("GOOGLE_ANALYTICS", "")
 # RSS Feed
 RSS_MAX_ITEMS = 20
 
+# Whether the Posts, Events and People listings link between pages using cursors
+# (which cost the same for any page and are stable as content is added) rather
+# than page numbers. Incoming cursor links are honoured either way.
+USE_CURSOR_PAGINATION = os.environ.get("USE_CURSOR_PAGINATION", "False") == "True"
+
+# Whether image renditions found to be missing while rendering a listing are queued
+# for the worker to generate (showing the original image meanwhile), rather than
+# generated during the request
+DEFER_RENDITION_GENERATION = (
+    os.environ.get("DEFER_RENDITION_GENERATION", "True") == "True"
+)
+
 # Mapbox
 MAPBOX_ACCESS_TOKEN = os.environ.get("MAPBOX_ACCESS_TOKEN")
 
@@ -384,6 +465,35 @@ AUTOMATICALLY_INGEST_CONTENT = (
 NOTIFY_AFTER_INGESTING_CONTENT = (
     os.environ.get("NOTIFY_AFTER_INGESTING_CONTENT", "True") == "True"
 )
+# How many ingestion feeds to fetch at once, how long (in seconds) to wait for
+# each one, and how long to wait for all of them before giving up on the rest
+INGESTION_MAX_CONCURRENT_FETCHES = int(
+    os.environ.get("INGESTION_MAX_CONCURRENT_FETCHES", 10)
+)
+INGESTION_FETCH_TIMEOUT = int(os.environ.get("INGESTION_FETCH_TIMEOUT", 30))
+INGESTION_FETCH_DEADLINE = int(os.environ.get("INGESTION_FETCH_DEADLINE", 120))
+# Stop downloading a feed at the first entry that's older than its last sync
+INGESTION_INCREMENTAL_FEED_PARSING = (
+    os.environ.get("INGESTION_INCREMENTAL_FEED_PARSING", "True") == "True"
+)
+# The largest thumbnail (in bytes) that will be downloaded for ingested content
+INGESTION_MAX_IMAGE_SIZE = int(
+    os.environ.get("INGESTION_MAX_IMAGE_SIZE", 10 * 1024 * 1024)
+)
+# The shortest and longest times (in seconds) to wait between syncs of each
+# ingestion source. Within these, sources are synced more often the more often
+# they have new items.
+INGESTION_MIN_SYNC_INTERVAL = int(
+    os.environ.get("INGESTION_MIN_SYNC_INTERVAL", 15 * 60)
+)
+INGESTION_MAX_SYNC_INTERVAL = int(
+    os.environ.get("INGESTION_MAX_SYNC_INTERVAL", 24 * 60 * 60)
+)
+# How many days to keep the record of each ingestion run for
+INGESTION_RUN_RETENTION_DAYS = int(os.environ.get("INGESTION_RUN_RETENTION_DAYS", 30))
+# The bearer token a metrics scraper must send to read /metrics/ingestion/, which
+# otherwise only staff can see
+INGESTION_METRICS_TOKEN = os.environ.get("INGESTION_METRICS_TOKEN")
 
 # Extra Wagtail config to disable password usage (SSO should be the only way in)
 # https://docs.wagtail.io/en/v2.6.3/advanced_topics/settings.html#password-management
@@ -6,3 +6,5 @@ DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
 MEDIA_ROOT = "/tmp/test-media/"
 
 AWS_CLOUDFRONT_DISTRIBUTION_ID = None
+
+CACHE_TAGS_BACKEND = "developerportal.apps.common.cache_tags.LocalCacheTagBackend"
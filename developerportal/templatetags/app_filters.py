@@ -9,6 +9,7 @@ from pygments import formatters, lexers
 from wagtail.core.models import Page, Site
 
 from ..apps.common.constants import PAGE_TYPE_LOOKUP_FOR_LABEL
+from ..apps.common.identity_map import get_specific
 
 register = template.Library()
 
@@ -92,5 +93,5 @@ def domain_from_url(url, request):
 @register.filter
 def page_type_label(page: Page) -> str:
     "Return a user-facing string to describe the type of page provided"
-    page_class_name = page.specific.__class__.__name__
+    page_class_name = get_specific(page).__class__.__name__
     return PAGE_TYPE_LOOKUP_FOR_LABEL.get(page_class_name, None)
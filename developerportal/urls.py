@@ -13,15 +13,17 @@ from wagtail.documents import urls as wagtaildocs_urls
 from ratelimit.exceptions import Ratelimited
 
 from .apps.common.feed import RssFeeds
+from .apps.common.utils import with_cache_control_policy
 from .apps.common.views import rate_limited
 
 urlpatterns = [
     url("", include("developerportal.apps.health.urls")),
+    url("", include("developerportal.apps.ingestion.urls")),
     url(r"^django-admin/", admin.site.urls),
     url(r"^admin/", include(wagtailadmin_urls)),
     url(r"^documents/", include(wagtaildocs_urls)),
     url(r"^sitemap\.xml$", sitemap),
-    url(r"^posts-feed/", RssFeeds()),
+    url(r"^posts-feed/", with_cache_control_policy("feed")(RssFeeds())),
     url(r"^auth/", include("mozilla_django_oidc.urls")),
     url(r"^search/", include("developerportal.apps.search.urls")),
     url(